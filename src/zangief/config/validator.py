@@ -2,6 +2,28 @@ from .base import BaseConfig
 
 ENV_VALIDATOR_INTERVAL = "VALIDATOR_INTERVAL"
 ENV_VALIDATOR_CALL_TIMEOUT = "VALIDATOR_CALL_TIMEOUT"
+ENV_VALIDATOR_METRICS_PORT = "VALIDATOR_METRICS_PORT"
+ENV_VALIDATOR_METRICS_HOST = "VALIDATOR_METRICS_HOST"
+ENV_VALIDATOR_PROFILE = "VALIDATOR_PROFILE"
+ENV_VALIDATOR_PROFILE_STEPS = "VALIDATOR_PROFILE_STEPS"
+ENV_VALIDATOR_PROFILER = "VALIDATOR_PROFILER"
+ENV_VALIDATOR_PROFILE_DIR = "VALIDATOR_PROFILE_DIR"
+ENV_VALIDATOR_MEMORY_SOFT_LIMIT_MB = "VALIDATOR_MEMORY_SOFT_LIMIT_MB"
+ENV_VALIDATOR_MEMORY_HARD_LIMIT_MB = "VALIDATOR_MEMORY_HARD_LIMIT_MB"
+ENV_VALIDATOR_MEMORY_INTERVAL = "VALIDATOR_MEMORY_INTERVAL"
+ENV_VALIDATOR_TRACEMALLOC_FRAMES = "VALIDATOR_TRACEMALLOC_FRAMES"
+ENV_VALIDATOR_NODE_URLS = "VALIDATOR_NODE_URLS"
+ENV_VALIDATOR_NODE_PROBE_INTERVAL = "VALIDATOR_NODE_PROBE_INTERVAL"
+ENV_VALIDATOR_TRACE_PATH = "VALIDATOR_TRACE_PATH"
+ENV_VALIDATOR_FEEDBACK_TIMEOUT = "VALIDATOR_FEEDBACK_TIMEOUT"
+ENV_VALIDATOR_CHECKPOINT_MAX_AGE = "VALIDATOR_CHECKPOINT_MAX_AGE"
+ENV_VALIDATOR_ROLE = "VALIDATOR_ROLE"
+ENV_VALIDATOR_SHARD = "VALIDATOR_SHARD"
+ENV_VALIDATOR_SHARDS = "VALIDATOR_SHARDS"
+ENV_VALIDATOR_SHARD_STORE = "VALIDATOR_SHARD_STORE"
+ENV_VALIDATOR_EPOCH_DEADLINE = "VALIDATOR_EPOCH_DEADLINE"
+ENV_VALIDATOR_MAX_RESPONSE_BYTES = "VALIDATOR_MAX_RESPONSE_BYTES"
+ENV_VALIDATOR_MAX_ANSWER_RATIO = "VALIDATOR_MAX_ANSWER_RATIO"
 
 
 class ValidatorConfig(BaseConfig):
@@ -52,3 +74,371 @@ class ValidatorConfig(BaseConfig):
                 f"The environment variable '{ENV_VALIDATOR_CALL_TIMEOUT}' should only contain digits.")
 
         return int(timeout)
+
+    def get_validator_metrics_port(self) -> int | None:
+        """
+        Retrieves the VALIDATOR_METRICS_PORT environment variable as an integer.
+
+        Returns:
+            int | None: 
+                The port to serve Prometheus metrics on, or None if not set (metrics are not served).
+
+        Raises:
+            ValueError: 
+                If the VALIDATOR_METRICS_PORT environment variable contains non-digit characters.
+        """
+        port = self._get(ENV_VALIDATOR_METRICS_PORT, None)
+
+        if port is None:
+            return None
+
+        if not port.isdigit():
+            raise ValueError(
+                f"The environment variable '{ENV_VALIDATOR_METRICS_PORT}' should only contain digits.")
+
+        return int(port)
+
+    def get_validator_metrics_host(self) -> str:
+        """
+        Retrieves the VALIDATOR_METRICS_HOST environment variable.
+
+        Returns:
+            str: 
+                The address the metrics port listens on, or "127.0.0.1" if not set.
+        """
+        return self._get(ENV_VALIDATOR_METRICS_HOST, None) or '127.0.0.1'
+
+    def get_validator_profile(self) -> bool:
+        """
+        Retrieves the VALIDATOR_PROFILE environment variable as a boolean.
+
+        Returns:
+            bool: 
+                True if VALIDATOR_PROFILE is "1" or "true" (case-insensitive), False otherwise.
+        """
+        return self._get(ENV_VALIDATOR_PROFILE, '0').lower() in ('1', 'true')
+
+    def get_validator_profile_steps(self) -> int:
+        """
+        Retrieves the VALIDATOR_PROFILE_STEPS environment variable as an integer.
+
+        Returns:
+            int: 
+                The number of validation steps to profile at startup, or 0 if not set.
+
+        Raises:
+            ValueError: 
+                If the VALIDATOR_PROFILE_STEPS environment variable contains non-digit characters.
+        """
+        steps = self._get(ENV_VALIDATOR_PROFILE_STEPS, '0')
+
+        if not steps.isdigit():
+            raise ValueError(
+                f"The environment variable '{ENV_VALIDATOR_PROFILE_STEPS}' should only contain digits.")
+
+        return int(steps)
+
+    def get_validator_profiler(self) -> str:
+        """
+        Retrieves the VALIDATOR_PROFILER environment variable.
+
+        Returns:
+            str: 
+                The profiler used for step captures, "sampling" (default) or "cprofile".
+
+        Raises:
+            ValueError: 
+                If the VALIDATOR_PROFILER environment variable is not "sampling" or "cprofile".
+        """
+        profiler = self._get(ENV_VALIDATOR_PROFILER, 'sampling').lower()
+
+        if profiler not in ('sampling', 'cprofile'):
+            raise ValueError(
+                f"The environment variable '{ENV_VALIDATOR_PROFILER}' should be 'sampling' or 'cprofile'.")
+
+        return profiler
+
+    def get_validator_profile_dir(self) -> str | None:
+        """
+        Retrieves the VALIDATOR_PROFILE_DIR environment variable.
+
+        Returns:
+            str | None: 
+                The directory profiles are written to, or None to use ~/.commune/zangief/profiles.
+        """
+        return self._get(ENV_VALIDATOR_PROFILE_DIR, None)
+
+    def _get_optional_int(self, key: str) -> int | None:
+        value = self._get(key, None)
+
+        if not value:
+            return None
+
+        if not value.isdigit():
+            raise ValueError(
+                f"The environment variable '{key}' should only contain digits.")
+
+        return int(value)
+
+    def _get_positive_int(self, key: str, default: int) -> int:
+        value = self._get_optional_int(key)
+
+        if value is None:
+            return default
+
+        if value == 0:
+            raise ValueError(
+                f"The environment variable '{key}' should be greater than 0.")
+
+        return value
+
+    def get_validator_memory_soft_limit_mb(self) -> int | None:
+        """
+        Retrieves the VALIDATOR_MEMORY_SOFT_LIMIT_MB environment variable as an integer.
+
+        Returns:
+            int | None: 
+                The RSS in MB above which caches are trimmed, or None if not set.
+
+        Raises:
+            ValueError: 
+                If the VALIDATOR_MEMORY_SOFT_LIMIT_MB environment variable contains non-digit characters.
+        """
+        return self._get_optional_int(ENV_VALIDATOR_MEMORY_SOFT_LIMIT_MB)
+
+    def get_validator_memory_hard_limit_mb(self) -> int | None:
+        """
+        Retrieves the VALIDATOR_MEMORY_HARD_LIMIT_MB environment variable as an integer.
+
+        Returns:
+            int | None: 
+                The RSS in MB above which caches and the prompt pool are trimmed, or None if not set.
+
+        Raises:
+            ValueError: 
+                If the VALIDATOR_MEMORY_HARD_LIMIT_MB environment variable contains non-digit characters.
+        """
+        return self._get_optional_int(ENV_VALIDATOR_MEMORY_HARD_LIMIT_MB)
+
+    def get_validator_memory_interval(self) -> int:
+        """
+        Retrieves the VALIDATOR_MEMORY_INTERVAL environment variable as an integer.
+
+        Returns:
+            int: 
+                The number of steps between memory growth reports, or 10 if not set.
+
+        Raises:
+            ValueError: 
+                If the VALIDATOR_MEMORY_INTERVAL environment variable contains non-digit characters or is 0.
+        """
+        return self._get_positive_int(ENV_VALIDATOR_MEMORY_INTERVAL, 10)
+
+    def get_validator_tracemalloc_frames(self) -> int:
+        """
+        Retrieves the VALIDATOR_TRACEMALLOC_FRAMES environment variable as an integer.
+
+        Returns:
+            int: 
+                The traceback depth of tracemalloc snapshots, or 0 if not set (tracemalloc is off).
+
+        Raises:
+            ValueError: 
+                If the VALIDATOR_TRACEMALLOC_FRAMES environment variable contains non-digit characters.
+        """
+        return self._get_optional_int(ENV_VALIDATOR_TRACEMALLOC_FRAMES) or 0
+
+    def get_validator_node_urls(self) -> list[str]:
+        """
+        Retrieves the VALIDATOR_NODE_URLS environment variable as a list of URLs.
+
+        Returns:
+            list[str]: 
+                The comma-separated chain node URLs to pool, or an empty list to use the default nodes.
+        """
+        urls = self._get(ENV_VALIDATOR_NODE_URLS, '')
+        return [url.strip() for url in urls.split(',') if url.strip()]
+
+    def get_validator_node_probe_interval(self) -> int:
+        """
+        Retrieves the VALIDATOR_NODE_PROBE_INTERVAL environment variable as an integer.
+
+        Returns:
+            int: 
+                The seconds between health probes of the chain nodes, or 30 if not set.
+
+        Raises:
+            ValueError: 
+                If the VALIDATOR_NODE_PROBE_INTERVAL environment variable contains non-digit characters or is 0.
+        """
+        return self._get_positive_int(ENV_VALIDATOR_NODE_PROBE_INTERVAL, 30)
+
+    def get_validator_trace_path(self) -> str | None:
+        """
+        Retrieves the VALIDATOR_TRACE_PATH environment variable.
+
+        Returns:
+            str | None: 
+                The file validation steps are recorded to for replay, or None if not set (no recording).
+        """
+        return self._get(ENV_VALIDATOR_TRACE_PATH, None) or None
+
+    def get_validator_feedback_timeout(self) -> int:
+        """
+        Retrieves the VALIDATOR_FEEDBACK_TIMEOUT environment variable as an integer.
+
+        Returns:
+            int: 
+                The deadline in seconds for sending a score to a miner, or 3 if not set.
+
+        Raises:
+            ValueError: 
+                If the VALIDATOR_FEEDBACK_TIMEOUT environment variable contains non-digit characters or is 0.
+        """
+        return self._get_positive_int(ENV_VALIDATOR_FEEDBACK_TIMEOUT, 3)
+
+    def get_validator_checkpoint_max_age(self) -> int:
+        """
+        Retrieves the VALIDATOR_CHECKPOINT_MAX_AGE environment variable as an integer.
+
+        Returns:
+            int: 
+                The seconds after its start within which an interrupted epoch is resumed on restart,
+                or 7200 if not set. 0 always starts a new epoch.
+
+        Raises:
+            ValueError: 
+                If the VALIDATOR_CHECKPOINT_MAX_AGE environment variable contains non-digit characters.
+        """
+        max_age = self._get_optional_int(ENV_VALIDATOR_CHECKPOINT_MAX_AGE)
+        return 7200 if max_age is None else max_age
+
+    def get_validator_role(self) -> str:
+        """
+        Retrieves the VALIDATOR_ROLE environment variable.
+
+        Returns:
+            str: 
+                "standalone" (default) to query, score and vote in one process, "worker" to query and
+                score one shard of the miners, or "coordinator" to vote with the scores of the workers.
+
+        Raises:
+            ValueError: 
+                If the VALIDATOR_ROLE environment variable is not "standalone", "worker" or "coordinator".
+        """
+        role = self._get(ENV_VALIDATOR_ROLE, 'standalone').lower()
+
+        if role not in ('standalone', 'worker', 'coordinator'):
+            raise ValueError(
+                f"The environment variable '{ENV_VALIDATOR_ROLE}' should be 'standalone', 'worker' or 'coordinator'.")
+
+        return role
+
+    def get_validator_shards(self) -> list[str]:
+        """
+        Retrieves the VALIDATOR_SHARDS environment variable as a list of shard names.
+
+        Returns:
+            list[str]: 
+                The comma-separated names of all the workers of a sharded validator.
+
+        Raises:
+            ValueError: 
+                If the VALIDATOR_SHARDS environment variable is not set.
+        """
+        shards = [shard.strip() for shard in self._get(ENV_VALIDATOR_SHARDS, '').split(',') if shard.strip()]
+
+        if not shards:
+            raise ValueError(
+                f"The environment variable '{ENV_VALIDATOR_SHARDS}' should list the shards of the validator.")
+
+        return shards
+
+    def get_validator_shard(self) -> str:
+        """
+        Retrieves the VALIDATOR_SHARD environment variable.
+
+        Returns:
+            str: 
+                The name of this worker's shard, one of VALIDATOR_SHARDS.
+
+        Raises:
+            ValueError: 
+                If the VALIDATOR_SHARD environment variable is not set.
+        """
+        shard = self._get(ENV_VALIDATOR_SHARD, '').strip()
+
+        if not shard:
+            raise ValueError(
+                f"The environment variable '{ENV_VALIDATOR_SHARD}' should name the shard of this worker.")
+
+        return shard
+
+    def get_validator_shard_store(self) -> str:
+        """
+        Retrieves the VALIDATOR_SHARD_STORE environment variable.
+
+        Returns:
+            str: 
+                The SQLite database shared by the workers and the coordinator,
+                or ~/.commune/zangief/shards.db if not set.
+        """
+        return self._get(ENV_VALIDATOR_SHARD_STORE, None) or '~/.commune/zangief/shards.db'
+
+    def get_validator_epoch_deadline(self) -> int:
+        """
+        Retrieves the VALIDATOR_EPOCH_DEADLINE environment variable as an integer.
+
+        Returns:
+            int: 
+                The seconds after which the coordinator votes an epoch with the scores it has,
+                or 3600 if not set.
+
+        Raises:
+            ValueError: 
+                If the VALIDATOR_EPOCH_DEADLINE environment variable contains non-digit characters.
+        """
+        return self._get_optional_int(ENV_VALIDATOR_EPOCH_DEADLINE) or 3600
+
+    def get_validator_max_response_bytes(self) -> int:
+        """
+        Retrieves the VALIDATOR_MAX_RESPONSE_BYTES environment variable as an integer.
+
+        Returns:
+            int: 
+                The largest miner reply in bytes read from the network, or 65536 if not set.
+                Longer replies score zero.
+
+        Raises:
+            ValueError: 
+                If the VALIDATOR_MAX_RESPONSE_BYTES environment variable contains non-digit characters.
+        """
+        return self._get_optional_int(ENV_VALIDATOR_MAX_RESPONSE_BYTES) or 65536
+
+    def get_validator_max_answer_ratio(self) -> float:
+        """
+        Retrieves the VALIDATOR_MAX_ANSWER_RATIO environment variable as a float.
+
+        Returns:
+            float: 
+                How many times longer than the prompt an answer may be before it scores zero, or 4 if not set.
+
+        Raises:
+            ValueError: 
+                If the VALIDATOR_MAX_ANSWER_RATIO environment variable is not a number greater than 0.
+        """
+        ratio = self._get(ENV_VALIDATOR_MAX_ANSWER_RATIO, None)
+
+        if not ratio:
+            return 4.0
+
+        try:
+            value = float(ratio)
+        except ValueError:
+            value = 0.0
+
+        if not value > 0:
+            raise ValueError(
+                f"The environment variable '{ENV_VALIDATOR_MAX_ANSWER_RATIO}' should be a number greater than 0.")
+
+        return value
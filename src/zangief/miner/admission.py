@@ -0,0 +1,360 @@
+import asyncio
+import heapq
+import itertools
+import json
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Callable, Iterable
+
+from communex.module._signer import verify
+from loguru import logger
+from substrateinterface.utils.ss58 import ss58_decode
+
+PRIORITY_REGISTERED = 0
+PRIORITY_ANONYMOUS = 1
+
+# Public key of the caller whose request is being handled, set by CallerKeyMiddleware.
+current_caller: ContextVar[str | None] = ContextVar("current_caller", default=None)
+
+
+def normalize_public_key(key: str | None) -> str | None:
+    if not key:
+        return None
+    key = key.lower()
+    return key[2:] if key.startswith("0x") else key
+
+
+def _public_key(key: str) -> str | None:
+    # Configured keys may be ss58 addresses; callers send hex public keys.
+    try:
+        return normalize_public_key(ss58_decode(key))
+    except ValueError:
+        return normalize_public_key(key)
+
+
+def verify_signature(headers: dict[bytes, bytes], body: bytes, max_age: float) -> bool:
+    """
+    Checks a signed module call the way the module server does: the signature of
+    the `X-Key` caller over the body (or over the body stamped with `X-Timestamp`),
+    and a timestamp no older than `max_age` seconds.
+    """
+    try:
+        key = bytes.fromhex(normalize_public_key(headers[b"x-key"].decode("latin-1")) or "")
+        signature = bytes.fromhex(normalize_public_key(headers[b"x-signature"].decode("latin-1")) or "")
+        crypto = int(headers[b"x-crypto"])
+        body_dict = json.loads(body)
+        timestamp = headers.get(b"x-timestamp", b"").decode("latin-1") or body_dict["params"].get("timestamp")
+        request_time = datetime.fromisoformat(timestamp)
+        if abs((datetime.now(timezone.utc) - request_time).total_seconds()) > max_age:
+            return False
+        if verify(key, crypto, body, signature):
+            return True
+        if headers.get(b"x-timestamp"):
+            body_dict["timestamp"] = timestamp
+            return verify(key, crypto, json.dumps(body_dict).encode(), signature)
+    except Exception:
+        return False
+    return False
+
+
+class CallerDirectory:
+    """
+    Maps a caller's public key (the `X-Key` request header) to a priority class.
+
+    Validator keys of the subnet, and any explicitly configured priority keys, are
+    served ahead of everyone else. The validator set is refreshed in a background
+    thread by calling `fetch_keys`, which returns hex public keys.
+    """
+
+    def __init__(
+        self,
+        fetch_keys: Callable[[], Iterable[str]] | None = None,
+        priority_keys: Iterable[str] = (),
+        refresh_interval: float = 600,
+    ) -> None:
+        self.fetch_keys = fetch_keys
+        self.priority_keys = {_public_key(key) for key in priority_keys}
+        self.refresh_interval = refresh_interval
+        self._registered: set[str] = set()
+
+    def start(self) -> None:
+        if self.fetch_keys is None:
+            return
+        threading.Thread(target=self._refresh_loop, name="caller-directory", daemon=True).start()
+
+    def refresh(self) -> None:
+        keys = {normalize_public_key(key) for key in self.fetch_keys()}
+        self._registered = keys
+        logger.info(f"Loaded {len(keys)} registered caller keys")
+
+    def _refresh_loop(self) -> None:
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Failed to refresh registered caller keys: {e}")
+            time.sleep(self.refresh_interval)
+
+    def priority(self, public_key: str | None) -> int:
+        key = normalize_public_key(public_key)
+        if key is not None and (key in self.priority_keys or key in self._registered):
+            return PRIORITY_REGISTERED
+        return PRIORITY_ANONYMOUS
+
+
+class AdmissionController:
+    """
+    Bounded priority queue in front of the model with deadline-aware load shedding.
+
+    At most `max_concurrency` requests run at once; the rest wait in a queue ordered
+    by priority, then arrival. The service time of finished requests is tracked as
+    an exponentially weighted moving average, which predicts when a newly arriving
+    request would complete. Requests that cannot finish inside `deadline` seconds,
+    or that do not fit in a full queue, are rejected immediately.
+
+    Attributes:
+        max_concurrency: Number of requests allowed to run at once.
+        max_queue: Maximum number of waiting requests.
+        deadline: Seconds a caller waits before giving up (the validator call timeout).
+        service_time: Current estimate of the seconds one request takes.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        max_queue: int = 64,
+        deadline: float = 20,
+        initial_service_time: float = 1.0,
+        smoothing: float = 0.2,
+    ) -> None:
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self.deadline = deadline
+        self.service_time = initial_service_time
+        self.smoothing = smoothing
+        self.active = 0
+        self.rejected = 0
+        self.admitted = 0
+        self._waiters: list[tuple[int, int, float, asyncio.Future]] = []
+        self._sequence = itertools.count()
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for *_, future in self._waiters if not future.done())
+
+    def predicted_completion(self, ahead: int) -> float:
+        """Seconds until a request with `ahead` requests queued before it would finish."""
+        waves = ahead // self.max_concurrency + (1 if self.active >= self.max_concurrency else 0)
+        return (waves + 1) * self.service_time
+
+    def _reject(self) -> bool:
+        self.rejected += 1
+        return False
+
+    async def acquire(self, priority: int = PRIORITY_ANONYMOUS) -> bool:
+        """
+        Waits for a slot to run a request.
+
+        Returns:
+            True when the request may run (the caller must then call `release`),
+            False when it was shed and should get a busy reply.
+        """
+        arrival = time.monotonic()
+        if self.active < self.max_concurrency and self.queue_depth == 0:
+            self.active += 1
+            self.admitted += 1
+            return True
+
+        ahead = sum(1 for p, _, _, future in self._waiters if p <= priority and not future.done())
+        if self.predicted_completion(ahead) > self.deadline:
+            return self._reject()
+
+        if self.queue_depth >= self.max_queue and not self._evict_lower_than(priority):
+            return self._reject()
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), arrival, future))
+        try:
+            admitted = await asyncio.wait_for(future, timeout=self.deadline)
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled() and future.result():
+                # The slot was granted as the timeout fired; hand it to the next waiter.
+                self.release()
+            return self._reject()
+        if admitted:
+            self.admitted += 1
+            return True
+        return self._reject()
+
+    def _evict_lower_than(self, priority: int) -> bool:
+        # Shed the newest waiter of the lowest priority class to make room.
+        candidates = [
+            waiter for waiter in self._waiters if waiter[0] > priority and not waiter[3].done()
+        ]
+        if not candidates:
+            return False
+        victim = max(candidates, key=lambda waiter: (waiter[0], waiter[1]))
+        victim[3].set_result(False)
+        return True
+
+    def release(self, service_seconds: float | None = None) -> None:
+        if service_seconds is not None:
+            self.service_time += self.smoothing * (service_seconds - self.service_time)
+        self.active -= 1
+
+        now = time.monotonic()
+        while self._waiters and self.active < self.max_concurrency:
+            _, _, arrival, future = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            if now - arrival + self.service_time > self.deadline:
+                # It would finish after the caller gave up; do not waste the slot on it.
+                future.set_result(False)
+                continue
+            self.active += 1
+            future.set_result(True)
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "active": self.active,
+            "queue_depth": self.queue_depth,
+            "service_time": self.service_time,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+BUSY_BODY = json.dumps({"error": "busy"}).encode()
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware that runs admission control for the translation endpoint.
+
+    It sits in front of the module server's checks, so anonymous requests are shed
+    at the cost of a header lookup. A caller only gets the priority of its `X-Key`
+    once the request signature and a timestamp at most `max_age` seconds old (the
+    module server's own limit) check out; anyone else queues as anonymous. Rejected
+    requests get a 503 with a `busy` error.
+    """
+
+    def __init__(
+        self,
+        app,
+        controller: AdmissionController,
+        directory: CallerDirectory | None = None,
+        paths: Iterable[str] = ("/method/generate",),
+        max_age: float = 120,
+    ) -> None:
+        self.app = app
+        self.controller = controller
+        self.directory = directory or CallerDirectory()
+        self.paths = set(paths)
+        self.max_age = max_age
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        public_key = headers.get(b"x-key", b"").decode("latin-1") or None
+        priority = self.directory.priority(public_key)
+        if priority == PRIORITY_REGISTERED:
+            body = await _read_body(receive)
+            receive = _replay(body)
+            if not verify_signature(headers, body, self.max_age):
+                logger.debug(f"Unverified request from priority key {public_key}; queueing it as anonymous")
+                priority = PRIORITY_ANONYMOUS
+
+        if not await self.controller.acquire(priority):
+            logger.warning(f"Shedding request (priority {priority}): {self.controller.stats()}")
+            await send({
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(BUSY_BODY)).encode()),
+                    (b"retry-after", str(max(1, round(self.controller.service_time))).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": BUSY_BODY})
+            return
+
+        start_time = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(time.perf_counter() - start_time)
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+def _replay(body: bytes):
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if sent:
+            return {"type": "http.disconnect"}
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return receive
+
+
+class CallerKeyMiddleware:
+    """
+    ASGI middleware that exposes the caller's `X-Key` header as `current_caller`,
+    so endpoints can tell validators apart (e.g. to match a score to the request
+    it grades).
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers") or [])
+        token = current_caller.set(normalize_public_key(headers.get(b"x-key", b"").decode("latin-1")))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_caller.reset(token)
+
+
+def load_admission(config, fetch_keys=None) -> tuple[AdmissionController, CallerDirectory] | None:
+    """
+    Builds admission control from the `admission*` options in `config.ini`.
+
+    Returns:
+        The controller and caller directory, or None when `admission = 0`.
+    """
+    if str(config.get_value("admission", "1")) == "0":
+        return None
+    priority_keys = config.get_value("priority_keys", "")
+    controller = AdmissionController(
+        max_concurrency=int(config.get_value("max_concurrency", 8)),
+        max_queue=int(config.get_value("max_queue", 64)),
+        deadline=float(config.get_value("admission_deadline", 20)),
+    )
+    directory = CallerDirectory(
+        fetch_keys=fetch_keys,
+        priority_keys=[key.strip() for key in priority_keys.split(",") if key.strip()],
+        refresh_interval=float(config.get_value("priority_refresh", 600)),
+    )
+    return controller, directory
@@ -0,0 +1,63 @@
+import hashlib
+import json
+import os
+import shutil
+from typing import Callable
+
+from loguru import logger
+
+DEFAULT_ARTIFACT_DIR = os.path.join(os.path.expanduser("~"), ".commune", "zangief", "models")
+COMPLETE_MARKER = ".complete"
+
+
+class ArtifactCache:
+    """
+    Local cache of converted or quantized model artifacts.
+
+    Each artifact lives in its own directory named after the model, the variant and
+    a fingerprint of everything that affects the conversion (options and library
+    versions), so a changed setting or upgraded runtime never loads a stale file.
+    Artifacts are built in a temporary directory and only moved into place once
+    complete, so an interrupted conversion is redone on the next start.
+    """
+
+    def __init__(self, root: str | None = None) -> None:
+        self.root = os.path.expanduser(root or DEFAULT_ARTIFACT_DIR)
+
+    def path(self, model_name: str, variant: str, **params) -> str:
+        fingerprint = hashlib.sha256(
+            json.dumps(params, sort_keys=True, default=str).encode()
+        ).hexdigest()[:12]
+        return os.path.join(self.root, f"{model_name.replace('/', '--')}-{variant}-{fingerprint}")
+
+    def get_or_build(self, path: str, build: Callable[[str], None]) -> str:
+        """
+        Returns `path`, calling `build(directory)` to create the artifact first if needed.
+        """
+        if os.path.exists(os.path.join(path, COMPLETE_MARKER)):
+            logger.info(f"Using cached artifact {path}")
+            return path
+
+        building = f"{path}.building-{os.getpid()}"
+        shutil.rmtree(building, ignore_errors=True)
+        os.makedirs(building)
+        logger.info(f"Building artifact {path} ...")
+        try:
+            build(building)
+            open(os.path.join(building, COMPLETE_MARKER), "w").close()
+            shutil.rmtree(path, ignore_errors=True)
+            os.replace(building, path)
+        except BaseException:
+            shutil.rmtree(building, ignore_errors=True)
+            raise
+        return path
+
+
+def library_versions(*modules: str) -> dict[str, str]:
+    versions = {}
+    for module in modules:
+        try:
+            versions[module] = __import__(module).__version__
+        except (ImportError, AttributeError):
+            versions[module] = "missing"
+    return versions
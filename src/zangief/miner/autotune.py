@@ -0,0 +1,170 @@
+import argparse
+import dataclasses
+import itertools
+import json
+import math
+import statistics
+import time
+
+from compare_backends import build_jobs, percentile
+from config import Config
+from m2m_backends import BACKENDS, GenerationSettings, load_backend
+from quality import corpus_chrf
+from samples import load_samples, stream_cc100_samples
+
+
+def candidate_settings(base: GenerationSettings, args) -> list[GenerationSettings]:
+    candidates = []
+    for num_beams, do_sample, no_repeat_ngram_size in itertools.product(
+        args.num_beams, args.do_sample, args.no_repeat_ngram_size
+    ):
+        # Sampling with beams is rarely faster or better; keep the sweep small.
+        if num_beams > 1 and do_sample:
+            continue
+        candidates.append(dataclasses.replace(
+            base,
+            num_beams=num_beams,
+            do_sample=bool(do_sample),
+            no_repeat_ngram_size=no_repeat_ngram_size,
+            max_new_tokens_ratio=None,
+        ))
+    return candidates
+
+
+def length_ratio(backend, jobs: list[dict[str, str]], translations: list[str], quantile: float) -> float:
+    """The `quantile` percentile of output tokens per source token."""
+    ratios = []
+    for job, translation in zip(jobs, translations):
+        source_tokens = len(backend.get_tokenizer(job["source_language"]).encode(job["prompt"]))
+        target_tokens = len(backend.get_tokenizer(job["target_language"]).encode(translation))
+        ratios.append(target_tokens / max(1, source_tokens))
+    return percentile(ratios, quantile)
+
+
+def evaluate(backend, jobs: list[dict[str, str]], settings: GenerationSettings, reference: GenerationSettings) -> dict:
+    """
+    Translates every job with `settings` and measures latency and round-trip chrF:
+    the translations are translated back with `reference` and compared with the
+    source text, which needs no human reference.
+    """
+    latencies = []
+    translations = []
+    for job in jobs:
+        start_time = time.perf_counter()
+        translations.append(backend.translate_batch(
+            [job["prompt"]], job["source_language"], job["target_language"], settings=settings
+        )[0])
+        latencies.append(time.perf_counter() - start_time)
+
+    back_translations = [
+        backend.translate_batch(
+            [translation], job["target_language"], job["source_language"], settings=reference
+        )[0]
+        for job, translation in zip(jobs, translations)
+    ]
+    return {
+        "translations": translations,
+        "latency_mean": statistics.mean(latencies),
+        "latency_p95": percentile(latencies, 95),
+        "round_trip_chrf": corpus_chrf(back_translations, [job["prompt"] for job in jobs]),
+    }
+
+
+def tune_pair(backend, jobs: list[dict[str, str]], candidates: list[GenerationSettings], args) -> dict:
+    """
+    Picks the fastest candidate whose quality is within `args.tolerance` chrF of the
+    best one, and derives the pair's max new tokens ratio from its outputs.
+    """
+    reference = dataclasses.replace(backend.settings, do_sample=False, max_new_tokens_ratio=None)
+    results = []
+    for settings in candidates:
+        result = evaluate(backend, jobs, settings, reference)
+        results.append((settings, result))
+        print(
+            f"  beams={settings.num_beams} sample={settings.do_sample} "
+            f"no_repeat={settings.no_repeat_ngram_size}: "
+            f"{result['latency_mean']:.3f}s mean, round-trip chrF {result['round_trip_chrf']:.1f}"
+        )
+
+    best_quality = max(result["round_trip_chrf"] for _, result in results)
+    eligible = [item for item in results if item[1]["round_trip_chrf"] >= best_quality - args.tolerance]
+    settings, result = min(eligible, key=lambda item: item[1]["latency_mean"])
+
+    ratio = length_ratio(backend, jobs, result["translations"], args.length_quantile)
+    return {
+        "profile": {
+            "do_sample": settings.do_sample,
+            "num_beams": settings.num_beams,
+            "no_repeat_ngram_size": settings.no_repeat_ngram_size,
+            "max_new_tokens_ratio": math.ceil(ratio * args.length_margin * 100) / 100,
+        },
+        "latency_mean": result["latency_mean"],
+        "latency_p95": result["latency_p95"],
+        "round_trip_chrf": result["round_trip_chrf"],
+        "best_round_trip_chrf": best_quality,
+        "samples": len(jobs),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="tune M2M decode settings per language pair")
+    parser.add_argument("--config", type=str, default="env/config.ini", help="config file path")
+    parser.add_argument("--backend", type=str, default=None, choices=sorted(BACKENDS),
+                        help="backend to tune; defaults to the backend in config.ini")
+    parser.add_argument("--samples", type=str, default=None,
+                        help="prompt file (.jsonl or plain text); defaults to streaming CC-100")
+    parser.add_argument("--source-language", type=str, default="en",
+                        help="source language for plain text sample files")
+    parser.add_argument("--languages", nargs="+", default=["en", "es", "de"],
+                        help="CC-100 languages to sample and translate between")
+    parser.add_argument("--num-samples", type=int, default=10, help="CC-100 samples per language")
+    parser.add_argument("--num-beams", nargs="+", type=int, default=[1, 2, 4], help="beam sizes to try")
+    parser.add_argument("--do-sample", nargs="+", type=int, default=[0, 1], help="sampling on (1) or off (0)")
+    parser.add_argument("--no-repeat-ngram-size", nargs="+", type=int, default=[0, 3],
+                        help="repeated n-gram blocking sizes to try")
+    parser.add_argument("--tolerance", type=float, default=1.0,
+                        help="chrF points a faster setting may lose against the best one")
+    parser.add_argument("--length-quantile", type=float, default=99,
+                        help="percentile of output/source token ratios used for the length bound")
+    parser.add_argument("--length-margin", type=float, default=1.2, help="safety factor on the length bound")
+    parser.add_argument("--output", type=str, default="generation_profile.json", help="profile file to write")
+    args = parser.parse_args()
+
+    config = Config(config_file=args.config)
+    if args.samples:
+        samples = load_samples(args.samples, source_language=args.source_language)
+    else:
+        samples = []
+        for language in args.languages:
+            samples.extend(stream_cc100_samples(language, args.num_samples))
+
+    jobs_by_pair: dict[str, list[dict[str, str]]] = {}
+    for job in build_jobs(samples, args.languages):
+        jobs_by_pair.setdefault(f"{job['source_language']}-{job['target_language']}", []).append(job)
+
+    backend = load_backend(config, backend_name=args.backend)
+    candidates = candidate_settings(backend.settings, args)
+    print(f"Tuning {len(jobs_by_pair)} language pairs over {len(candidates)} settings")
+
+    pairs = {}
+    report = {}
+    for pair, jobs in sorted(jobs_by_pair.items()):
+        print(f"{pair} ({len(jobs)} samples)")
+        tuned = tune_pair(backend, jobs, candidates, args)
+        pairs[pair] = tuned.pop("profile")
+        report[pair] = tuned
+        print(f"  -> {pairs[pair]}")
+
+    ratios = [profile["max_new_tokens_ratio"] for profile in pairs.values()]
+    profile = {
+        "default": {"max_new_tokens_ratio": max(ratios)} if ratios else {},
+        "pairs": pairs,
+        "report": report,
+    }
+    with open(args.output, "w") as file:
+        json.dump(profile, file, indent=4)
+    print(f"Wrote {args.output}; set generation_profile = {args.output} in config.ini to use it")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,55 @@
+import threading
 import time
+from functools import partial
 from communex.module import Module, endpoint
 from keylimiter import TokenBucketLimiter
 from communex.module.server import ModuleServer
 import uvicorn
 from communex.compat.key import classic_load_key
+from communex.client import CommuneClient
+from communex._common import get_node_url
+from communex.misc import get_map_modules
+from substrateinterface.utils.ss58 import ss58_decode
 from loguru import logger
 from urllib.parse import urlparse
 from abc import abstractmethod
+from admission import AdmissionMiddleware, CallerKeyMiddleware, load_admission
+from cache import load_cache, make_key
+from compression import CompressionMiddleware, load_compression
+from memory import load_memory
+from metrics import MinerMetrics
+from segmentation import join_sentences, split_segments
+from startup import StartupTimer, parse_language_pairs, warm_up
+from worker_pool import load_worker_pool
+
+
+def get_validator_public_keys(netuid: int, use_testnet: bool, min_stake: float = 0) -> list[str]:
+    """
+    Public keys of the subnet's validators: modules earning dividends, or with at
+    least `min_stake` tokens staked when it is set.
+    """
+    client = CommuneClient(get_node_url(use_testnet=use_testnet))
+    modules = get_map_modules(client, netuid=netuid)
+    return [
+        ss58_decode(module["key"]) for module in modules.values()
+        if module["dividends"] > 0 or (min_stake and module["stake"] >= min_stake * 10**9)
+    ]
 
 
 class BaseMiner(Module):
+    warmup_pairs = ""
+    supports_worker_pool = True
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._cache = None
+        self._cache_loaded = False
+        self._cache_lock = threading.Lock()
+        self._memory = None
+        self._memory_loaded = False
+        self.worker_pool = None
+        self.metrics = None
+        self.model_load_seconds = None
 
     @endpoint
     def score(self, bert: float, comet: float, composite: float):
@@ -17,8 +57,14 @@ class BaseMiner(Module):
         logger.info(f"BERT: {bert}")
         logger.info(f"COMET: {comet}")
         logger.info(f"Composite Score (50% BERT + 50% COMET): {composite}")
+        if self.metrics is not None:
+            self.metrics.observe_scores(bert=bert, comet=comet, composite=composite)
+        self.on_score(bert, comet, composite)
         return {"answer": True}
 
+    def on_score(self, bert: float, comet: float, composite: float) -> None:
+        """Called with every score a validator reports for this miner's latest answer."""
+
     @endpoint
     def generate(self, prompt: str, source_language: str, target_language: str) -> dict[str, str]:
         start_time = time.time()
@@ -27,23 +73,134 @@ class BaseMiner(Module):
         logger.info(f"Source ({source_language})")
         logger.info(f"{prompt}")
 
-        translation = self.generate_translation(prompt, source_language, target_language)
+        status = "error"
+        try:
+            translation = self.translate(prompt, source_language, target_language)
+            status = "ok" if translation else "empty"
+        finally:
+            end_time = time.time()
+            execution_time = end_time - start_time
+            if self.metrics is not None:
+                self.metrics.observe_request(source_language, target_language, execution_time, status)
 
         logger.info(f"Translation ({target_language})")
         logger.info(translation)
 
-        end_time = time.time()
-        execution_time = end_time - start_time
         logger.info(f"Responded in {execution_time} seconds")
 
         return {"answer": translation}
 
+    def get_cache(self):
+        with self._cache_lock:
+            if not self._cache_loaded:
+                self._cache = load_cache(self.config)
+                self._cache_loaded = True
+        return self._cache
+
+    def get_memory(self):
+        with self._cache_lock:
+            if not self._memory_loaded:
+                self._memory = load_memory(self.config)
+                self._memory_loaded = True
+        return self._memory
+
+    def translate(self, prompt: str, source_language: str, target_language: str):
+        cache = self.get_cache()
+        if cache is None:
+            return self.translate_uncached(prompt, source_language, target_language)
+
+        translation = cache.get_or_compute(
+            make_key(prompt, source_language, target_language),
+            lambda: self.translate_uncached(prompt, source_language, target_language),
+        )
+        stats = cache.stats()
+        # Every lookup logs; the hit rate is also exported as a metric.
+        logger.debug(
+            f"Translation cache hit rate {stats['hit_rate']:.1%} "
+            f"({stats['hits']} hits, {stats['persistent_hits']} persistent hits, "
+            f"{stats['coalesced']} coalesced, {stats['misses']} misses)"
+        )
+        return translation
+
+    def translate_uncached(self, prompt: str, source_language: str, target_language: str):
+        memory = self.get_memory()
+        segmentation = str(self.config.get_value("segmentation", "0")) == "1"
+        if memory is None and not segmentation:
+            return self.dispatch_translation(prompt, source_language, target_language)
+        return self.translate_segments(prompt, source_language, target_language, memory)
+
+    def translate_segments(self, prompt: str, source_language: str, target_language: str, memory=None):
+        """
+        Splits the prompt into sentences (long ones into clauses), reuses stored
+        translations from the translation memory, sends the remaining segments to
+        the model as one batch and reassembles the translation in order.
+
+        Segments decode side by side, so latency follows the longest sentence
+        rather than the whole paragraph, and long paragraphs are never truncated.
+        """
+        max_chars = int(self.config.get_value("max_segment_chars", 400))
+        segments = split_segments(prompt, source_language, max_chars)
+        if not segments or (len(segments) == 1 and memory is None):
+            return self.dispatch_translation(prompt, source_language, target_language)
+
+        if memory is not None:
+            translations = [memory.lookup(segment.text, source_language, target_language) for segment in segments]
+        else:
+            translations = [None] * len(segments)
+        novel = [index for index, translation in enumerate(translations) if translation is None]
+        if novel:
+            start_time = time.perf_counter()
+            results = self.dispatch_translations(
+                [segments[index].text.strip() for index in novel], source_language, target_language
+            )
+            if memory is not None:
+                memory.record_model_time(len(novel), time.perf_counter() - start_time)
+            for index, translation in zip(novel, results):
+                if not translation:
+                    return None
+                translations[index] = translation
+                if memory is not None:
+                    memory.add(segments[index].text, translation, source_language, target_language)
+
+        if memory is not None:
+            stats = memory.stats()
+            logger.info(
+                f"Translation memory reused {len(segments) - len(novel)} of {len(segments)} segments "
+                f"(hit rate {stats['hit_rate']:.1%}, {stats['seconds_saved']:.1f} seconds saved)"
+            )
+        return join_sentences(translations, segments, target_language)
+
+    def dispatch_translation(self, prompt: str, source_language: str, target_language: str):
+        if self.worker_pool is not None:
+            return self.worker_pool.translate(prompt, source_language, target_language)
+        return self.generate_translation(prompt, source_language, target_language)
+
+    def dispatch_translations(self, prompts: list[str], source_language: str, target_language: str) -> list:
+        if self.worker_pool is not None:
+            futures = [
+                self.worker_pool.submit(prompt, source_language, target_language) for prompt in prompts
+            ]
+            return self.worker_pool.results(futures)
+        return self.generate_translations(prompts, source_language, target_language)
+
+    def generate_translations(self, prompts: list[str], source_language: str, target_language: str) -> list:
+        """Translates several prompts of one language pair; miners that can batch override this."""
+        return [self.generate_translation(prompt, source_language, target_language) for prompt in prompts]
+
+    def warm_up(self, pairs: list[tuple[str, str]]) -> None:
+        """Translates one synthetic sentence per language pair before the server starts."""
+        warm_up(self, pairs)
+
+    def stats(self) -> dict[str, float]:
+        """Miner-specific counters exported as metrics."""
+        return {}
+
     @abstractmethod
     def generate_translation(self, prompt: str, source_language: str, target_language: str):
         pass
 
     @staticmethod
-    def start_miner_server(miner):
+    def start_miner_server(miner, startup=None):
         key_password = miner.config.get_value("key_password")
         if key_password is None:
             key = classic_load_key(miner.config.get_value("keyfile"))
@@ -60,8 +217,88 @@ class BaseMiner(Module):
         else:
             logger.info("Connecting to main network ... ")
 
+        startup = startup or StartupTimer()
         bucket = TokenBucketLimiter(1000, refill_rate)
-        server = ModuleServer(miner, key, limiter=bucket, subnets_whitelist=[13], use_testnet=use_testnet)
-        app = server.get_fastapi_app()
+        app = BaseMiner.build_app(miner, key, bucket, use_testnet, startup=startup)
 
+        # The port only opens once the model is loaded and warm.
+        startup.report()
         uvicorn.run(app, host=parsed_url.hostname, port=parsed_url.port)
+
+    @staticmethod
+    def build_app(miner, key, limiter, use_testnet: bool, netuid: int | None = 13, startup=None):
+        """
+        Builds the miner's FastAPI app: the signed module routes, model warm-up,
+        model workers, admission control, compression and metrics, as
+        configured in `config.ini`.
+
+        With `netuid` set to None callers do not have to be registered on a subnet,
+        which lets the load tester drive the app without a chain connection.
+        """
+        startup = startup or StartupTimer()
+        subnets_whitelist = [netuid] if netuid is not None else None
+        server = ModuleServer(miner, key, limiter=limiter, subnets_whitelist=subnets_whitelist, use_testnet=use_testnet)
+        app = server.get_fastapi_app()
+
+        pairs = parse_language_pairs(miner.config.get_value("warmup_pairs", miner.warmup_pairs))
+        worker_pool = load_worker_pool(miner, miner.config, pairs) if miner.supports_worker_pool else None
+        if worker_pool is not None:
+            # Fork model workers before any background thread is started; each warms up its own copy.
+            with startup.phase("workers"):
+                worker_pool.start()
+            miner.worker_pool = worker_pool
+        elif pairs:
+            with startup.phase("warmup"):
+                miner.warm_up(pairs)
+
+        fetch_keys = None
+        if netuid is not None:
+            min_stake = float(miner.config.get_value("priority_min_stake", 0))
+            fetch_keys = partial(get_validator_public_keys, netuid, use_testnet, min_stake)
+        admission = load_admission(miner.config, fetch_keys=fetch_keys)
+        if admission is not None:
+            controller, directory = admission
+            directory.start()
+            app.add_middleware(AdmissionMiddleware, controller=controller, directory=directory)
+        app.add_middleware(CallerKeyMiddleware)
+
+        # Outermost, so requests are decompressed before any other middleware reads them.
+        compression = load_compression(miner.config)
+        if compression is not None:
+            app.add_middleware(CompressionMiddleware, **compression)
+
+        metrics_port = miner.config.get_value("metrics_port", "")
+        if metrics_port:
+            metrics = MinerMetrics()
+            metrics.serve(int(metrics_port), miner.config.get_value("metrics_host", "127.0.0.1"))
+            if miner.model_load_seconds is not None:
+                metrics.model_load_seconds.set(miner.model_load_seconds)
+            for phase, seconds in startup.phases.items():
+                metrics.startup_seconds.labels(phase).set(seconds)
+            cache = miner.get_cache()
+            if cache is not None:
+                metrics.add_stats(
+                    "zangief_miner_cache", cache.stats,
+                    counters=("hits", "persistent_hits", "coalesced", "misses"),
+                )
+            if admission is not None:
+                metrics.add_stats(
+                    "zangief_miner_admission", controller.stats, counters=("admitted", "rejected")
+                )
+            memory = miner.get_memory()
+            if memory is not None:
+                metrics.add_stats(
+                    "zangief_miner_memory", memory.stats,
+                    counters=("exact_hits", "fuzzy_hits", "misses", "seconds_saved"),
+                )
+            if worker_pool is not None:
+                metrics.add_stats(
+                    "zangief_miner_workers", lambda: {"in_flight": sum(worker_pool.in_flight())}
+                )
+            metrics.add_stats(
+                "zangief_miner", miner.stats,
+                counters=("routed", "fallbacks", "encoder_cache_hits", "encoder_cache_misses"),
+            )
+            miner.metrics = metrics
+
+        return app
@@ -0,0 +1,132 @@
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable
+
+from loguru import logger
+
+
+class RequestBatcher:
+    """
+    Groups concurrent requests that share a key into a single batched call.
+
+    Requests are queued per key (for translation, the language pair). A single
+    worker thread waits until either `max_batch_size` requests for the oldest key
+    are queued or that key's first request has waited `max_wait` seconds, then
+    runs `run_batch(key, items)` once and scatters the results back to callers.
+
+    Attributes:
+        run_batch: Callable taking a key and a list of items and returning one result per item.
+        max_batch_size: Maximum number of items passed to a single `run_batch` call.
+        max_wait: Maximum number of seconds the oldest request waits for more to arrive.
+        on_batch: Optional callback invoked with (key, batch size, seconds) after every batch.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[Hashable, list[Any]], list[Any]],
+        max_batch_size: int = 8,
+        max_wait: float = 0.01,
+        on_batch: Callable[[Hashable, int, float], None] | None = None,
+    ) -> None:
+        self.run_batch = run_batch
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait))
+        self.on_batch = on_batch
+        self._condition = threading.Condition()
+        self._pending: dict[Hashable, list[tuple[Any, Future]]] = {}
+        self._first_seen: dict[Hashable, float] = {}
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+
+    def submit(self, key: Hashable, item: Any) -> Future:
+        return self.submit_many(key, [item])[0]
+
+    def submit_many(self, key: Hashable, items: list[Any]) -> list[Future]:
+        """
+        Queues several items under the same key so they can share a batch.
+
+        Returns:
+            One future per item, in the same order.
+        """
+        futures: list[Future] = [Future() for _ in items]
+        with self._condition:
+            self._ensure_worker()
+            queue = self._pending.setdefault(key, [])
+            if not queue:
+                self._first_seen[key] = time.monotonic()
+            queue.extend(zip(items, futures))
+            self._condition.notify()
+        return futures
+
+    def run(self, key: Hashable, item: Any) -> Any:
+        return self.submit(key, item).result()
+
+    def run_many(self, key: Hashable, items: list[Any]) -> list[Any]:
+        return [future.result() for future in self.submit_many(key, items)]
+
+    def pending(self) -> int:
+        with self._condition:
+            return sum(len(queue) for queue in self._pending.values())
+
+    def _ensure_worker(self) -> None:
+        # Threads do not survive fork, so a forked child starts its own worker.
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        self._pending = {}
+        self._first_seen = {}
+        self._pid = os.getpid()
+        self._thread = threading.Thread(
+            target=self._worker_loop, name="request-batcher", daemon=True
+        )
+        self._thread.start()
+
+    def _next_batch(self) -> tuple[Hashable, list[tuple[Any, Future]]]:
+        with self._condition:
+            while not self._pending:
+                self._condition.wait()
+
+            key = min(self._first_seen, key=self._first_seen.__getitem__)
+            deadline = self._first_seen[key] + self.max_wait
+            while len(self._pending[key]) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+            queue = self._pending[key]
+            batch = queue[:self.max_batch_size]
+            del queue[:self.max_batch_size]
+            if queue:
+                self._first_seen[key] = time.monotonic()
+            else:
+                del self._pending[key]
+                del self._first_seen[key]
+            return key, batch
+
+    def _worker_loop(self) -> None:
+        while True:
+            key, batch = self._next_batch()
+            items = [item for item, _ in batch]
+            start_time = time.perf_counter()
+            try:
+                results = self.run_batch(key, items)
+                if len(results) != len(items):
+                    raise RuntimeError(
+                        f"Batch for {key} returned {len(results)} results for {len(items)} items"
+                    )
+            except Exception as e:
+                logger.error(f"Batch for {key} failed: {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+            if self.on_batch is not None:
+                try:
+                    self.on_batch(key, len(items), time.perf_counter() - start_time)
+                except Exception as e:
+                    logger.warning(f"Batch callback failed: {e}")
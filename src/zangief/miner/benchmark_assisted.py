@@ -0,0 +1,108 @@
+import argparse
+import gc
+import json
+import time
+
+from compare_backends import build_jobs, percentile
+from config import Config
+from loadtest import apply_overrides
+from m2m_backends import load_backend
+from quality import corpus_chrf
+from samples import load_samples, stream_cc100_samples
+
+
+def run_greedy(backend, jobs: list[dict[str, str]]) -> dict:
+    latencies = []
+    translations = []
+    for job in jobs:
+        start_time = time.perf_counter()
+        translation = backend.translate_batch(
+            [job["prompt"]], job["source_language"], job["target_language"]
+        )[0]
+        latencies.append(time.perf_counter() - start_time)
+        translations.append(translation)
+    return {
+        "translations": translations,
+        "latency_total": sum(latencies),
+        "latency_p50": percentile(latencies, 50),
+        "latency_p95": percentile(latencies, 95),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="compare assisted (draft model) decoding with plain greedy decoding"
+    )
+    parser.add_argument("--config", type=str, default="env/config.ini", help="config file path")
+    parser.add_argument("--backend", type=str, default="torch", choices=["torch", "int8"],
+                        help="backend to benchmark")
+    parser.add_argument("--assistant-model", type=str, default="facebook/m2m100_418M",
+                        help="draft model proposing tokens")
+    parser.add_argument("--assistant-tokens", type=int, default=None,
+                        help="tokens proposed per step; defaults to the transformers schedule")
+    parser.add_argument("--samples", type=str, default=None,
+                        help="prompt file (.jsonl or plain text); defaults to streaming CC-100")
+    parser.add_argument("--source-language", type=str, default="en",
+                        help="source language for plain text sample files")
+    parser.add_argument("--languages", nargs="+", default=["en", "es", "de"],
+                        help="CC-100 languages to sample and translate between")
+    parser.add_argument("--num-samples", type=int, default=10, help="CC-100 samples per language")
+    parser.add_argument("--output", type=str, default=None, help="write the report as JSON")
+    args = parser.parse_args()
+
+    if args.samples:
+        samples = load_samples(args.samples, source_language=args.source_language)
+    else:
+        samples = []
+        for language in args.languages:
+            samples.extend(stream_cc100_samples(language, args.num_samples))
+    jobs = build_jobs(samples, args.languages)
+
+    # Parity is only defined for deterministic decoding.
+    config = Config(config_file=args.config)
+    apply_overrides(config, ["do_sample=0", "num_beams=1", "device=cpu", "assistant_model="])
+    print(f"Benchmarking {args.backend} with draft {args.assistant_model} on {len(jobs)} translations")
+
+    backend = load_backend(config, backend_name=args.backend)
+    greedy = run_greedy(backend, jobs)
+    del backend
+    gc.collect()
+
+    assisted_overrides = [f"assistant_model={args.assistant_model}"]
+    if args.assistant_tokens:
+        assisted_overrides.append(f"assistant_tokens={args.assistant_tokens}")
+    apply_overrides(config, assisted_overrides)
+    backend = load_backend(config, backend_name=args.backend)
+    assisted = run_greedy(backend, jobs)
+
+    greedy_translations = greedy.pop("translations")
+    assisted_translations = assisted.pop("translations")
+    matches = sum(a == b for a, b in zip(greedy_translations, assisted_translations))
+    report = {
+        "jobs": len(jobs),
+        "greedy": greedy,
+        "assisted": assisted,
+        "speedup": greedy["latency_total"] / assisted["latency_total"] if assisted["latency_total"] else 0.0,
+        "exact_match": matches / len(jobs) if jobs else 0.0,
+        "chrf_vs_greedy": corpus_chrf(assisted_translations, greedy_translations),
+    }
+
+    print(f"{'decoding':<10} {'total s':>8} {'p50 s':>8} {'p95 s':>8}")
+    for name in ("greedy", "assisted"):
+        result = report[name]
+        print(
+            f"{name:<10} {result['latency_total']:>8.2f} "
+            f"{result['latency_p50']:>8.3f} {result['latency_p95']:>8.3f}"
+        )
+    print(
+        f"speedup {report['speedup']:.2f}x, exact match {report['exact_match']:.1%}, "
+        f"chrF vs greedy {report['chrf_vs_greedy']:.1f}"
+    )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=4)
+
+
+if __name__ == "__main__":
+    main()
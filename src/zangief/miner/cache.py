@@ -0,0 +1,197 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable
+
+from loguru import logger
+
+
+def make_key(prompt: str, source_language: str, target_language: str) -> str:
+    digest = hashlib.sha256()
+    for part in (source_language, target_language, prompt):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class TranslationCache:
+    """
+    In-memory LRU cache of translations with an optional SQLite tier.
+
+    Entries expire after `ttl` seconds in both tiers. Concurrent lookups of the same
+    key while it is being computed wait on that single computation instead of
+    starting their own (single-flight). Computations that return None or raise are
+    not cached.
+
+    Attributes:
+        max_size: Maximum number of entries kept in memory.
+        ttl: Entry lifetime in seconds, 0 to never expire.
+        path: Optional path of the SQLite database backing the persistent tier.
+    """
+
+    def __init__(self, max_size: int = 10_000, ttl: float = 3600, path: str | None = None) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.path = path
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._in_flight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._db = None
+        self._db_lock = threading.Lock()
+        if path:
+            self._open_db(path)
+
+    def _open_db(self, path: str) -> None:
+        path = os.path.expanduser(path)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db_lock, self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS translations "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            if self.ttl:
+                self._db.execute(
+                    "DELETE FROM translations WHERE created < ?", (time.time() - self.ttl,)
+                )
+        logger.info(f"Using persistent translation cache at {path}")
+
+    def _is_fresh(self, created: float) -> bool:
+        return not self.ttl or time.time() - created < self.ttl
+
+    def _get_memory(self, key: str) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        created, value = entry
+        if not self._is_fresh(created):
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _put_memory(self, key: str, value: str, created: float) -> None:
+        self._entries[key] = (created, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _get_persistent(self, key: str) -> tuple[float, str] | None:
+        if self._db is None:
+            return None
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT created, value FROM translations WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or not self._is_fresh(row[0]):
+            return None
+        return row
+
+    def _put_persistent(self, key: str, value: str, created: float) -> None:
+        if self._db is None:
+            return
+        try:
+            with self._db_lock, self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO translations (key, value, created) VALUES (?, ?, ?)",
+                    (key, value, created),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to persist cached translation: {e}")
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            value = self._get_memory(key)
+            if value is not None:
+                self.hits += 1
+            return value
+
+    def get_or_compute(self, key: str, compute: Callable[[], str | None]) -> str | None:
+        """
+        Returns the cached value for `key`, computing it at most once concurrently.
+        """
+        with self._lock:
+            value = self._get_memory(key)
+            if value is not None:
+                self.hits += 1
+                return value
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                owner = False
+            else:
+                future = Future()
+                self._in_flight[key] = future
+                owner = True
+
+        if not owner:
+            return future.result()
+
+        try:
+            persisted = self._get_persistent(key)
+            if persisted is not None:
+                created, value = persisted
+                with self._lock:
+                    self.persistent_hits += 1
+                    self._put_memory(key, value, created)
+            else:
+                with self._lock:
+                    self.misses += 1
+                value = compute()
+                if value is not None:
+                    created = time.time()
+                    with self._lock:
+                        self._put_memory(key, value, created)
+                    self._put_persistent(key, value, created)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.persistent_hits + self.misses + self.coalesced
+            served = self.hits + self.persistent_hits + self.coalesced
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "persistent_hits": self.persistent_hits,
+                "coalesced": self.coalesced,
+                "misses": self.misses,
+                "hit_rate": served / lookups if lookups else 0.0,
+            }
+
+
+def load_cache(config) -> TranslationCache | None:
+    """
+    Builds the translation cache from the `cache_*` options in `config.ini`.
+
+    Returns:
+        The cache, or None when `cache_size` is 0.
+    """
+    max_size = int(config.get_value("cache_size", 10_000))
+    if max_size <= 0:
+        return None
+    return TranslationCache(
+        max_size=max_size,
+        ttl=float(config.get_value("cache_ttl", 3600)),
+        path=config.get_value("cache_path", None),
+    )
@@ -0,0 +1,122 @@
+import argparse
+import gc
+import json
+import statistics
+import time
+
+from config import Config
+from m2m_backends import BACKENDS, load_backend
+from quality import corpus_chrf
+from samples import load_samples, stream_cc100_samples
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def build_jobs(samples: list[dict[str, str]], target_languages: list[str]) -> list[dict[str, str]]:
+    jobs = []
+    for sample in samples:
+        targets = [sample["target_language"]] if "target_language" in sample else target_languages
+        for target_language in targets:
+            if target_language != sample["source_language"]:
+                jobs.append({**sample, "target_language": target_language})
+    return jobs
+
+
+def run_backend(backend, jobs: list[dict[str, str]], batch_size: int) -> dict:
+    # Single-request latency, as seen by one validator at a time.
+    latencies = []
+    translations = []
+    for job in jobs:
+        start_time = time.perf_counter()
+        translation = backend.translate_batch(
+            [job["prompt"]], job["source_language"], job["target_language"]
+        )[0]
+        latencies.append(time.perf_counter() - start_time)
+        translations.append(translation)
+
+    # Batched throughput, as seen under concurrent load.
+    batched_start = time.perf_counter()
+    by_pair: dict[tuple[str, str], list[str]] = {}
+    for job in jobs:
+        by_pair.setdefault((job["source_language"], job["target_language"]), []).append(job["prompt"])
+    for (source_language, target_language), prompts in by_pair.items():
+        for i in range(0, len(prompts), batch_size):
+            backend.translate_batch(prompts[i:i + batch_size], source_language, target_language)
+    batched_seconds = time.perf_counter() - batched_start
+
+    return {
+        "translations": translations,
+        "latency_mean": statistics.mean(latencies),
+        "latency_p50": percentile(latencies, 50),
+        "latency_p95": percentile(latencies, 95),
+        "batched_per_second": len(jobs) / batched_seconds if batched_seconds else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="compare M2M backend latency and quality")
+    parser.add_argument("--config", type=str, default="env/config.ini", help="config file path")
+    parser.add_argument("--backends", nargs="+", default=["torch", "int8", "ctranslate2"],
+                        choices=sorted(BACKENDS), help="backends to compare, the first is the reference")
+    parser.add_argument("--samples", type=str, default=None,
+                        help="prompt file (.jsonl or plain text); defaults to streaming CC-100")
+    parser.add_argument("--source-language", type=str, default="en",
+                        help="source language for plain text sample files")
+    parser.add_argument("--languages", nargs="+", default=["en", "es", "de"],
+                        help="CC-100 languages to sample and translate between")
+    parser.add_argument("--num-samples", type=int, default=10, help="CC-100 samples per language")
+    parser.add_argument("--batch-size", type=int, default=8, help="batch size for the throughput run")
+    parser.add_argument("--output", type=str, default=None, help="write the report as JSON")
+    args = parser.parse_args()
+
+    config = Config(config_file=args.config)
+
+    if args.samples:
+        samples = load_samples(args.samples, source_language=args.source_language)
+    else:
+        samples = []
+        for language in args.languages:
+            samples.extend(stream_cc100_samples(language, args.num_samples))
+    jobs = build_jobs(samples, args.languages)
+    print(f"Comparing {args.backends} on {len(jobs)} translations")
+
+    report = {}
+    reference = None
+    for backend_name in args.backends:
+        load_start = time.perf_counter()
+        backend = load_backend(config, backend_name=backend_name)
+        load_seconds = time.perf_counter() - load_start
+
+        result = run_backend(backend, jobs, args.batch_size)
+        translations = result.pop("translations")
+        if reference is None:
+            reference = translations
+        result["load_seconds"] = load_seconds
+        result["chrf_vs_reference"] = corpus_chrf(translations, reference)
+        report[backend_name] = result
+
+        del backend
+        gc.collect()
+
+    header = f"{'backend':<12} {'load s':>8} {'mean s':>8} {'p50 s':>8} {'p95 s':>8} {'batched/s':>10} {'chrF':>7}"
+    print(header)
+    for backend_name, result in report.items():
+        print(
+            f"{backend_name:<12} {result['load_seconds']:>8.1f} {result['latency_mean']:>8.3f} "
+            f"{result['latency_p50']:>8.3f} {result['latency_p95']:>8.3f} "
+            f"{result['batched_per_second']:>10.2f} {result['chrf_vs_reference']:>7.1f}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"jobs": len(jobs), "backends": report}, file, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+import gzip
+import json
+import zlib
+
+from loguru import logger
+
+SUPPORTED_ENCODINGS = ("zstd", "gzip")
+
+
+class RequestTooLarge(Exception):
+    pass
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError("zstd compression requires zstandard: pip install zstandard") from e
+    return zstandard
+
+
+def compress(data: bytes, encoding: str, level: int | None = None) -> bytes:
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=6 if level is None else level)
+    if encoding == "zstd":
+        return _zstd().ZstdCompressor(level=3 if level is None else level).compress(data)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def decompress(data: bytes, encoding: str, max_size: int) -> bytes:
+    """
+    Decompresses `data`, raising `RequestTooLarge` as soon as the output would
+    exceed `max_size` bytes, so a small compressed body cannot inflate into an
+    arbitrarily large one.
+    """
+    if encoding == "gzip":
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        output = decompressor.decompress(data, max_size + 1)
+        if len(output) > max_size or decompressor.unconsumed_tail:
+            raise RequestTooLarge(f"Decompressed body exceeds {max_size} bytes")
+        return output
+    if encoding == "zstd":
+        reader = _zstd().ZstdDecompressor().stream_reader(data)
+        output = reader.read(max_size + 1)
+        if len(output) > max_size:
+            raise RequestTooLarge(f"Decompressed body exceeds {max_size} bytes")
+        return output
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def accepted_encoding(accept_encoding: str, encodings: tuple[str, ...]) -> str | None:
+    """The first of `encodings` the client accepts, by the `Accept-Encoding` header."""
+    accepted = set()
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        accepted.add(name.strip().lower())
+    for encoding in encodings:
+        if encoding in accepted or "*" in accepted:
+            return encoding
+    return None
+
+
+def _error(status: int, message: str) -> tuple[dict, dict]:
+    body = json.dumps({"error": message}).encode()
+    return (
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        },
+        {"type": "http.response.body", "body": body},
+    )
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware that decompresses gzip or zstd request bodies and compresses
+    responses with the first of `encodings` the caller accepts.
+
+    Request bodies are decompressed before the module server checks their
+    signature, so signed calls work unchanged; a body larger than
+    `max_request_bytes` once decompressed is rejected with a 413. Responses smaller
+    than `min_size` bytes are sent as they are.
+    """
+
+    def __init__(
+        self,
+        app,
+        encodings: tuple[str, ...] = SUPPORTED_ENCODINGS,
+        min_size: int = 512,
+        max_request_bytes: int = 1 << 20,
+    ) -> None:
+        self.app = app
+        self.encodings = tuple(encodings)
+        self.min_size = min_size
+        self.max_request_bytes = max_request_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        content_encoding = headers.get(b"content-encoding", b"").decode("latin-1").strip().lower()
+        if content_encoding and content_encoding != "identity":
+            if content_encoding not in self.encodings:
+                for message in _error(415, f"unsupported content encoding: {content_encoding}"):
+                    await send(message)
+                return
+            try:
+                body = await self._read_body(receive)
+                body = decompress(body, content_encoding, self.max_request_bytes)
+            except RequestTooLarge as e:
+                for message in _error(413, str(e)):
+                    await send(message)
+                return
+            except Exception as e:
+                logger.warning(f"Rejecting a request body that does not decompress: {e}")
+                for message in _error(400, "invalid compressed body"):
+                    await send(message)
+                return
+            scope = dict(scope)
+            scope["headers"] = [
+                (name, value) for name, value in scope["headers"]
+                if name not in (b"content-encoding", b"content-length")
+            ] + [(b"content-length", str(len(body)).encode())]
+            receive = self._replay(body)
+
+        encoding = accepted_encoding(headers.get(b"accept-encoding", b"").decode("latin-1"), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, self._compressing(send, encoding))
+
+    async def _read_body(self, receive) -> bytes:
+        chunks = []
+        size = 0
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                break
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            # Compressed bodies are far smaller than what they decompress to.
+            if size > self.max_request_bytes:
+                raise RequestTooLarge(f"Request body exceeds {self.max_request_bytes} bytes")
+            chunks.append(chunk)
+            if not message.get("more_body", False):
+                break
+        return b"".join(chunks)
+
+    @staticmethod
+    def _replay(body: bytes):
+        sent = False
+
+        async def receive():
+            nonlocal sent
+            if sent:
+                return {"type": "http.disconnect"}
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        return receive
+
+    def _compressing(self, send, encoding: str):
+        start = None
+        chunks: list[bytes] = []
+
+        async def send_compressed(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            headers = [
+                (name, value) for name, value in start.get("headers", [])
+                if name.lower() != b"content-length"
+            ]
+            already_encoded = any(name.lower() == b"content-encoding" for name, _ in headers)
+            if len(body) >= self.min_size and not already_encoded:
+                body = compress(body, encoding)
+                headers += [(b"content-encoding", encoding.encode()), (b"vary", b"accept-encoding")]
+            headers.append((b"content-length", str(len(body)).encode()))
+            await send({**start, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+
+        return send_compressed
+
+
+def load_compression(config) -> dict | None:
+    """
+    Reads the `compression*` options of `config.ini`.
+
+    Returns:
+        The keyword arguments of `CompressionMiddleware`, or None when `compression` is not set.
+    """
+    value = str(config.get_value("compression", "0")).strip().lower()
+    if value in ("", "0", "none"):
+        return None
+    encodings = tuple(encoding.strip() for encoding in value.split(",") if encoding.strip())
+    for encoding in encodings:
+        if encoding not in SUPPORTED_ENCODINGS:
+            raise ValueError(f"Unsupported compression {encoding!r}; use one of {SUPPORTED_ENCODINGS}")
+    if "zstd" in encodings:
+        _zstd()
+    return {
+        "encodings": encodings,
+        "min_size": int(config.get_value("compression_min_size", 512)),
+        "max_request_bytes": int(config.get_value("max_request_bytes", 1 << 20)),
+    }
@@ -23,3 +23,19 @@ class Config:
         if self.config.has_option(section, option):
             return self.config.get(section, option)
         return default
+
+
+class BackendConfig:
+    """
+    Options for one backend of the routing miner: `[miner.<backend>]` overrides
+    `[miner]`, so backends can use different values for shared names like `model`.
+    """
+
+    def __init__(self, config: Config, backend: str):
+        self.base = config
+        self.section = f"miner.{backend}"
+
+    def get_value(self, option, default=None):
+        if self.base.config.has_option(self.section, option):
+            return self.base.config.get(self.section, option)
+        return self.base.get_value(option, default)
@@ -0,0 +1,321 @@
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from typing import Awaitable, Callable
+
+from compare_backends import percentile
+from config import Config
+from samples import load_samples, stream_cc100_samples
+
+VALIDATOR_LANGUAGES = ["ar", "de", "en", "es", "fr", "he", "hi", "pt", "ru", "ur", "vi", "zh"]
+
+Call = Callable[[str, str, str], Awaitable[str]]
+
+
+def make_prompts(
+    samples: list[dict[str, str]], languages: list[str], count: int, seed: int | None = None
+) -> list[dict[str, str]]:
+    """
+    Draws `count` prompts the way the validator's `get_miner_prompt` does: a random
+    source language, a random different target language and a random sample in the
+    source language. Samples that already carry a `target_language` (a captured
+    prompt file) are replayed as is, in order.
+    """
+    if samples and all("target_language" in sample for sample in samples):
+        return [dict(samples[i % len(samples)]) for i in range(count)]
+
+    rng = random.Random(seed)
+    by_language: dict[str, list[dict[str, str]]] = {}
+    for sample in samples:
+        by_language.setdefault(sample["source_language"], []).append(sample)
+    source_languages = sorted(by_language)
+    if not source_languages:
+        raise ValueError("No samples to build prompts from")
+
+    prompts = []
+    for _ in range(count):
+        source_language = rng.choice(source_languages)
+        target_languages = [language for language in languages if language != source_language]
+        prompts.append({
+            "prompt": rng.choice(by_language[source_language])["prompt"],
+            "source_language": source_language,
+            "target_language": rng.choice(target_languages),
+        })
+    return prompts
+
+
+async def run_load(
+    call: Call,
+    prompts: list[dict[str, str]],
+    concurrency: int = 8,
+    rate: float | None = None,
+    timeout: float = 30,
+    seed: int | None = None,
+) -> tuple[list[dict], float]:
+    """
+    Sends every prompt through `call` and records how each request ended.
+
+    With `rate` unset the load is closed-loop: `concurrency` callers each send their
+    next request as soon as the previous one returns. With `rate` set, requests
+    arrive as a Poisson process at `rate` per second regardless of how fast the
+    miner answers, and latency is measured from the scheduled arrival so a slow
+    miner cannot hide its queueing delay.
+
+    Returns:
+        The per-request results and the wall clock duration of the run.
+    """
+
+    async def send(job: dict[str, str], arrival: float) -> dict:
+        status = "ok"
+        try:
+            answer = await asyncio.wait_for(
+                call(job["prompt"], job["source_language"], job["target_language"]), timeout
+            )
+            if not answer:
+                status = "empty"
+        except asyncio.TimeoutError:
+            status = "timeout"
+        except Exception as e:
+            status = "timeout" if "timeout" in type(e).__name__.lower() else "error"
+        return {
+            "pair": f"{job['source_language']}-{job['target_language']}",
+            "seconds": time.perf_counter() - arrival,
+            "status": status,
+        }
+
+    start_time = time.perf_counter()
+    if rate:
+        rng = random.Random(seed)
+        tasks = []
+        arrival = start_time
+        for job in prompts:
+            arrival += rng.expovariate(rate)
+            await asyncio.sleep(max(0.0, arrival - time.perf_counter()))
+            tasks.append(asyncio.ensure_future(send(job, arrival)))
+        results = list(await asyncio.gather(*tasks))
+    else:
+        queue = list(reversed(prompts))
+        results = []
+
+        async def caller():
+            while queue:
+                job = queue.pop()
+                results.append(await send(job, time.perf_counter()))
+
+        await asyncio.gather(*(caller() for _ in range(max(1, concurrency))))
+    return results, time.perf_counter() - start_time
+
+
+def latency_summary(results: list[dict], wall_seconds: float) -> dict:
+    latencies = [result["seconds"] for result in results if result["status"] in ("ok", "empty")]
+    statuses = [result["status"] for result in results]
+    return {
+        "requests": len(results),
+        "ok": statuses.count("ok"),
+        "empty": statuses.count("empty"),
+        "errors": statuses.count("error"),
+        "timeouts": statuses.count("timeout"),
+        "throughput": len(latencies) / wall_seconds if wall_seconds else 0.0,
+        "latency_mean": statistics.mean(latencies) if latencies else 0.0,
+        "latency_p50": percentile(latencies, 50),
+        "latency_p95": percentile(latencies, 95),
+        "latency_p99": percentile(latencies, 99),
+    }
+
+
+def summarize(results: list[dict], wall_seconds: float) -> dict:
+    """Builds the report: overall numbers plus the same numbers per language pair."""
+    by_pair: dict[str, list[dict]] = {}
+    for result in results:
+        by_pair.setdefault(result["pair"], []).append(result)
+    report = latency_summary(results, wall_seconds)
+    report["wall_seconds"] = wall_seconds
+    report["pairs"] = {
+        pair: latency_summary(pair_results, wall_seconds)
+        for pair, pair_results in sorted(by_pair.items())
+    }
+    return report
+
+
+def apply_overrides(config, overrides: list[str]) -> dict[str, str]:
+    """Applies `option=value` overrides to the `[miner]` section of `config`."""
+    applied = {}
+    if not config.config.has_section("miner"):
+        config.config.add_section("miner")
+    for override in overrides:
+        option, _, value = override.partition("=")
+        config.config.set("miner", option.strip(), value.strip())
+        applied[option.strip()] = value.strip()
+    return applied
+
+
+def remote_target(address: str, key_name: str | None, target_key: str, timeout: float) -> Call:
+    """Calls a running miner through `ModuleClient`, signing like a validator does."""
+    from communex.compat.key import classic_load_key
+    from communex.module._signer import TESTING_MNEMONIC
+    from communex.module.client import ModuleClient
+    from substrateinterface import Keypair
+
+    host, port = address.rsplit(":", 1)
+    key = classic_load_key(key_name) if key_name else Keypair.create_from_mnemonic(TESTING_MNEMONIC)
+    client = ModuleClient(host, int(port), key)
+
+    async def call(prompt: str, source_language: str, target_language: str) -> str:
+        response = await client.call(
+            "generate",
+            target_key,
+            {"prompt": prompt, "source_language": source_language, "target_language": target_language},
+            timeout=int(timeout),
+        )
+        return response["answer"]
+
+    return call
+
+
+def in_process_target(miner_type: str, config) -> tuple[Call, Callable[[], Awaitable[None]]]:
+    """
+    Builds the miner's FastAPI app in this process and calls it over an in-memory
+    transport, with the same signing, admission, workers and cache as a real server
+    but without a network or chain registration.
+
+    Returns:
+        The call function and a coroutine function that closes the client.
+    """
+    import httpx
+    from communex.module._protocol import create_request_data
+    from communex.module._rate_limiters.limiters import IpLimiterParams
+    from communex.module._signer import TESTING_MNEMONIC
+    from substrateinterface import Keypair
+
+    from base_miner import BaseMiner
+    from startup import StartupTimer
+
+    startup = StartupTimer()
+    if miner_type == "m2m":
+        from m2m_miner import M2MMiner
+        with startup.phase("model"):
+            miner = M2MMiner(config=config)
+    elif miner_type == "openai":
+        from openai_miner import OpenAIMiner
+        with startup.phase("model"):
+            miner = OpenAIMiner(config=config)
+    elif miner_type == "router":
+        from router_miner import RouterMiner
+        with startup.phase("model"):
+            miner = RouterMiner(config=config)
+    else:
+        raise ValueError(f"Unsupported miner '{miner_type}'")
+
+    key = Keypair.create_from_mnemonic(TESTING_MNEMONIC)
+    limiter = IpLimiterParams(bucket_size=10**9, refill_rate=10**9)
+    app = BaseMiner.build_app(miner, key, limiter, use_testnet=False, netuid=None, startup=startup)
+    startup.report()
+
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://miner")
+
+    async def call(prompt: str, source_language: str, target_language: str) -> str:
+        params = {"prompt": prompt, "source_language": source_language, "target_language": target_language}
+        body, headers = create_request_data(key, key.ss58_address, params)
+        response = await client.post("/method/generate", content=body, headers=headers)
+        response.raise_for_status()
+        return response.json()["answer"]
+
+    return call, client.aclose
+
+
+def main():
+    parser = argparse.ArgumentParser(description="load test a miner's generate endpoint")
+    parser.add_argument("--miner", type=str, default=None, choices=["m2m", "openai", "router"],
+                        help="build this miner in-process instead of calling --address")
+    parser.add_argument("--config", type=str, default="env/config.ini", help="config file path")
+    parser.add_argument("--set", dest="overrides", action="append", default=[], metavar="OPTION=VALUE",
+                        help="override a config.ini option for the in-process miner, e.g. num_beams=2")
+    parser.add_argument("--address", type=str, default=None, help="host:port of a running miner")
+    parser.add_argument("--target-key", type=str, default=None, help="ss58 address of the running miner")
+    parser.add_argument("--key", type=str, default=None,
+                        help="key used to sign remote calls; must be registered on the miner's subnet")
+    parser.add_argument("--samples", type=str, default=None,
+                        help="prompt file (.jsonl or plain text); defaults to streaming CC-100")
+    parser.add_argument("--source-language", type=str, default="en",
+                        help="source language for plain text sample files")
+    parser.add_argument("--languages", nargs="+", default=VALIDATOR_LANGUAGES,
+                        help="languages to sample and translate between")
+    parser.add_argument("--num-samples", type=int, default=10, help="CC-100 samples per language")
+    parser.add_argument("--requests", type=int, default=100, help="number of requests to send")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent callers (closed loop)")
+    parser.add_argument("--rate", type=float, default=None,
+                        help="arrival rate in requests per second (open loop, ignores --concurrency)")
+    parser.add_argument("--timeout", type=float, default=30, help="per request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for prompts and arrivals")
+    parser.add_argument("--save-prompts", type=str, default=None,
+                        help="write the generated prompts as .jsonl for replay with --samples")
+    parser.add_argument("--output", type=str, default=None, help="write the report as JSON")
+    args = parser.parse_args()
+
+    if args.samples:
+        samples = load_samples(args.samples, source_language=args.source_language)
+    else:
+        samples = []
+        for language in args.languages:
+            samples.extend(stream_cc100_samples(language, args.num_samples))
+    prompts = make_prompts(samples, args.languages, args.requests, seed=args.seed)
+
+    if args.save_prompts:
+        with open(args.save_prompts, "w", encoding="utf-8") as file:
+            for prompt in prompts:
+                file.write(json.dumps(prompt, ensure_ascii=False) + "\n")
+
+    overrides = {}
+    close = None
+    if args.miner:
+        config = Config(config_file=args.config)
+        overrides = apply_overrides(config, args.overrides)
+        call, close = in_process_target(args.miner, config)
+        target = f"in-process {args.miner}"
+    elif args.address and args.target_key:
+        call = remote_target(args.address, args.key, args.target_key, args.timeout)
+        target = args.address
+    else:
+        parser.error("either --miner or both --address and --target-key are required")
+
+    mode = f"{args.rate} requests/s" if args.rate else f"concurrency {args.concurrency}"
+    print(f"Sending {len(prompts)} requests to {target} at {mode}")
+
+    async def run():
+        try:
+            return await run_load(
+                call, prompts, concurrency=args.concurrency, rate=args.rate,
+                timeout=args.timeout, seed=args.seed,
+            )
+        finally:
+            if close is not None:
+                await close()
+
+    results, wall_seconds = asyncio.run(run())
+    report = summarize(results, wall_seconds)
+
+    header = f"{'pair':<8} {'requests':>8} {'errors':>7} {'timeouts':>8} {'req/s':>7} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7}"
+    print(header)
+    for pair, result in [("all", report), *report["pairs"].items()]:
+        print(
+            f"{pair:<8} {result['requests']:>8} {result['errors']:>7} {result['timeouts']:>8} "
+            f"{result['throughput']:>7.2f} {result['latency_p50']:>7.3f} "
+            f"{result['latency_p95']:>7.3f} {result['latency_p99']:>7.3f}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({
+                "target": target,
+                "concurrency": None if args.rate else args.concurrency,
+                "rate": args.rate,
+                "overrides": overrides,
+                "report": report,
+            }, file, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,588 @@
+import copy
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from loguru import logger
+
+import telemetry
+from artifacts import ArtifactCache, library_versions
+from profiles import load_profiles, max_new_tokens
+
+DEFAULT_MODEL = "facebook/m2m100_1.2B"
+
+
+def get_bool(config, option, default):
+    value = config.get_value(option, default)
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() not in ("0", "false", "no", "off", "")
+
+
+@dataclass
+class GenerationSettings:
+    max_length: int = 1024
+    do_sample: bool = True
+    temperature: float = 1.0
+    top_k: int = 10
+    no_repeat_ngram_size: int = 3
+    num_beams: int = 1
+    # Bounds generated tokens to this multiple of the source length when set.
+    max_new_tokens_ratio: float | None = None
+    max_new_tokens_min: int = 16
+
+    @classmethod
+    def from_config(cls, config) -> "GenerationSettings":
+        max_new_tokens_ratio = config.get_value("max_new_tokens_ratio")
+        return cls(
+            max_length=int(config.get_value("max_length", 1024)),
+            do_sample=get_bool(config, "do_sample", "store_true"),
+            temperature=float(config.get_value("temperature", 1.0)),
+            top_k=int(config.get_value("top_k", 10)),
+            no_repeat_ngram_size=int(config.get_value("no_repeat_ngram_size", 3)),
+            num_beams=int(config.get_value("num_beams", 1)),
+            max_new_tokens_ratio=float(max_new_tokens_ratio) if max_new_tokens_ratio else None,
+            max_new_tokens_min=int(config.get_value("max_new_tokens_min", 16)),
+        )
+
+
+class EncoderCache:
+    """
+    Bounded LRU cache of encoder hidden states keyed by (source text, source language).
+
+    Validators often send the same paragraph to be translated into several target
+    languages; the encoder output only depends on the source, so it is computed once.
+    """
+
+    def __init__(self, max_size: int = 64) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+class M2MBackend(ABC):
+    """
+    Base class for M2M100 inference runtimes.
+
+    A backend owns the model weights and turns a batch of prompts sharing one
+    language pair into translations. Subclasses implement `load_model` and
+    `translate_batch`.
+
+    Attributes:
+        name: Identifier used for the `backend` option in `config.ini`.
+        model_name: Hugging Face model id or local path.
+        device: Torch device string, e.g. "cpu" or "cuda:0".
+        settings: Decoding parameters from `config.ini`.
+        profiles: Per language pair overrides of `settings`, from `generation_profile`.
+    """
+
+    name = "base"
+
+    def __init__(self, model_name: str, device: str, settings: GenerationSettings, config=None) -> None:
+        from transformers import M2M100Tokenizer
+
+        self.model_name = model_name
+        self.device = device
+        self.settings = settings
+        self.config = config
+        self.profiles = load_profiles(config)
+        self.tokenizer = M2M100Tokenizer.from_pretrained(model_name)
+        self._tokenizers = {}
+        self._tokenizers_lock = threading.Lock()
+        self.load_model()
+
+    def get_option(self, option, default=None):
+        if self.config is None:
+            return default
+        return self.config.get_value(option, default)
+
+    def artifact_path(self, *libraries: str, **params) -> tuple[ArtifactCache, str]:
+        artifacts = ArtifactCache(self.get_option("export_dir"))
+        path = artifacts.path(
+            self.model_name, self.name, **params, **library_versions(*libraries)
+        )
+        return artifacts, path
+
+    def settings_for(self, source_language: str, target_language: str) -> GenerationSettings:
+        if self.profiles is None:
+            return self.settings
+        return self.profiles.settings_for(self.settings, source_language, target_language)
+
+    def get_tokenizer(self, source_language: str):
+        """
+        Returns a tokenizer dedicated to `source_language`, so concurrent requests
+        never race on the shared tokenizer's `src_lang`.
+        """
+        with self._tokenizers_lock:
+            tokenizer = self._tokenizers.get(source_language)
+            if tokenizer is None:
+                tokenizer = copy.deepcopy(self.tokenizer)
+                tokenizer.src_lang = source_language
+                self._tokenizers[source_language] = tokenizer
+        return tokenizer
+
+    @abstractmethod
+    def load_model(self) -> None:
+        pass
+
+    @abstractmethod
+    def translate_batch(
+        self,
+        prompts: list[str],
+        source_language: str,
+        target_language: str,
+        settings: GenerationSettings | None = None,
+    ) -> list[str]:
+        """
+        Translates `prompts`, decoding with `settings` or, by default, the language
+        pair's profile.
+        """
+
+    def translate_multi(self, requests: list[tuple[str, str]], source_language: str) -> list[str]:
+        """
+        Translates `(prompt, target_language)` requests sharing one source language.
+        Runtimes that can share work across target languages override this; the
+        default runs one batch per target language.
+        """
+        by_target: dict[str, list[int]] = {}
+        for index, (_, target_language) in enumerate(requests):
+            by_target.setdefault(target_language, []).append(index)
+
+        translations = [""] * len(requests)
+        for target_language, indices in by_target.items():
+            results = self.translate_batch(
+                [requests[index][0] for index in indices], source_language, target_language
+            )
+            for index, translation in zip(indices, results):
+                translations[index] = translation
+        return translations
+
+    def stats(self) -> dict[str, float]:
+        return {}
+
+
+class TorchBackend(M2MBackend):
+    """
+    Plain `transformers` inference in full precision.
+
+    Requests sharing a source text share one encoder pass: encoder states are kept
+    in a bounded cache, and one batch can decode into several target languages by
+    starting each row with its own language token.
+
+    When `assistant_model` is set (e.g. `facebook/m2m100_418M`), a smaller draft
+    model proposes the next few tokens and the main model verifies them in one
+    forward pass. With greedy decoding the output is the same as without the
+    draft; only the decode time changes. `transformers` only supports assisted
+    generation for a single sequence without beam search, so batches are decoded
+    one prompt at a time in this mode.
+    """
+
+    name = "torch"
+    supports_assisted_decoding = True
+    supports_shared_encoder = True
+
+    def __init__(self, model_name: str, device: str, settings: GenerationSettings, config=None) -> None:
+        super().__init__(model_name, device, settings, config=config)
+        self.assistant_model = self.load_assistant_model()
+        self.encoder_cache = EncoderCache(int(self.get_option("encoder_cache_size", 64)))
+
+    def load_pretrained(self, model_name: str):
+        from transformers import M2M100ForConditionalGeneration
+
+        model = M2M100ForConditionalGeneration.from_pretrained(model_name)
+        if self.device != "cpu":
+            model.to(self.device)
+        return model.eval()
+
+    def load_model(self) -> None:
+        self.model = self.load_pretrained(self.model_name)
+
+    def load_assistant_model(self):
+        assistant_name = self.get_option("assistant_model")
+        if not assistant_name:
+            return None
+        if not self.supports_assisted_decoding:
+            logger.warning(f"The {self.name} backend does not support assisted decoding, ignoring assistant_model")
+            return None
+        if self.settings.num_beams > 1:
+            logger.warning("Assisted decoding requires num_beams = 1, ignoring assistant_model")
+            return None
+
+        logger.info(f"Loading draft model {assistant_name} for assisted decoding ...")
+        assistant_model = self.load_pretrained(assistant_name)
+        assistant_tokens = self.get_option("assistant_tokens")
+        if assistant_tokens:
+            assistant_model.generation_config.num_assistant_tokens = int(assistant_tokens)
+        return assistant_model
+
+    def generation_kwargs(self, tokenizer, target_language: str, settings: GenerationSettings, source_tokens: int) -> dict:
+        kwargs = {
+            "do_sample": settings.do_sample,
+            "forced_bos_token_id": tokenizer.get_lang_id(target_language),
+            "no_repeat_ngram_size": settings.no_repeat_ngram_size,
+            "num_beams": settings.num_beams,
+            "temperature": settings.temperature,
+            "top_k": settings.top_k,
+        }
+        bound = max_new_tokens(settings, source_tokens)
+        if bound is not None:
+            kwargs["max_new_tokens"] = bound
+        return kwargs
+
+    def translate_batch(
+        self,
+        prompts: list[str],
+        source_language: str,
+        target_language: str,
+        settings: GenerationSettings | None = None,
+    ) -> list[str]:
+        tokenizer = self.get_tokenizer(source_language)
+        settings = settings or self.settings_for(source_language, target_language)
+        if self.assistant_model is not None and settings.num_beams == 1:
+            translations = []
+            for prompt in prompts:
+                translations.extend(
+                    self.generate(
+                        tokenizer, [prompt], target_language, settings, assistant_model=self.assistant_model
+                    )
+                )
+            return translations
+        return self.generate(tokenizer, prompts, target_language, settings)
+
+    def encode(self, prompts: list[str], source_language: str, settings: GenerationSettings) -> list:
+        """Returns the unpadded encoder states of each prompt, from the cache when possible."""
+        import torch
+
+        states = [self.encoder_cache.get((prompt, source_language)) for prompt in prompts]
+        missing = [index for index, state in enumerate(states) if state is None]
+        if missing:
+            tokenizer = self.get_tokenizer(source_language)
+            inputs = tokenizer(
+                [prompts[index] for index in missing],
+                return_tensors="pt",
+                truncation=True,
+                padding=True,
+                max_length=settings.max_length,
+            ).to(self.model.device)
+            with torch.inference_mode():
+                hidden = self.model.get_encoder()(**inputs).last_hidden_state
+            lengths = inputs["attention_mask"].sum(dim=1).tolist()
+            for row, index in enumerate(missing):
+                # M2M100 pads on the right, so the first `length` states are the prompt's.
+                states[index] = hidden[row, :lengths[row]].clone()
+                self.encoder_cache.put((prompts[index], source_language), states[index])
+        return states
+
+    def translate_multi(self, requests: list[tuple[str, str]], source_language: str) -> list[str]:
+        if self.assistant_model is not None or not self.supports_shared_encoder:
+            return super().translate_multi(requests, source_language)
+
+        # Rows decoded together must share decode settings.
+        groups: list[tuple[GenerationSettings, list[int]]] = []
+        for index, (_, target_language) in enumerate(requests):
+            settings = self.settings_for(source_language, target_language)
+            for group_settings, indices in groups:
+                if group_settings == settings:
+                    indices.append(index)
+                    break
+            else:
+                groups.append((settings, [index]))
+
+        translations = [""] * len(requests)
+        for settings, indices in groups:
+            results = self.decode_shared(
+                [requests[index] for index in indices], source_language, settings
+            )
+            for index, translation in zip(indices, results):
+                translations[index] = translation
+        return translations
+
+    def decode_shared(
+        self, requests: list[tuple[str, str]], source_language: str, settings: GenerationSettings
+    ) -> list[str]:
+        """One decode over cached encoder states, each row forced into its own target language."""
+        import torch
+        from transformers.modeling_outputs import BaseModelOutput
+
+        unique_prompts = list(dict.fromkeys(prompt for prompt, _ in requests))
+        states = dict(zip(unique_prompts, self.encode(unique_prompts, source_language, settings)))
+        rows = [states[prompt] for prompt, _ in requests]
+        longest = max(state.shape[0] for state in rows)
+
+        hidden = rows[0].new_zeros((len(rows), longest, rows[0].shape[-1]))
+        attention_mask = torch.zeros((len(rows), longest), dtype=torch.long, device=hidden.device)
+        for row, state in enumerate(rows):
+            hidden[row, :state.shape[0]] = state
+            attention_mask[row, :state.shape[0]] = 1
+
+        tokenizer = self.get_tokenizer(source_language)
+        decoder_input_ids = torch.tensor(
+            [
+                [self.model.config.decoder_start_token_id, tokenizer.get_lang_id(target_language)]
+                for _, target_language in requests
+            ],
+            device=hidden.device,
+        )
+        kwargs = self.generation_kwargs(tokenizer, requests[0][1], settings, longest)
+        # The target language token is already in decoder_input_ids.
+        kwargs.pop("forced_bos_token_id")
+
+        start_time = time.perf_counter()
+        with torch.inference_mode():
+            generated_tokens = self.model.generate(
+                encoder_outputs=BaseModelOutput(last_hidden_state=hidden),
+                attention_mask=attention_mask,
+                decoder_input_ids=decoder_input_ids,
+                **kwargs,
+            )
+        telemetry.record_generation(
+            int((generated_tokens[:, 2:] != tokenizer.pad_token_id).sum()),
+            time.perf_counter() - start_time,
+        )
+
+        return tokenizer.batch_decode(generated_tokens, skip_special_tokens=True)
+
+    def stats(self) -> dict[str, float]:
+        return {f"encoder_cache_{key}": value for key, value in self.encoder_cache.stats().items()}
+
+    def generate(self, tokenizer, prompts: list[str], target_language: str, settings: GenerationSettings, **kwargs) -> list[str]:
+        import torch
+
+        source_tokenizer = tokenizer(
+            prompts,
+            return_tensors="pt",
+            truncation=True,
+            padding=True,
+            max_length=settings.max_length,
+        ).to(self.model.device)
+
+        start_time = time.perf_counter()
+        with torch.inference_mode():
+            generated_tokens = self.model.generate(
+                **source_tokenizer,
+                **self.generation_kwargs(
+                    tokenizer, target_language, settings, source_tokenizer["input_ids"].shape[1]
+                ),
+                **kwargs,
+            )
+        telemetry.record_generation(
+            int((generated_tokens != tokenizer.pad_token_id).sum()),
+            time.perf_counter() - start_time,
+        )
+
+        return tokenizer.batch_decode(generated_tokens, skip_special_tokens=True)
+
+
+class QuantizedTorchBackend(TorchBackend):
+    """
+    `transformers` inference with int8 dynamic quantization of every Linear layer.
+
+    Weights are quantized once and activations are quantized on the fly, which
+    roughly halves CPU latency and quarters the size of the Linear weights. The
+    quantized model is kept in the artifact cache, so later starts skip loading
+    the full precision weights. Dynamic quantization only runs on CPU.
+    """
+
+    name = "int8"
+
+    def load_model(self) -> None:
+        import torch
+
+        if self.device != "cpu":
+            logger.warning(f"int8 backend only runs on CPU, ignoring device {self.device}")
+            self.device = "cpu"
+
+        self.model = None
+
+        def build(directory):
+            self.model = self.quantize(self.load_pretrained(self.model_name))
+            torch.save(self.model, os.path.join(directory, "model.pt"))
+
+        artifacts, path = self.artifact_path("torch", "transformers")
+        path = artifacts.get_or_build(path, build)
+        if self.model is None:
+            self.model = torch.load(os.path.join(path, "model.pt"), weights_only=False)
+        self.model.eval()
+
+    def load_assistant_model(self):
+        assistant_model = super().load_assistant_model()
+        if assistant_model is None:
+            return None
+        return self.quantize(assistant_model).eval()
+
+    @staticmethod
+    def quantize(model):
+        import torch
+
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+class OnnxBackend(TorchBackend):
+    """
+    ONNX Runtime inference through `optimum`.
+
+    The model is exported to ONNX on first use and the export is kept under
+    `export_dir`, so later starts load it directly.
+    """
+
+    name = "onnx"
+    supports_assisted_decoding = False
+    supports_shared_encoder = False
+
+    def load_model(self) -> None:
+        try:
+            from optimum.onnxruntime import ORTModelForSeq2SeqLM
+        except ImportError as e:
+            raise ImportError(
+                "The onnx backend requires optimum: pip install optimum[onnxruntime]"
+            ) from e
+
+        def build(directory):
+            ORTModelForSeq2SeqLM.from_pretrained(self.model_name, export=True).save_pretrained(directory)
+
+        artifacts, path = self.artifact_path("optimum", "onnxruntime", "transformers")
+        self.model = ORTModelForSeq2SeqLM.from_pretrained(artifacts.get_or_build(path, build))
+
+
+class CTranslate2Backend(M2MBackend):
+    """
+    CTranslate2 encoder-decoder runtime.
+
+    The model is converted to CTranslate2 format on first use, quantized to
+    `compute_type` (int8 by default), and kept under `export_dir`.
+    """
+
+    name = "ctranslate2"
+
+    def load_model(self) -> None:
+        try:
+            import ctranslate2
+        except ImportError as e:
+            raise ImportError(
+                "The ctranslate2 backend requires ctranslate2: pip install ctranslate2"
+            ) from e
+
+        compute_type = self.get_option("compute_type", "int8")
+
+        def build(directory):
+            converter = ctranslate2.converters.TransformersConverter(self.model_name)
+            converter.convert(directory, quantization=compute_type, force=True)
+
+        artifacts, export_path = self.artifact_path(
+            "ctranslate2", "transformers", compute_type=compute_type
+        )
+        export_path = artifacts.get_or_build(export_path, build)
+
+        device = "cpu" if self.device == "cpu" else "cuda"
+        self.model = ctranslate2.Translator(
+            export_path,
+            device=device,
+            compute_type=compute_type,
+            inter_threads=int(self.get_option("inter_threads", 1)),
+            intra_threads=int(self.get_option("intra_threads", 0)),
+        )
+
+    def translate_batch(
+        self,
+        prompts: list[str],
+        source_language: str,
+        target_language: str,
+        settings: GenerationSettings | None = None,
+    ) -> list[str]:
+        tokenizer = self.get_tokenizer(source_language)
+        settings = settings or self.settings_for(source_language, target_language)
+        source_tokens = [
+            tokenizer.convert_ids_to_tokens(
+                tokenizer.encode(prompt, truncation=True, max_length=settings.max_length)
+            )
+            for prompt in prompts
+        ]
+        target_prefix = [[tokenizer.get_lang_token(target_language)]] * len(prompts)
+
+        # The bound counts the forced target language token.
+        bound = max_new_tokens(settings, max(len(tokens) for tokens in source_tokens))
+        max_decoding_length = settings.max_length if bound is None else bound + 1
+
+        sampling_topk = settings.top_k if settings.do_sample else 1
+        start_time = time.perf_counter()
+        results = self.model.translate_batch(
+            source_tokens,
+            target_prefix=target_prefix,
+            beam_size=settings.num_beams,
+            max_decoding_length=max_decoding_length,
+            no_repeat_ngram_size=settings.no_repeat_ngram_size,
+            sampling_topk=sampling_topk,
+            sampling_temperature=settings.temperature,
+        )
+        telemetry.record_generation(
+            sum(len(result.hypotheses[0]) for result in results),
+            time.perf_counter() - start_time,
+        )
+
+        translations = []
+        for result in results:
+            # Drop the forced target language token.
+            tokens = result.hypotheses[0][1:]
+            translations.append(
+                tokenizer.decode(tokenizer.convert_tokens_to_ids(tokens), skip_special_tokens=True)
+            )
+        return translations
+
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (TorchBackend, QuantizedTorchBackend, OnnxBackend, CTranslate2Backend)
+}
+
+
+def load_backend(config, backend_name: str | None = None, model_name: str | None = None) -> M2MBackend:
+    """
+    Builds the M2M100 backend selected by the `backend` option in `config.ini`.
+
+    Raises:
+        ValueError: If the backend name is unknown.
+    """
+    backend_name = backend_name or config.get_value("backend", "torch")
+    if backend_name not in BACKENDS:
+        raise ValueError(
+            f"Unknown M2M backend '{backend_name}', expected one of {sorted(BACKENDS)}"
+        )
+    model_name = model_name or config.get_value("model", DEFAULT_MODEL)
+    device = config.get_value("device", "cuda:0")
+    logger.info(f"Loading {model_name} with the {backend_name} backend on {device} ...")
+    return BACKENDS[backend_name](
+        model_name, device, GenerationSettings.from_config(config), config=config
+    )
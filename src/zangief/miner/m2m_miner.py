@@ -1,51 +1,36 @@
-from transformers import (
-    M2M100ForConditionalGeneration,
-    M2M100Tokenizer)
+import time
 from base_miner import BaseMiner
+from batcher import RequestBatcher
+from m2m_backends import load_backend
+import telemetry
 
 
 class M2MMiner(BaseMiner):
+    warmup_pairs = "en-es"
 
     def __init__(self, config):
         super().__init__()
         self.config = config
-        self.model_name = config.get_value("model", "facebook/m2m100_1.2B")
-        self.device = config.get_value("device", "cuda:0")
-        self.max_length = config.get_value("max_length", 1024)
-        self.do_sample = config.get_value("do_sample", "store_true")
-        self.temperature = config.get_value("temperature", 1.0)
-        self.top_k = config.get_value("top_k", 10)
-        self.no_repeat_ngram_size = config.get_value("no_repeat_ngram_size", 3)
-        self.num_beams = config.get_value("num_beams", 1)
-        self.model = M2M100ForConditionalGeneration.from_pretrained(
-            self.model_name
+        load_start = time.perf_counter()
+        self.backend = load_backend(config)
+        self.model_load_seconds = time.perf_counter() - load_start
+        self.batcher = RequestBatcher(
+            self._translate_batch,
+            max_batch_size=int(config.get_value("batch_size", 8)),
+            max_wait=float(config.get_value("batch_wait_ms", 10)) / 1000,
+            on_batch=lambda _, size, seconds: telemetry.record_batch(size, seconds),
         )
-        self.tokenizer = M2M100Tokenizer.from_pretrained(self.model_name)
-        if self.device != "cpu":
-            self.model.to(self.device)
 
     def generate_translation(self, prompt: str, source_language: str, target_language: str):
-        self.tokenizer.src_lang = source_language
-        source_tokenizer = self.tokenizer(
-            [prompt],
-            return_tensors="pt",
-            truncation=True,
-            padding=True,
-            max_length=self.max_length,
-        ).to(self.model.device)
+        # Batches are grouped by source language so one source paragraph requested in
+        # several target languages shares its encoder pass.
+        return self.batcher.run(source_language, (prompt, target_language))
 
-        generated_tokens = self.model.generate(
-            **source_tokenizer,
-            do_sample=self.do_sample,
-            forced_bos_token_id=self.tokenizer.get_lang_id(target_language),
-            no_repeat_ngram_size=self.no_repeat_ngram_size,
-            num_beams=self.num_beams,
-            temperature=self.temperature,
-            top_k=self.top_k,
-        )
+    def generate_translations(self, prompts: list[str], source_language: str, target_language: str):
+        return self.batcher.run_many(source_language, [(prompt, target_language) for prompt in prompts])
 
-        translation = self.tokenizer.batch_decode(
-            generated_tokens, skip_special_tokens=True
-        )[0]
+    def _translate_batch(self, source_language: str, requests: list[tuple[str, str]]) -> list[str]:
+        return self.backend.translate_multi(requests, source_language)
 
-        return translation
\ No newline at end of file
+    def stats(self) -> dict[str, float]:
+        return self.backend.stats()
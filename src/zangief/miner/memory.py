@@ -0,0 +1,236 @@
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from loguru import logger
+
+MERSENNE_PRIME = (1 << 61) - 1
+DIGITS = re.compile(r"\d+")
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_segment(text: str) -> str:
+    return WHITESPACE.sub(" ", text).strip()
+
+
+def shingles(text: str, size: int = 3) -> set[str]:
+    text = text.casefold()
+    if len(text) <= size:
+        return {text}
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def jaccard(a: set[str], b: set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class _Segment:
+    __slots__ = ("translation", "shingles", "digits", "buckets")
+
+    def __init__(self, translation: str, shingles: set[str], digits: list[str], buckets: list[tuple]) -> None:
+        self.translation = translation
+        self.shingles = shingles
+        self.digits = digits
+        self.buckets = buckets
+
+
+class TranslationMemory:
+    """
+    Index of previously translated sentences per language pair, for reusing
+    translations of repeated or near-identical segments.
+
+    Exact lookups match on whitespace-normalized text. Fuzzy lookups use MinHash
+    locality-sensitive hashing over character trigrams to find candidates, then
+    accept the most similar one whose Jaccard similarity reaches `threshold` and
+    whose numbers are identical, so a reused sentence never changes a figure.
+    Segments are kept in memory (oldest evicted beyond `max_segments`) and, when
+    `path` is set, in SQLite so the memory survives restarts.
+
+    Attributes:
+        threshold: Minimum trigram Jaccard similarity for a fuzzy hit; 1 disables fuzzy hits.
+        min_fuzzy_chars: Shorter segments only match exactly.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        threshold: float = 0.9,
+        max_segments: int = 100_000,
+        min_fuzzy_chars: int = 20,
+        bands: int = 8,
+        rows: int = 4,
+    ) -> None:
+        self.path = path
+        self.threshold = threshold
+        self.max_segments = max_segments
+        self.min_fuzzy_chars = min_fuzzy_chars
+        self.bands = bands
+        self.rows = rows
+        # Fixed seed so signatures of persisted segments stay valid across restarts.
+        rng = random.Random(0)
+        self._permutations = [
+            (rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+            for _ in range(bands * rows)
+        ]
+        self._segments: OrderedDict[tuple[str, str], _Segment] = OrderedDict()
+        self._buckets: dict[tuple, set[tuple[str, str]]] = {}
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+        self.seconds_saved = 0.0
+        self._segment_seconds = 0.0
+        self._segments_translated = 0
+        self._db = None
+        self._db_lock = threading.Lock()
+        if path:
+            self._open_db(path)
+
+    def _open_db(self, path: str) -> None:
+        path = os.path.expanduser(path)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db_lock, self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS segments (pair TEXT NOT NULL, source TEXT NOT NULL, "
+                "translation TEXT NOT NULL, created REAL NOT NULL, PRIMARY KEY (pair, source))"
+            )
+            rows = self._db.execute(
+                "SELECT pair, source, translation FROM segments ORDER BY created DESC LIMIT ?",
+                (self.max_segments,),
+            ).fetchall()
+        with self._lock:
+            for pair, source, translation in reversed(rows):
+                self._add(pair, source, translation)
+        logger.info(f"Loaded {len(rows)} translation memory segments from {path}")
+
+    def _signature(self, segment_shingles: set[str]) -> list[int]:
+        hashes = [zlib.crc32(shingle.encode("utf-8")) for shingle in segment_shingles]
+        return [min((a * h + b) % MERSENNE_PRIME for h in hashes) for a, b in self._permutations]
+
+    def _bucket_keys(self, pair: str, segment_shingles: set[str]) -> list[tuple]:
+        signature = self._signature(segment_shingles)
+        return [
+            (pair, band, tuple(signature[band * self.rows:(band + 1) * self.rows]))
+            for band in range(self.bands)
+        ]
+
+    def _add(self, pair: str, source: str, translation: str) -> None:
+        key = (pair, source)
+        if key in self._segments:
+            self._remove(key)
+        segment_shingles = shingles(source)
+        buckets = self._bucket_keys(pair, segment_shingles) if len(source) >= self.min_fuzzy_chars else []
+        self._segments[key] = _Segment(translation, segment_shingles, DIGITS.findall(source), buckets)
+        for bucket in buckets:
+            self._buckets.setdefault(bucket, set()).add(key)
+        while len(self._segments) > self.max_segments:
+            self._remove(next(iter(self._segments)))
+
+    def _remove(self, key: tuple[str, str]) -> None:
+        segment = self._segments.pop(key)
+        for bucket in segment.buckets:
+            members = self._buckets.get(bucket)
+            if members is not None:
+                members.discard(key)
+                if not members:
+                    del self._buckets[bucket]
+
+    def _fuzzy_match(self, pair: str, source: str) -> _Segment | None:
+        if self.threshold >= 1 or len(source) < self.min_fuzzy_chars:
+            return None
+        segment_shingles = shingles(source)
+        digits = DIGITS.findall(source)
+        candidates = set()
+        for bucket in self._bucket_keys(pair, segment_shingles):
+            candidates.update(self._buckets.get(bucket, ()))
+
+        best, best_similarity = None, self.threshold
+        for key in candidates:
+            segment = self._segments[key]
+            if segment.digits != digits:
+                continue
+            similarity = jaccard(segment_shingles, segment.shingles)
+            if similarity >= best_similarity:
+                best, best_similarity = segment, similarity
+        return best
+
+    def lookup(self, segment: str, source_language: str, target_language: str) -> str | None:
+        """Returns a stored translation of `segment` or of a near-identical segment."""
+        pair = f"{source_language}-{target_language}"
+        source = normalize_segment(segment)
+        with self._lock:
+            match = self._segments.get((pair, source))
+            if match is not None:
+                self._segments.move_to_end((pair, source))
+                self.exact_hits += 1
+            else:
+                match = self._fuzzy_match(pair, source)
+                if match is None:
+                    self.misses += 1
+                    return None
+                self.fuzzy_hits += 1
+            if self._segments_translated:
+                self.seconds_saved += self._segment_seconds / self._segments_translated
+            return match.translation
+
+    def add(self, segment: str, translation: str, source_language: str, target_language: str) -> None:
+        pair = f"{source_language}-{target_language}"
+        source = normalize_segment(segment)
+        if not source or not translation:
+            return
+        with self._lock:
+            self._add(pair, source, translation)
+        if self._db is None:
+            return
+        try:
+            with self._db_lock, self._db:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO segments (pair, source, translation, created) VALUES (?, ?, ?, ?)",
+                    (pair, source, translation, time.time()),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to persist translation memory segment: {e}")
+
+    def record_model_time(self, segments: int, seconds: float) -> None:
+        """Tracks the model's time per segment, used to estimate the time hits save."""
+        with self._lock:
+            self._segments_translated += segments
+            self._segment_seconds += seconds
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            lookups = self.exact_hits + self.fuzzy_hits + self.misses
+            return {
+                "segments": len(self._segments),
+                "exact_hits": self.exact_hits,
+                "fuzzy_hits": self.fuzzy_hits,
+                "misses": self.misses,
+                "hit_rate": (self.exact_hits + self.fuzzy_hits) / lookups if lookups else 0.0,
+                "seconds_saved": self.seconds_saved,
+            }
+
+
+def load_memory(config) -> TranslationMemory | None:
+    """
+    Builds the translation memory from the `memory*` options in `config.ini`.
+
+    Returns:
+        The memory, or None unless `memory = 1`.
+    """
+    if str(config.get_value("memory", "0")) != "1":
+        return None
+    return TranslationMemory(
+        path=config.get_value("memory_path", None),
+        threshold=float(config.get_value("memory_threshold", 0.9)),
+        max_segments=int(config.get_value("memory_size", 100_000)),
+    )
@@ -0,0 +1,132 @@
+from collections import deque
+from typing import Callable
+
+from loguru import logger
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, start_http_server
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+import telemetry
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 12, 16, 20, 30, 60)
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+
+
+class StatsCollector:
+    """
+    Exposes a component's `stats()` dictionary at scrape time.
+
+    `counters` lists the keys that only ever increase; every other key is a gauge.
+    """
+
+    def __init__(self, prefix: str, stats: Callable[[], dict[str, float]], counters=()) -> None:
+        self.prefix = prefix
+        self.stats = stats
+        self.counters = set(counters)
+
+    def collect(self):
+        for key, value in self.stats().items():
+            name = f"{self.prefix}_{key}"
+            if key in self.counters:
+                yield CounterMetricFamily(name, f"{self.prefix} {key}", value=value)
+            else:
+                yield GaugeMetricFamily(name, f"{self.prefix} {key}", value=value)
+
+
+class MinerMetrics:
+    """
+    Prometheus metrics for the miner server.
+
+    Request latency, validator scores and model load time are recorded directly.
+    Batch sizes and generated tokens arrive as telemetry events, including events
+    forwarded from model worker processes.
+    """
+
+    def __init__(self, score_window: int = 100) -> None:
+        self.registry = CollectorRegistry()
+        pair = ["source_language", "target_language"]
+        self.request_seconds = Histogram(
+            "zangief_miner_request_seconds", "Time to answer a generate request",
+            pair, buckets=LATENCY_BUCKETS, registry=self.registry,
+        )
+        self.requests = Counter(
+            "zangief_miner_requests", "Generate requests by outcome",
+            pair + ["status"], registry=self.registry,
+        )
+        self.batch_size = Histogram(
+            "zangief_miner_batch_size", "Requests per model batch",
+            buckets=BATCH_BUCKETS, registry=self.registry,
+        )
+        self.batch_seconds = Histogram(
+            "zangief_miner_batch_seconds", "Time to run one model batch",
+            buckets=LATENCY_BUCKETS, registry=self.registry,
+        )
+        self.generated_tokens = Counter(
+            "zangief_miner_generated_tokens", "Tokens produced by the model",
+            registry=self.registry,
+        )
+        self.generation_seconds = Counter(
+            "zangief_miner_generation_seconds", "Time spent producing tokens",
+            registry=self.registry,
+        )
+        self.tokens_per_second = Gauge(
+            "zangief_miner_tokens_per_second", "Token throughput of the latest batch",
+            registry=self.registry,
+        )
+        self.model_load_seconds = Gauge(
+            "zangief_miner_model_load_seconds", "Time taken to load the model",
+            registry=self.registry,
+        )
+        self.startup_seconds = Gauge(
+            "zangief_miner_startup_seconds", "Time taken by each startup phase",
+            ["phase"], registry=self.registry,
+        )
+        self.validator_scores = Histogram(
+            "zangief_miner_validator_score", "Scores received from validators",
+            ["metric"], buckets=[i / 10 for i in range(1, 11)], registry=self.registry,
+        )
+        self.rolling_scores = Gauge(
+            "zangief_miner_validator_score_rolling", "Mean of the most recent validator scores",
+            ["metric"], registry=self.registry,
+        )
+        self.score_window = score_window
+        self._scores: dict[str, deque] = {}
+
+    def handle_event(self, event: str, value: float, labels: dict[str, str]) -> None:
+        if event == "batch_size":
+            self.batch_size.observe(value)
+        elif event == "batch_seconds":
+            self.batch_seconds.observe(value)
+        elif event == "generated_tokens":
+            self.generated_tokens.inc(value)
+        elif event == "generation_seconds":
+            self.generation_seconds.inc(value)
+        elif event == "tokens_per_second":
+            self.tokens_per_second.set(value)
+
+    def observe_request(self, source_language: str, target_language: str, seconds: float, status: str) -> None:
+        self.request_seconds.labels(source_language, target_language).observe(seconds)
+        self.requests.labels(source_language, target_language, status).inc()
+
+    def observe_scores(self, **scores: float) -> None:
+        for metric, score in scores.items():
+            try:
+                score = float(score)
+            except (TypeError, ValueError):
+                continue
+            self.validator_scores.labels(metric).observe(score)
+            window = self._scores.setdefault(metric, deque(maxlen=self.score_window))
+            window.append(score)
+            self.rolling_scores.labels(metric).set(sum(window) / len(window))
+
+    def add_stats(self, prefix: str, stats: Callable[[], dict[str, float]], counters=()) -> None:
+        self.registry.register(StatsCollector(prefix, stats, counters))
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> None:
+        """
+        Serves the metrics on their own port, away from the module port validators
+        call, and starts recording telemetry events.
+        """
+        start_http_server(port, addr=host, registry=self.registry)
+        telemetry.add_sink(self.handle_event)
+        logger.info(f"Serving miner metrics on {host}:{port}")
+
@@ -1,5 +1,6 @@
 import argparse
 from config import Config
+from startup import StartupTimer
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="transaction validator")
@@ -8,14 +9,26 @@ if __name__ == "__main__":
     args = parser.parse_args()
 
     config = Config(config_file=args.config)
+    startup = StartupTimer()
 
+    # Only the selected backend's dependencies are imported.
     if args.miner == "m2m":
-        from m2m_miner import M2MMiner
-        miner = M2MMiner(config=config)
-        M2MMiner.start_miner_server(miner=miner)
+        with startup.phase("imports"):
+            from m2m_miner import M2MMiner
+        with startup.phase("model"):
+            miner = M2MMiner(config=config)
+        M2MMiner.start_miner_server(miner=miner, startup=startup)
     elif args.miner == "openai":
-        from openai_miner import OpenAIMiner
-        miner = OpenAIMiner(config=config)
-        OpenAIMiner.start_miner_server(miner=miner)
+        with startup.phase("imports"):
+            from openai_miner import OpenAIMiner
+        with startup.phase("model"):
+            miner = OpenAIMiner(config=config)
+        OpenAIMiner.start_miner_server(miner=miner, startup=startup)
+    elif args.miner == "router":
+        with startup.phase("imports"):
+            from router_miner import RouterMiner
+        with startup.phase("model"):
+            miner = RouterMiner(config=config)
+        RouterMiner.start_miner_server(miner=miner, startup=startup)
     else:
         print("Unsupported miner")
@@ -1,46 +1,193 @@
-from openai import OpenAI, APIError
+import asyncio
+import os
+import random
+import threading
+import time
+
+import httpx
+from openai import (
+    AsyncOpenAI,
+    APIError,
+    APIConnectionError,
+    APIStatusError,
+    APITimeoutError,
+)
 from loguru import logger
 from openai.types.chat.chat_completion import ChatCompletion
 from base_miner import BaseMiner
+import telemetry
+
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+
+
+class AsyncLoopThread:
+    """
+    Runs an asyncio event loop in a background thread so synchronous endpoints can
+    share async clients, connection pools and semaphores.
+
+    The loop is started lazily and restarted in a forked child process, where the
+    parent's thread no longer exists.
+    """
+
+    def __init__(self) -> None:
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._pid: int | None = None
+        self._lock = threading.Lock()
+
+    def get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid():
+                self._loop = asyncio.new_event_loop()
+                self._pid = os.getpid()
+                thread = threading.Thread(
+                    target=self._loop.run_forever, name="async-loop", daemon=True
+                )
+                thread.start()
+            return self._loop
+
+    def run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.get_loop()).result()
+
 
 class OpenAIMiner(BaseMiner):
 
     def __init__(self, config) -> None:
         super().__init__()
-        self.config = config 
+        self.config = config
         self.max_tokens = int(str(config.get_value(option="max_tokens", default=1000)))
-        self.temperature = config.get_value(option="temperature", default=0.1)
+        self.temperature = float(config.get_value(option="temperature", default=0.1))
         self.model = str(
             object=config.get_value(option="model", default="gpt-3.5-turbo")
         )
-        openai_key = config.get_value(option="openai_key", default=None)
-        if openai_key is None:
+        self.openai_key = config.get_value(option="openai_key", default=None)
+        if self.openai_key is None:
             raise ValueError(
                 "OpenAI key must be specified in the env/config.ini (openai_key = YOUR_KEY_HERE)"
             )
-        self.client = OpenAI(api_key=openai_key)
+        self.base_url = config.get_value(option="openai_base_url", default=None)
+        self.max_in_flight = int(config.get_value(option="max_in_flight", default=32))
+        self.max_connections = int(config.get_value(option="max_connections", default=64))
+        self.max_retries = int(config.get_value(option="max_retries", default=4))
+        self.request_deadline = float(config.get_value(option="request_deadline", default=15))
+        self.backoff_base = float(config.get_value(option="backoff_base", default=0.5))
+        self.backoff_max = float(config.get_value(option="backoff_max", default=8))
         self.system_prompt = "You are an expert translator who can translate text from a large number of languages. You pay attention to detail providing semantically and grammatically accurate translations quickly and effectively. You will be asked by users to translate text from one language to another. You will not provide any additional context or instructions. Simply return the translated response."
 
-    def generate_translation(
+        self._runner = AsyncLoopThread()
+        self._client: AsyncOpenAI | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._client_pid: int | None = None
+
+    def _get_client(self) -> tuple[AsyncOpenAI, asyncio.Semaphore]:
+        # Called on the event loop thread; rebuilt after a fork.
+        if self._client is None or self._client_pid != os.getpid():
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                timeout=httpx.Timeout(self.request_deadline),
+            )
+            self._client = AsyncOpenAI(
+                api_key=self.openai_key,
+                base_url=self.base_url,
+                http_client=http_client,
+                max_retries=0,
+            )
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+            self._client_pid = os.getpid()
+        return self._client, self._semaphore
+
+    def _is_retryable(self, error: Exception) -> bool:
+        if isinstance(error, (APIConnectionError, APITimeoutError)):
+            return True
+        if isinstance(error, APIStatusError):
+            return error.status_code in RETRYABLE_STATUS_CODES or error.status_code >= 500
+        return False
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        retry_after = None
+        if isinstance(error, APIStatusError):
+            retry_after = error.response.headers.get("retry-after")
+        if retry_after is not None:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        # Full jitter keeps retrying miners from synchronizing on the API.
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def _create_completion(self, user_prompt: str) -> ChatCompletion:
+        client, semaphore = self._get_client()
+        deadline = time.monotonic() + self.request_deadline
+        attempt = 0
+        while True:
+            try:
+                async with semaphore:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise APITimeoutError(request=httpx.Request("POST", str(client.base_url)))
+                    return await client.chat.completions.create(
+                        model=self.model,
+                        max_tokens=self.max_tokens,
+                        temperature=self.temperature,
+                        messages=[
+                            {"role": "system", "content": self.system_prompt},
+                            {"role": "user", "content": user_prompt},
+                        ],
+                        timeout=remaining,
+                    )
+            except APIError as e:
+                if attempt >= self.max_retries or not self._is_retryable(e):
+                    raise
+                delay = self._backoff(attempt, e)
+                if time.monotonic() + delay >= deadline:
+                    raise
+                logger.warning(f"OpenAI request failed ({e}), retrying in {delay:.2f} seconds")
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def agenerate_translation(
         self, prompt: str, source_language: str, target_language: str
     ) -> str | None:
         user_prompt: str = (
             f"Translate the following text from {source_language} to {target_language}: {prompt}"
         )
-        system_prompt: str = self.system_prompt
-        completion: ChatCompletion = self.client.chat.completions.create(
-            model=self.model,
-            max_tokens=self.max_tokens,
-            temperature=self.temperature,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-        )
+        start_time = time.perf_counter()
         try:
-            translation: str | None = completion.choices[0].message.content
+            completion = await self._create_completion(user_prompt)
         except APIError as e:
-            logger.error(f"Error parsing OpenAI response: {e}")
-            translation = None
+            logger.error(f"Error getting OpenAI response: {e}")
+            return None
+        if completion.usage is not None:
+            telemetry.record_generation(
+                completion.usage.completion_tokens, time.perf_counter() - start_time
+            )
+
+        if not completion.choices:
+            logger.error("OpenAI response contained no choices")
+            return None
+        translation: str | None = completion.choices[0].message.content
+        return translation
 
-        return translation
\ No newline at end of file
+    def generate_translation(
+        self, prompt: str, source_language: str, target_language: str
+    ) -> str | None:
+        return self._runner.run(
+            self.agenerate_translation(prompt, source_language, target_language)
+        )
+
+    async def agenerate_translations(
+        self, prompts: list[str], source_language: str, target_language: str
+    ) -> list[str | None]:
+        return list(await asyncio.gather(*(
+            self.agenerate_translation(prompt, source_language, target_language) for prompt in prompts
+        )))
+
+    def generate_translations(
+        self, prompts: list[str], source_language: str, target_language: str
+    ) -> list[str | None]:
+        # Requests run concurrently, bounded by max_in_flight.
+        return self._runner.run(
+            self.agenerate_translations(prompts, source_language, target_language)
+        )
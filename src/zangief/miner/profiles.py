@@ -0,0 +1,70 @@
+import dataclasses
+import json
+import math
+
+from loguru import logger
+
+TUNABLE_FIELDS = (
+    "do_sample",
+    "temperature",
+    "top_k",
+    "no_repeat_ngram_size",
+    "num_beams",
+    "max_new_tokens_ratio",
+    "max_new_tokens_min",
+)
+
+
+def max_new_tokens(settings, source_tokens: int) -> int | None:
+    """
+    Upper bound on generated tokens for a source of `source_tokens` tokens, or None
+    when the settings have no length ratio and only `max_length` applies.
+    """
+    if not settings.max_new_tokens_ratio:
+        return None
+    bound = max(settings.max_new_tokens_min, math.ceil(source_tokens * settings.max_new_tokens_ratio))
+    return min(bound, settings.max_length)
+
+
+class GenerationProfiles:
+    """
+    Per language pair decode settings produced by `autotune.py`.
+
+    The profile file maps `source-target` pairs to the settings that differ from
+    `config.ini`; pairs missing from the file use `default`, then `config.ini`.
+
+        {"default": {"max_new_tokens_ratio": 2.0},
+         "pairs": {"en-es": {"num_beams": 1, "max_new_tokens_ratio": 1.6}}}
+    """
+
+    def __init__(self, pairs: dict[str, dict] | None = None, default: dict | None = None) -> None:
+        self.pairs = pairs or {}
+        self.default = default or {}
+        self._cache: dict[tuple[str, str], object] = {}
+
+    @classmethod
+    def load(cls, path: str) -> "GenerationProfiles":
+        with open(path) as file:
+            data = json.load(file)
+        profiles = cls(pairs=data.get("pairs"), default=data.get("default"))
+        logger.info(f"Loaded generation profiles for {len(profiles.pairs)} language pairs from {path}")
+        return profiles
+
+    def settings_for(self, base, source_language: str, target_language: str):
+        """Returns `base` GenerationSettings with the pair's profile applied."""
+        key = (source_language, target_language)
+        settings = self._cache.get(key)
+        if settings is None:
+            overrides = {**self.default, **self.pairs.get(f"{source_language}-{target_language}", {})}
+            settings = dataclasses.replace(
+                base, **{field: value for field, value in overrides.items() if field in TUNABLE_FIELDS}
+            )
+            self._cache[key] = settings
+        return settings
+
+
+def load_profiles(config) -> GenerationProfiles | None:
+    path = config.get_value("generation_profile") if config is not None else None
+    if not path:
+        return None
+    return GenerationProfiles.load(path)
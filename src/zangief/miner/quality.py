@@ -0,0 +1,50 @@
+from collections import Counter
+
+
+def _char_ngrams(text: str, n: int) -> Counter:
+    text = "".join(text.split())
+    return Counter(text[i:i + n] for i in range(len(text) - n + 1))
+
+
+def chrf(hypothesis: str, reference: str, max_order: int = 6, beta: float = 2.0) -> float:
+    """
+    Computes a sentence-level chrF score between a hypothesis and a reference.
+
+    chrF is the F-score over character n-grams (whitespace removed) averaged over
+    orders 1..`max_order`. It is cheap, language agnostic and needs no model, so the
+    miner tools use it as a local quality proxy.
+
+    Returns:
+        float: The score in the range [0, 100].
+    """
+    if not hypothesis or not reference:
+        return 100.0 if hypothesis == reference else 0.0
+
+    precisions = []
+    recalls = []
+    for n in range(1, max_order + 1):
+        hyp_ngrams = _char_ngrams(hypothesis, n)
+        ref_ngrams = _char_ngrams(reference, n)
+        if not hyp_ngrams or not ref_ngrams:
+            continue
+        matches = sum((hyp_ngrams & ref_ngrams).values())
+        precisions.append(matches / sum(hyp_ngrams.values()))
+        recalls.append(matches / sum(ref_ngrams.values()))
+
+    if not precisions:
+        return 0.0
+
+    precision = sum(precisions) / len(precisions)
+    recall = sum(recalls) / len(recalls)
+    if precision == 0 and recall == 0:
+        return 0.0
+
+    beta_sq = beta ** 2
+    return 100 * (1 + beta_sq) * precision * recall / (beta_sq * precision + recall)
+
+
+def corpus_chrf(hypotheses: list[str], references: list[str]) -> float:
+    if not hypotheses:
+        return 0.0
+    scores = [chrf(h, r) for h, r in zip(hypotheses, references)]
+    return sum(scores) / len(scores)
@@ -0,0 +1,235 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from loguru import logger
+
+from admission import current_caller
+from base_miner import BaseMiner
+from config import BackendConfig
+from startup import parse_language_pairs
+
+
+class RouteStats:
+    """Rolling latency, validator score and failure history of one backend for one language pair."""
+
+    def __init__(self, window: int) -> None:
+        self.latencies: deque[float] = deque(maxlen=window)
+        self.scores: deque[float] = deque(maxlen=window)
+        self.failures: deque[bool] = deque(maxlen=window)
+
+    @property
+    def latency(self) -> float | None:
+        return sum(self.latencies) / len(self.latencies) if self.latencies else None
+
+    @property
+    def score(self) -> float | None:
+        return sum(self.scores) / len(self.scores) if self.scores else None
+
+    @property
+    def failure_rate(self) -> float:
+        return sum(self.failures) / len(self.failures) if self.failures else 0.0
+
+    def summary(self) -> dict:
+        return {
+            "latency": self.latency,
+            "score": self.score,
+            "scored": len(self.scores),
+            "failure_rate": self.failure_rate,
+        }
+
+
+class RouterMiner(BaseMiner):
+    """
+    Serves each language pair from whichever of several miners does it best.
+
+    Every backend keeps rolling latency, failure and validator score statistics per
+    language pair. A request goes to the backend with the best mean composite score
+    among those whose mean latency fits `router_latency_budget`; backends with
+    fewer than `router_min_scores` scores for the pair are tried first so every
+    backend gets graded, and backends that keep failing are tried last. If the
+    chosen backend fails, times out after `router_timeout` seconds or returns
+    nothing, the next one is tried. A timed-out call cannot be interrupted and keeps
+    its thread until it returns, so a backend with `router_max_pending` calls still
+    running is skipped instead of taking more threads.
+
+    Validators send the score of a translation to the `score` endpoint right after
+    receiving it, so a score is credited to the backend that last answered the same
+    caller.
+
+    Attributes:
+        backends: Miners by name, in the order of the `router_backends` option.
+    """
+
+    supports_worker_pool = False
+
+    def __init__(self, config, backends: dict[str, BaseMiner] | None = None) -> None:
+        super().__init__()
+        self.config = config
+        self.latency_budget = float(config.get_value("router_latency_budget", 8))
+        self.timeout = float(config.get_value("router_timeout", 15))
+        self.window = int(config.get_value("router_window", 50))
+        self.min_scores = int(config.get_value("router_min_scores", 5))
+        self.max_failure_rate = float(config.get_value("router_max_failure_rate", 0.5))
+        self.backends = backends if backends is not None else load_backends(config)
+        if not self.backends:
+            raise ValueError("router_backends must name at least one miner")
+        self.warmup_pairs = ",".join(
+            pair for miner in self.backends.values() for pair in [miner.warmup_pairs] if pair
+        )
+
+        self._stats: dict[tuple[str, str, str], RouteStats] = {}
+        self._served: dict[str | None, tuple[str, str, str]] = {}
+        self._lock = threading.Lock()
+        threads = int(config.get_value("router_threads", 32))
+        self._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="router")
+        self.max_pending = int(config.get_value("router_max_pending", max(1, threads // len(self.backends))))
+        self._pending = {name: 0 for name in self.backends}
+        self.routed = 0
+        self.fallbacks = 0
+
+    def get_stats(self, backend: str, source_language: str, target_language: str) -> RouteStats:
+        key = (backend, source_language, target_language)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = RouteStats(self.window)
+        return stats
+
+    def rank(self, source_language: str, target_language: str) -> list[str]:
+        """Orders the backends from most to least preferred for this language pair."""
+
+        def preference(item):
+            position, name = item
+            stats = self.get_stats(name, source_language, target_language)
+            latency, score = stats.latency, stats.score
+            return (
+                stats.failure_rate > self.max_failure_rate,
+                latency is not None and latency > self.latency_budget,
+                len(stats.scores) >= self.min_scores,
+                -(score or 0.0),
+                latency or 0.0,
+                position,
+            )
+
+        return [name for _, name in sorted(enumerate(self.backends), key=preference)]
+
+    def warm_up(self, pairs: list[tuple[str, str]]) -> None:
+        # Warm the backends up directly, on their own pairs, so warm-up translations
+        # do not count in the route statistics.
+        for name, backend in self.backends.items():
+            backend_pairs = parse_language_pairs(backend.config.get_value("warmup_pairs", backend.warmup_pairs))
+            if backend_pairs:
+                logger.info(f"Warming up {name}")
+                backend.warm_up(backend_pairs)
+
+    def submit(self, name: str, prompt: str, source_language: str, target_language: str):
+        """Runs the backend call on the router's threads, or returns None when the backend has too many running."""
+        with self._lock:
+            if self._pending[name] >= self.max_pending:
+                return None
+            self._pending[name] += 1
+        future = self._executor.submit(
+            self.backends[name].generate_translation, prompt, source_language, target_language
+        )
+        future.add_done_callback(lambda _: self._finish(name))
+        return future
+
+    def _finish(self, name: str) -> None:
+        with self._lock:
+            self._pending[name] -= 1
+
+    def translate(self, prompt: str, source_language: str, target_language: str):
+        # A cached answer was not produced for this request, so it must not be credited.
+        with self._lock:
+            self._served.pop(current_caller.get(), None)
+        return super().translate(prompt, source_language, target_language)
+
+    def dispatch_translation(self, prompt: str, source_language: str, target_language: str):
+        return self.generate_translation(prompt, source_language, target_language)
+
+    def generate_translation(self, prompt: str, source_language: str, target_language: str):
+        caller = current_caller.get()
+        ranked = self.rank(source_language, target_language)
+        self.routed += 1
+        for attempt, name in enumerate(ranked):
+            if attempt:
+                self.fallbacks += 1
+                logger.warning(f"Falling back to {name} for {source_language}-{target_language}")
+            stats = self.get_stats(name, source_language, target_language)
+            start_time = time.perf_counter()
+            future = self.submit(name, prompt, source_language, target_language)
+            if future is None:
+                logger.warning(f"{name} still runs {self.max_pending} calls, skipping it")
+                stats.failures.append(True)
+                continue
+            try:
+                translation = future.result(timeout=self.timeout)
+            except FutureTimeoutError:
+                # Frees the thread if the call has not started yet; a running call is left to finish.
+                future.cancel()
+                logger.warning(f"{name} timed out after {self.timeout} seconds")
+                translation = None
+            except Exception as e:
+                logger.warning(f"{name} failed: {e}")
+                translation = None
+
+            stats.latencies.append(time.perf_counter() - start_time)
+            stats.failures.append(not translation)
+            if translation:
+                with self._lock:
+                    self._served[caller] = (name, source_language, target_language)
+                return translation
+        return ""
+
+    def on_score(self, bert: float, comet: float, composite: float) -> None:
+        with self._lock:
+            served = self._served.pop(current_caller.get(), None)
+        if served is None:
+            return
+        try:
+            score = float(composite)
+        except (TypeError, ValueError):
+            return
+        stats = self.get_stats(*served)
+        stats.scores.append(score)
+        name, source_language, target_language = served
+        logger.info(
+            f"Route {source_language}-{target_language} via {name}: "
+            f"mean score {stats.score:.3f} over {len(stats.scores)} scores"
+        )
+
+    def route_table(self) -> dict[str, dict[str, dict]]:
+        """Per language pair, the statistics of every backend that has served it."""
+        with self._lock:
+            items = list(self._stats.items())
+        table: dict[str, dict[str, dict]] = {}
+        for (name, source_language, target_language), stats in items:
+            table.setdefault(f"{source_language}-{target_language}", {})[name] = stats.summary()
+        return table
+
+    def stats(self) -> dict[str, float]:
+        return {"routed": self.routed, "fallbacks": self.fallbacks}
+
+
+def load_backends(config) -> dict[str, BaseMiner]:
+    """
+    Builds the miners named in the `router_backends` option (e.g. `m2m,openai`).
+    Each one reads its options from `[miner.<name>]`, falling back to `[miner]`.
+    """
+    backends = {}
+    for name in str(config.get_value("router_backends", "m2m,openai")).split(","):
+        name = name.strip()
+        if not name:
+            continue
+        backend_config = BackendConfig(config, name)
+        if name == "m2m":
+            from m2m_miner import M2MMiner
+            backends[name] = M2MMiner(config=backend_config)
+        elif name == "openai":
+            from openai_miner import OpenAIMiner
+            backends[name] = OpenAIMiner(config=backend_config)
+        else:
+            raise ValueError(f"Unknown router backend '{name}', expected m2m or openai")
+    return backends
@@ -0,0 +1,69 @@
+import json
+import re
+from pathlib import Path
+
+URL_PATTERN = re.compile(r'https?://\S+|www\.\S+')
+DATASET_ALIASES = {"zh": "zh-Hans", "zht": "zh-Hant"}
+
+
+def is_usable_text(text: str) -> bool:
+    """Mirrors the validator's CC-100 filter: long enough and free of URLs."""
+    text = text.strip()
+    return len(text) > 50 and not URL_PATTERN.search(text)
+
+
+def load_samples(path: str, source_language: str | None = None) -> list[dict[str, str]]:
+    """
+    Loads sample prompts from a file.
+
+    `.jsonl` files hold one object per line with a `prompt` (or `text`) field and
+    optional `source_language` / `target_language` fields. Any other file is read
+    as plain text, one prompt per line, in `source_language`.
+
+    Returns:
+        A list of dictionaries with `prompt`, `source_language` and, when known,
+        `target_language`.
+    """
+    samples = []
+    with open(Path(path), encoding="utf-8") as file:
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            if path.endswith(".jsonl"):
+                record = json.loads(line)
+                sample = {
+                    "prompt": record.get("prompt", record.get("text")),
+                    "source_language": record.get("source_language", source_language),
+                }
+                if record.get("target_language"):
+                    sample["target_language"] = record["target_language"]
+            else:
+                sample = {"prompt": line, "source_language": source_language}
+            if sample["prompt"] and sample["source_language"]:
+                samples.append(sample)
+    return samples
+
+
+def stream_cc100_samples(language: str, count: int, skip: int = 0) -> list[dict[str, str]]:
+    """
+    Streams the first `count` usable CC-100 paragraphs for `language`.
+    """
+    from datasets import load_dataset
+
+    dataset = load_dataset(
+        "cc100", DATASET_ALIASES.get(language, language), split="train", streaming=True
+    )
+    samples = []
+    seen = 0
+    for record in dataset:
+        text = record["text"].strip()
+        if not is_usable_text(text):
+            continue
+        seen += 1
+        if seen <= skip:
+            continue
+        samples.append({"prompt": text, "source_language": language})
+        if len(samples) >= count:
+            break
+    return samples
@@ -0,0 +1,134 @@
+import re
+from typing import NamedTuple
+
+# Sentence-final punctuation per script. Latin-script languages share the default.
+TERMINATORS = {
+    "ar": ".!?؟",
+    "ur": ".!?؟۔",
+    "hi": ".!?।",
+    "zh": "。！？!?",
+    "ja": "。！？!?",
+}
+DEFAULT_TERMINATORS = ".!?"
+
+# Languages written without spaces between sentences.
+UNSPACED_LANGUAGES = {"zh", "ja"}
+
+# Closing quotes and brackets that belong to the sentence they end.
+CLOSERS = "\"'”’»)]」』"
+
+# Clause punctuation used to break sentences that are too long to translate in one piece.
+CLAUSE_BREAK = re.compile(r"(?<=[,;:،؛，；：、])\s*")
+
+_patterns: dict[str, re.Pattern] = {}
+
+
+class Segment(NamedTuple):
+    """
+    A piece of source text, with its trailing whitespace, and how its translation
+    is joined to the next one: `separator` is the exact text to put in between (a
+    line break, or nothing after a cut inside a word), or None for the target
+    language's sentence spacing.
+    """
+
+    text: str
+    separator: str | None = None
+
+
+def _pattern(language: str) -> re.Pattern:
+    pattern = _patterns.get(language)
+    if pattern is None:
+        terminators = re.escape(TERMINATORS.get(language, DEFAULT_TERMINATORS))
+        closers = re.escape(CLOSERS)
+        if language in UNSPACED_LANGUAGES:
+            # Full-width punctuation ends a sentence even without a following space.
+            pattern = re.compile(rf"[^{terminators}]*(?:[{terminators}]+[{closers}]*\s*|$)")
+        else:
+            # Require whitespace after the terminator so "3.5" and "e.g." mid-word do not split.
+            pattern = re.compile(rf".*?(?:[{terminators}]+[{closers}]*(?:\s+|$)|$)", re.S)
+        _patterns[language] = pattern
+    return pattern
+
+
+def split_sentences(text: str, language: str) -> list[str]:
+    """
+    Splits `text` into sentences using `language`'s sentence punctuation.
+
+    Every sentence keeps its trailing whitespace, so `"".join(sentences) == text`.
+    """
+    sentences = [match.group(0) for match in _pattern(language).finditer(text) if match.group(0)]
+    # Merge fragments that are only punctuation or whitespace into the previous sentence.
+    merged: list[str] = []
+    for sentence in sentences:
+        if merged and not any(character.isalnum() for character in sentence):
+            merged[-1] += sentence
+        else:
+            merged.append(sentence)
+    return merged
+
+
+def split_long_sentence(sentence: str, max_chars: int) -> list[str]:
+    """
+    Breaks a sentence longer than `max_chars` at clause punctuation, then at spaces,
+    keeping every piece's trailing whitespace.
+    """
+    if len(sentence) <= max_chars:
+        return [sentence]
+
+    pieces = []
+    start = 0
+    for match in CLAUSE_BREAK.finditer(sentence):
+        if match.end() > start:
+            pieces.append(sentence[start:match.end()])
+            start = match.end()
+    pieces.append(sentence[start:])
+
+    chunks: list[str] = []
+    for piece in pieces:
+        if chunks and len(chunks[-1]) + len(piece) <= max_chars:
+            chunks[-1] += piece
+            continue
+        while len(piece) > max_chars:
+            cut = piece.rfind(" ", 0, max_chars)
+            cut = max_chars if cut <= 0 else cut + 1
+            chunks.append(piece[:cut])
+            piece = piece[cut:]
+        if piece:
+            chunks.append(piece)
+    return chunks
+
+
+def split_segments(text: str, language: str, max_chars: int | None = None) -> list[Segment]:
+    """
+    Splits `text` into sentences, breaking sentences longer than `max_chars` into
+    clauses, and records the separator each segment was split on.
+    """
+    segments = []
+    for sentence in split_sentences(text, language):
+        chunks = split_long_sentence(sentence, max_chars) if max_chars else [sentence]
+        for index, chunk in enumerate(chunks):
+            trailing = chunk[len(chunk.rstrip()):]
+            if "\n" in trailing:
+                separator = trailing
+            elif not trailing and index < len(chunks) - 1 and language not in UNSPACED_LANGUAGES:
+                # Cut where the source has no space, e.g. inside a long word or URL.
+                separator = ""
+            else:
+                separator = None
+            segments.append(Segment(chunk, separator))
+    return segments
+
+
+def join_sentences(translations: list[str], segments: list[Segment], target_language: str) -> str:
+    """
+    Joins translated segments with the separator each source segment was split on,
+    using the target language's sentence spacing at sentence and clause breaks.
+    """
+    spacing = "" if target_language in UNSPACED_LANGUAGES else " "
+    parts = []
+    for index, (translation, segment) in enumerate(zip(translations, segments)):
+        parts.append(translation.strip())
+        if index == len(segments) - 1:
+            continue
+        parts.append(spacing if segment.separator is None else segment.separator)
+    return "".join(parts)
@@ -0,0 +1,82 @@
+import time
+from contextlib import contextmanager
+
+from loguru import logger
+
+WARMUP_TEXT = {
+    "ar": "هذه جملة قصيرة لتسخين النموذج قبل بدء الخادم.",
+    "de": "Dies ist ein kurzer Satz, um das Modell vor dem Start aufzuwärmen.",
+    "en": "This is a short sentence to warm up the model before the server starts.",
+    "es": "Esta es una frase corta para calentar el modelo antes de iniciar el servidor.",
+    "fr": "Ceci est une courte phrase pour préchauffer le modèle avant le démarrage.",
+    "he": "זהו משפט קצר לחימום המודל לפני הפעלת השרת.",
+    "hi": "यह सर्वर शुरू होने से पहले मॉडल को तैयार करने के लिए एक छोटा वाक्य है।",
+    "pt": "Esta é uma frase curta para aquecer o modelo antes de iniciar o servidor.",
+    "ru": "Это короткое предложение для разогрева модели перед запуском сервера.",
+    "ur": "یہ سرور شروع ہونے سے پہلے ماڈل کو تیار کرنے کے لیے ایک مختصر جملہ ہے۔",
+    "vi": "Đây là một câu ngắn để khởi động mô hình trước khi máy chủ bắt đầu.",
+    "zh": "这是一个在服务器启动前预热模型的短句。",
+}
+
+
+class StartupTimer:
+    """
+    Records how long each phase of miner startup takes.
+
+    Usage:
+        startup = StartupTimer()
+        with startup.phase("model"):
+            ...
+        startup.report()
+    """
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.phases: dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        start_time = time.perf_counter()
+        logger.info(f"Startup: {name} ...")
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - start_time
+            logger.info(f"Startup: {name} took {self.phases[name]:.2f} seconds")
+
+    def total(self) -> float:
+        return time.perf_counter() - self.started
+
+    def report(self) -> None:
+        summary = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in self.phases.items())
+        logger.info(f"Miner ready in {self.total():.2f} seconds ({summary})")
+
+
+def parse_language_pairs(value: str | None) -> list[tuple[str, str]]:
+    """Parses `en-es,es-en` into [("en", "es"), ("es", "en")]."""
+    pairs = []
+    for item in (value or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        source_language, target_language = item.split("-", 1)
+        pairs.append((source_language.strip(), target_language.strip()))
+    return pairs
+
+
+def warm_up(miner, pairs: list[tuple[str, str]]) -> None:
+    """
+    Runs one synthetic translation per language pair so tokenizers, kernels and
+    lazily initialized runtime state are ready before the first real request.
+    """
+    for source_language, target_language in pairs:
+        text = WARMUP_TEXT.get(source_language, WARMUP_TEXT["en"])
+        start_time = time.perf_counter()
+        try:
+            miner.generate_translation(text, source_language, target_language)
+        except Exception as e:
+            logger.warning(f"Warm-up {source_language}-{target_language} failed: {e}")
+            continue
+        logger.info(
+            f"Warm-up {source_language}-{target_language} took {time.perf_counter() - start_time:.2f} seconds"
+        )
@@ -0,0 +1,42 @@
+from typing import Callable
+
+from loguru import logger
+
+Sink = Callable[[str, float, dict[str, str]], None]
+
+_sinks: list[Sink] = []
+
+
+def add_sink(sink: Sink) -> None:
+    _sinks.append(sink)
+
+
+def replace_sinks(sinks: list[Sink]) -> None:
+    """Used by forked workers to forward events to the parent instead of their copy of its sinks."""
+    _sinks[:] = sinks
+
+
+def record(event: str, value: float, **labels: str) -> None:
+    """
+    Reports a performance event (batch size, generated tokens, ...) to every sink.
+
+    Components call this without knowing whether metrics are enabled or whether they
+    run in the server process or in a model worker.
+    """
+    for sink in _sinks:
+        try:
+            sink(event, value, labels)
+        except Exception as e:
+            logger.warning(f"Failed to record {event}: {e}")
+
+
+def record_batch(size: int, seconds: float) -> None:
+    record("batch_size", size)
+    record("batch_seconds", seconds)
+
+
+def record_generation(tokens: int, seconds: float) -> None:
+    record("generated_tokens", tokens)
+    record("generation_seconds", seconds)
+    if seconds > 0:
+        record("tokens_per_second", tokens / seconds)
@@ -1,12 +1,12 @@
-import torchaudio
-import torch
-
 from pathlib import Path
 
 from loguru import logger
-from typing import Union, Tuple, List, Dict
+from typing import TYPE_CHECKING, Union, Tuple, List, Dict
 
-from seamless_communication.inference.translator import Translator
+# torch, torchaudio and seamless_communication are heavy; import them only when a
+# translator is actually built or audio is written.
+if TYPE_CHECKING:
+    from seamless_communication.inference.translator import Translator
 
 
 class SeamlessTranslator:
@@ -30,7 +30,7 @@ class SeamlessTranslator:
 
     model_name: str
     vocoder_name: str
-    translator: Translator
+    translator: "Translator"
     target_languages: Dict[str, str]
     task_strings: Dict[str, str]
 
@@ -49,6 +49,9 @@ class SeamlessTranslator:
             else "vocoder_36langs"
         )
 
+        import torch
+        from seamless_communication.inference.translator import Translator
+
         self.translator = Translator(
             model_name_or_card=self.model_name,
             vocoder_name_or_card=self.vocoder_name,
@@ -216,6 +219,9 @@ class SeamlessTranslator:
             logger.info(f"Translated text in {tgt_lang}: {text_output[0]}")
 
             if speech_output:
+                import torch
+                import torchaudio
+
                 torchaudio.save(
                     uri=output_audio,
                     src=speech_output.audio_wavs[0][0].to(torch.float32).cpu(),
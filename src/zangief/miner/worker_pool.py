@@ -0,0 +1,387 @@
+import gc
+import itertools
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import FIRST_EXCEPTION, Future, ThreadPoolExecutor, TimeoutError, wait
+from multiprocessing import reduction
+from multiprocessing.connection import Connection
+
+from loguru import logger
+
+import telemetry
+from startup import warm_up
+
+
+class WorkerCrashedError(RuntimeError):
+    pass
+
+
+def _run_worker(miner, connection, threads: int, torch_threads: int, warmup_pairs) -> None:
+    """
+    Entry point of a forked model worker. The worker warms up its copy of the model
+    and reports ready; jobs are then run concurrently on `threads` threads so the
+    miner's own request batching still applies inside the worker.
+    """
+    if "torch" in sys.modules:
+        sys.modules["torch"].set_num_threads(torch_threads)
+
+    send_lock = threading.Lock()
+
+    def send(message):
+        with send_lock:
+            connection.send(message)
+
+    # Performance events are recorded by the parent, which serves the metrics.
+    telemetry.replace_sinks([lambda event, value, labels: send(("event", event, value, labels))])
+    warm_up(miner, warmup_pairs)
+    send(("ready",))
+
+    def run_job(job_id, prompt, source_language, target_language):
+        try:
+            result = miner.generate_translation(prompt, source_language, target_language)
+            send((job_id, True, result))
+        except Exception as e:
+            send((job_id, False, f"{type(e).__name__}: {e}"))
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        while True:
+            try:
+                job = connection.recv()
+            except (EOFError, OSError):
+                break
+            if job is None:
+                break
+            executor.submit(run_job, *job)
+
+
+def _run_forker(control, miner, threads: int, torch_threads: int, warmup_pairs) -> None:
+    """
+    Entry point of the helper process that forks every model worker, restarted
+    ones included. The helper is forked before the pool starts any thread and runs
+    none itself, so a worker never inherits a lock that another thread held at the
+    time of the fork. Each `("spawn", index)` request carries the worker's end of
+    its pipe and is answered with the worker's pid; `("wait", pid)` reaps a worker
+    that exited and answers with its exit code.
+    """
+    children = set()
+    while True:
+        try:
+            request = control.recv()
+        except (EOFError, OSError):
+            break
+        if request is None:
+            break
+        command, argument = request
+        if command == "spawn":
+            fd = reduction.recv_handle(control)
+            pid = os.fork()
+            if pid == 0:
+                control.close()
+                code = 1
+                try:
+                    _run_worker(miner, Connection(fd), threads, torch_threads, warmup_pairs)
+                    code = 0
+                except BaseException:
+                    traceback.print_exc()
+                finally:
+                    sys.stdout.flush()
+                    sys.stderr.flush()
+                    os._exit(code)
+            os.close(fd)
+            children.add(pid)
+            control.send(pid)
+        elif command == "wait":
+            _, status = os.waitpid(argument, 0)
+            children.discard(argument)
+            control.send(os.waitstatus_to_exitcode(status))
+
+    # Workers were asked to stop by the pool; terminate those that do not.
+    deadline = time.monotonic() + 5
+    for pid in children:
+        while os.waitpid(pid, os.WNOHANG)[0] == 0:
+            if time.monotonic() > deadline:
+                os.kill(pid, signal.SIGTERM)
+                os.waitpid(pid, 0)
+                break
+            time.sleep(0.05)
+
+
+class _Worker:
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.pid = None
+        self.connection = None
+        self.send_lock = threading.Lock()
+        self.pending: dict[int, Future] = {}
+        self.restarts = 0
+        self.started_at = 0.0
+        self.ready = threading.Event()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self.pending)
+
+
+class WorkerPool:
+    """
+    Runs translation jobs on N model worker processes forked from the loaded miner.
+
+    The miner loads its weights once in the parent; workers are forked afterwards so
+    the weights are shared copy-on-write. Workers are forked by a helper process
+    that is itself forked before the pool starts any thread, so restarting a worker
+    never forks the multi-threaded parent. Each job goes to the worker with the fewest
+    jobs in flight. A worker that dies fails its pending jobs and is forked again,
+    up to `max_restarts` times in a row; a worker that stayed up for
+    `stable_seconds` starts counting its restarts again. Every worker, including a
+    restarted one, warms up on `warmup_pairs` before it takes jobs.
+
+    Attributes:
+        miner: The loaded miner whose `generate_translation` runs in the workers.
+        workers: Number of worker processes.
+        threads: Number of jobs each worker runs concurrently.
+        torch_threads: Torch intra-op threads per worker.
+        timeout: Seconds to wait for a job before giving up on it.
+        stable_seconds: Uptime after which a worker's restart count is reset.
+        warmup_pairs: Language pairs each worker translates once before taking jobs.
+    """
+
+    def __init__(
+        self,
+        miner,
+        workers: int,
+        threads: int = 8,
+        torch_threads: int | None = None,
+        timeout: float = 60,
+        max_restarts: int = 10,
+        stable_seconds: float = 300,
+        warmup_pairs: list[tuple[str, str]] = (),
+    ) -> None:
+        self.miner = miner
+        self.workers = [_Worker(index) for index in range(workers)]
+        self.threads = threads
+        self.torch_threads = torch_threads or max(1, (os.cpu_count() or 1) // workers)
+        self.timeout = timeout
+        self.max_restarts = max_restarts
+        self.stable_seconds = stable_seconds
+        self.warmup_pairs = list(warmup_pairs)
+        self._context = multiprocessing.get_context("fork")
+        self._forker = None
+        self._forker_connection = None
+        self._forker_lock = threading.Lock()
+        self._job_ids = itertools.count()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def start(self) -> None:
+        if "torch" in sys.modules and sys.modules["torch"].cuda.is_initialized():
+            raise RuntimeError("Worker processes cannot share an initialized CUDA context, use device = cpu")
+        # Keep the garbage collector from touching (and copying) the parent's objects.
+        gc.collect()
+        gc.freeze()
+        self._forker_connection, child_connection = self._context.Pipe()
+        self._forker = self._context.Process(
+            target=_run_forker,
+            args=(child_connection, self.miner, self.threads, self.torch_threads, self.warmup_pairs),
+            name="miner-worker-forker",
+            daemon=True,
+        )
+        self._forker.start()
+        child_connection.close()
+        for worker in self.workers:
+            self._spawn(worker)
+        for worker in self.workers:
+            if not worker.ready.wait(self.timeout * max(1, len(self.warmup_pairs))):
+                logger.warning(f"Model worker {worker.index} is not ready yet")
+        logger.info(
+            f"Started {len(self.workers)} model workers "
+            f"({self.threads} jobs, {self.torch_threads} torch threads each)"
+        )
+
+    def _spawn(self, worker: _Worker) -> None:
+        parent_connection, child_connection = self._context.Pipe()
+        worker.ready.clear()
+        with self._forker_lock:
+            self._forker_connection.send(("spawn", worker.index))
+            reduction.send_handle(self._forker_connection, child_connection.fileno(), self._forker.pid)
+            pid = self._forker_connection.recv()
+        child_connection.close()
+        worker.pid = pid
+        worker.connection = parent_connection
+        worker.started_at = time.monotonic()
+        threading.Thread(
+            target=self._receive, args=(worker, parent_connection),
+            name=f"miner-worker-{worker.index}-receiver", daemon=True,
+        ).start()
+
+    def _receive(self, worker: _Worker, connection) -> None:
+        while True:
+            try:
+                message = connection.recv()
+            except (EOFError, OSError):
+                break
+            if message[0] == "event":
+                _, event, value, labels = message
+                telemetry.record(event, value, **labels)
+                continue
+            if message[0] == "ready":
+                worker.ready.set()
+                continue
+            job_id, ok, value = message
+            with self._lock:
+                future = worker.pending.pop(job_id, None)
+            if future is None:
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(RuntimeError(value))
+        self._handle_exit(worker, connection)
+
+    def _handle_exit(self, worker: _Worker, connection) -> None:
+        with self._lock:
+            if worker.connection is not connection:
+                return
+            pending = worker.pending
+            worker.pending = {}
+            worker.connection = None
+        for future in pending.values():
+            future.set_exception(WorkerCrashedError(f"Model worker {worker.index} exited"))
+        if self._closed:
+            return
+
+        exitcode = self._exitcode(worker)
+        logger.error(f"Model worker {worker.index} exited with code {exitcode}")
+        if time.monotonic() - worker.started_at >= self.stable_seconds:
+            # An occasional crash after a long uptime does not count towards giving up.
+            worker.restarts = 0
+        if worker.restarts >= self.max_restarts:
+            logger.error(f"Model worker {worker.index} restarted too often, leaving it down")
+            return
+        worker.restarts += 1
+        time.sleep(min(30, 2 ** worker.restarts / 10))
+        try:
+            self._spawn(worker)
+        except (EOFError, OSError) as e:
+            logger.error(f"Could not restart model worker {worker.index}: {e}")
+            return
+        logger.info(f"Restarted model worker {worker.index}")
+
+    def _exitcode(self, worker: _Worker) -> int | None:
+        try:
+            with self._forker_lock:
+                self._forker_connection.send(("wait", worker.pid))
+                return self._forker_connection.recv()
+        except (EOFError, OSError):
+            return None
+
+    def _least_loaded(self) -> _Worker:
+        alive = [worker for worker in self.workers if worker.connection is not None]
+        if not alive:
+            raise WorkerCrashedError("No model workers are running")
+        return min(alive, key=lambda worker: worker.in_flight)
+
+    def submit(self, prompt: str, source_language: str, target_language: str) -> Future:
+        future: Future = Future()
+        job_id = next(self._job_ids)
+        with self._lock:
+            worker = self._least_loaded()
+            worker.pending[job_id] = future
+            connection = worker.connection
+        try:
+            with worker.send_lock:
+                connection.send((job_id, prompt, source_language, target_language))
+        except (OSError, ValueError) as e:
+            with self._lock:
+                worker.pending.pop(job_id, None)
+            future.set_exception(WorkerCrashedError(f"Model worker {worker.index} unavailable: {e}"))
+        return future
+
+    def result(self, future: Future):
+        """
+        Waits up to `timeout` seconds for a submitted job. A job that times out is
+        abandoned: it no longer counts as in flight and its late result is ignored.
+        """
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            self._abandon(future)
+            raise
+
+    def results(self, futures: list[Future]) -> list:
+        """
+        Waits for several submitted jobs with one overall deadline of `timeout`
+        seconds. Once a job fails or the deadline passes, the jobs still running are
+        abandoned and the job's error (or a TimeoutError) is raised.
+        """
+        done, not_done = wait(futures, timeout=self.timeout, return_when=FIRST_EXCEPTION)
+        failed = [future for future in futures if future in done and future.exception() is not None]
+        if failed or not_done:
+            for future in not_done:
+                self._abandon(future)
+            if failed:
+                raise failed[0].exception()
+            raise TimeoutError(f"{len(not_done)} of {len(futures)} jobs did not finish in {self.timeout} seconds")
+        return [future.result() for future in futures]
+
+    def _abandon(self, future: Future) -> None:
+        with self._lock:
+            for worker in self.workers:
+                for job_id, pending in list(worker.pending.items()):
+                    if pending is future:
+                        del worker.pending[job_id]
+        future.cancel()
+
+    def translate(self, prompt: str, source_language: str, target_language: str):
+        return self.result(self.submit(prompt, source_language, target_language))
+
+    def in_flight(self) -> list[int]:
+        with self._lock:
+            return [worker.in_flight for worker in self.workers]
+
+    def stop(self) -> None:
+        self._closed = True
+        for worker in self.workers:
+            if worker.connection is not None:
+                try:
+                    with worker.send_lock:
+                        worker.connection.send(None)
+                except OSError:
+                    pass
+        if self._forker is not None:
+            # The helper waits for the workers to exit and terminates those that do not.
+            try:
+                with self._forker_lock:
+                    self._forker_connection.send(None)
+            except OSError:
+                pass
+            self._forker.join(timeout=10)
+            if self._forker.is_alive():
+                self._forker.terminate()
+
+
+def load_worker_pool(miner, config, warmup_pairs: list[tuple[str, str]] = ()) -> WorkerPool | None:
+    """
+    Builds the worker pool from the `workers*` options in `config.ini`, with every
+    worker warming up on `warmup_pairs`.
+
+    Returns:
+        The pool, or None when `workers` is 0 and the model runs in the server process.
+    """
+    workers = int(config.get_value("workers", 0))
+    if workers <= 0:
+        return None
+    torch_threads = config.get_value("torch_threads", None)
+    return WorkerPool(
+        miner,
+        workers,
+        threads=int(config.get_value("worker_threads", 8)),
+        torch_threads=int(torch_threads) if torch_threads else None,
+        timeout=float(config.get_value("worker_timeout", 60)),
+        warmup_pairs=warmup_pairs,
+    )
@@ -0,0 +1,75 @@
+import json
+import os
+import time
+from typing import Any
+
+from loguru import logger
+
+from weights_io import write_json_atomic
+
+CHECKPOINT_VERSION = 1
+
+
+class EpochCheckpoint:
+    """
+    Durable state of the current epoch, so a restarted validator resumes it
+    instead of re-querying and re-scoring every miner.
+
+    The scores of the epoch's miners, with their ss58 keys, are already kept in the
+    weights file after every step. The checkpoint adds what is needed to continue
+    the same epoch: the selected languages, the block and time the epoch started
+    and the netuid. It is written atomically when an epoch starts.
+
+    Attributes:
+        max_age: Seconds after the epoch's start beyond which it is not resumed; 0 never resumes.
+    """
+
+    def __init__(self, path: str, max_age: float = 7200) -> None:
+        self.path = path
+        self.max_age = max_age
+
+    def save(self, netuid: int, languages: list[str], start_block: int | None) -> None:
+        write_json_atomic(self.path, {
+            "version": CHECKPOINT_VERSION,
+            "netuid": netuid,
+            "languages": list(languages),
+            "start_block": start_block,
+            "started_at": time.time(),
+        }, indent=4)
+
+    def load(self, netuid: int) -> dict[str, Any] | None:
+        """The checkpoint of an epoch that can be resumed, or None."""
+        if self.max_age <= 0 or not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path) as file:
+                state = json.load(file)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable epoch checkpoint {self.path}: {e}")
+            return None
+
+        if state.get("version") != CHECKPOINT_VERSION or state.get("netuid") != netuid:
+            logger.info("Not resuming the epoch: the checkpoint is for another version or subnet")
+            return None
+        age = time.time() - state.get("started_at", 0)
+        if age > self.max_age:
+            logger.info(f"Not resuming the epoch: it started {age:.0f}s ago, more than {self.max_age:.0f}s")
+            return None
+        if not state.get("languages"):
+            return None
+        return state
+
+
+def validate_scores(scores: dict[str, dict[str, Any]], registered: dict[str, str]) -> dict[str, dict[str, Any]]:
+    """
+    Keeps the scores of miners still registered under the same key; a uid that was
+    deregistered or taken over by another key must be scored again.
+
+    Args:
+        scores: The weights file content, uid to `{"ss58", "score"}`.
+        registered: The current metagraph, uid to ss58 key.
+    """
+    return {
+        uid: data for uid, data in scores.items()
+        if registered.get(str(uid)) == data.get("ss58")
+    }
@@ -0,0 +1,100 @@
+import time
+from typing import Callable
+
+from loguru import logger
+from substrateinterface import Keypair
+
+from metagraph import get_miner_ip_port
+from node_pool import NodePool, WeightSubmitter
+from power_scaling import compute_weights
+from sharding import ScoreStore
+
+
+class ShardCoordinator:
+    """
+    The single voter of a sharded validator.
+
+    Workers query and score their slice of the miners and write the scores into the
+    shared store. The coordinator waits until every registered miner has a score
+    for the current epoch, then votes with the same `compute_weights` as a single
+    validator and advances the epoch, which makes the workers start the next one in
+    the languages from `sample_languages`.
+    If a worker stops reporting, the epoch is voted with the scores it has once it
+    is `epoch_deadline` seconds old, so a dead worker cannot stall the votes.
+
+    Attributes:
+        votes: Epochs voted since start.
+    """
+
+    def __init__(
+        self,
+        key: Keypair,
+        netuid: int,
+        node_pool: NodePool,
+        store: ScoreStore,
+        weight_submitter: WeightSubmitter | None = None,
+        epoch_deadline: float = 3600,
+        metrics=None,
+        sample_languages: Callable[[], list[str]] | None = None,
+    ) -> None:
+        self.key = key
+        self.netuid = netuid
+        self.node_pool = node_pool
+        self.store = store
+        self.metrics = metrics
+        self.weight_submitter = weight_submitter or WeightSubmitter(
+            node_pool, key, netuid, on_success=metrics.observe_vote if metrics is not None else None
+        )
+        self.epoch_deadline = epoch_deadline
+        self.sample_languages = sample_languages
+        self.votes = 0
+
+    def step(self) -> bool:
+        """
+        Votes and advances the epoch if it is complete or overdue.
+
+        Returns:
+            Whether a vote was submitted.
+        """
+        epoch, started_at = self.store.current_epoch()
+        miners = self.node_pool.call(lambda client: get_miner_ip_port(client, self.netuid))
+        modules_keys = self.node_pool.call(lambda client: client.query_map_key(self.netuid))
+        own_uid = None
+        for uid, ss58 in modules_keys.items():
+            if str(ss58) == self.key.ss58_address:
+                own_uid = uid
+
+        # Only scores of miners still registered under the same key count, as in a single validator.
+        registered = {str(miner['uid']): miner['key'] for miner in miners}
+        s_dict = {
+            uid: data['score'] for uid, data in self.store.scores(epoch).items()
+            if registered.get(uid) == data['ss58']
+        }
+        missing = len(registered) - len(s_dict)
+        age = time.time() - started_at
+
+        if missing and age < self.epoch_deadline:
+            logger.info(f"Epoch {epoch}: {len(s_dict)} of {len(registered)} miners scored")
+            return False
+        if not s_dict:
+            logger.warning(f"Epoch {epoch}: no miner scored after {age:.0f}s")
+            return False
+        if missing:
+            logger.warning(f"Epoch {epoch} is {age:.0f}s old; voting without {missing} unscored miners")
+
+        uids, weights = compute_weights(s_dict, own_uid=own_uid)
+        logger.info(f"Epoch {epoch}: setting weights of {len(uids)} miners")
+        logger.info(f"UIDS: {uids}")
+        logger.info(f"WEIGHTS TO SET: {weights}")
+        self.weight_submitter.submit(uids, weights)
+        self.votes += 1
+        self.store.advance(epoch, self.sample_languages() if self.sample_languages else None)
+        return True
+
+    def run(self, interval: int = 20) -> None:
+        while True:
+            try:
+                self.step()
+            except Exception as e:
+                logger.error(f"Coordinator step failed: {e}")
+            time.sleep(interval)
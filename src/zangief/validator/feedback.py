@@ -0,0 +1,156 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from loguru import logger
+from substrateinterface import Keypair
+
+from module_session import ModuleSession
+
+
+class FeedbackDispatcher:
+    """
+    Delivers score feedback to miners from a background event loop, so a step
+    never waits on slow or unreachable miners.
+
+    Notifications are sent concurrently (at most `concurrency` at a time) over a
+    pooled session with a `timeout` deadline each. A notification stays queued
+    until a slot is free, and a miner has at most one queued notification: a newer
+    score replaces one that has not been sent yet (coalesced). Notifications older than `max_age` seconds, or beyond
+    `max_pending` queued ones, are dropped. Feedback is best effort and never
+    retried.
+
+    Attributes:
+        stats: Notifications sent, failed, coalesced and dropped.
+    """
+
+    def __init__(
+        self,
+        key: Keypair,
+        timeout: float = 3,
+        concurrency: int = 32,
+        max_pending: int = 256,
+        max_age: float = 60,
+        metrics=None,
+    ) -> None:
+        self.key = key
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self.max_pending = max_pending
+        self.max_age = max_age
+        self.metrics = metrics
+        self.stats = {"sent": 0, "failed": 0, "coalesced": 0, "dropped": 0}
+        self._pending: OrderedDict[tuple[str, str], tuple[str, str, dict[str, Any], float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._in_flight = 0
+        self._idle = threading.Event()
+        self._idle.set()
+        self._loop = asyncio.new_event_loop()
+        self._wake: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._started = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="feedback-dispatcher", daemon=True)
+        self._thread.start()
+        self._started.wait()
+
+    def _count(self, outcome: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[outcome] += amount
+        if self.metrics is not None:
+            self.metrics.feedback.labels(outcome).inc(amount)
+
+    def submit(self, miner_info: dict[str, Any], score: dict[str, str]) -> None:
+        """Queues `score` for the miner; returns immediately."""
+        address = miner_info['address']
+        host, _, port = address.rpartition(":")
+        if host in ("", "None") or port in ("", "None"):
+            return
+        key = (str(miner_info['uid']), miner_info['key'])
+        with self._lock:
+            if key in self._pending:
+                self._count("coalesced")
+                del self._pending[key]
+            self._pending[key] = (address, miner_info['key'], score, time.monotonic())
+            while len(self._pending) > self.max_pending:
+                self._pending.popitem(last=False)
+                self._count("dropped")
+            self._idle.clear()
+        self._loop.call_soon_threadsafe(self._wake.set)
+
+    def join(self, timeout: float | None = None) -> bool:
+        """Waits until every queued notification has been sent, failed or dropped."""
+        return self._idle.wait(timeout)
+
+    def stop(self) -> None:
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result()
+        self._thread.join()
+        self._loop.close()
+
+    async def _shutdown(self) -> None:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._loop.call_soon(self._loop.stop)
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._task = self._loop.create_task(self._dispatch())
+        self._loop.run_forever()
+
+    async def _dispatch(self) -> None:
+        self._wake = asyncio.Event()
+        session = ModuleSession(self.key, limit=self.concurrency)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks: set[asyncio.Task] = set()
+        self._started.set()
+        try:
+            while True:
+                # Take a notification off the queue only once it can be sent, so
+                # newer scores keep replacing queued ones while all slots are busy.
+                await semaphore.acquire()
+                notification = None
+                while notification is None:
+                    with self._lock:
+                        if self._pending:
+                            _, notification = self._pending.popitem(last=False)
+                            self._in_flight += 1
+                    if notification is None:
+                        await self._wake.wait()
+                        self._wake.clear()
+                task = asyncio.create_task(self._send(session, semaphore, *notification))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await session.close()
+
+    def _done(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if not self._in_flight and not self._pending:
+                self._idle.set()
+
+    async def _send(
+        self, session: ModuleSession, semaphore: asyncio.Semaphore,
+        address: str, miner_key: str, score: dict[str, str], created: float,
+    ) -> None:
+        try:
+            if time.monotonic() - created > self.max_age:
+                # Waited too long behind other notifications; the miner has newer scores coming.
+                self._count("dropped")
+                return
+            host, port = address.rsplit(":", 1)
+            await session.call(host, port, "score", miner_key, score, timeout=self.timeout)
+            self._count("sent")
+        except Exception as e:
+            self._count("failed")
+            logger.debug(f"Failed to send score feedback to {address}: {e}")
+        finally:
+            semaphore.release()
+            self._done()
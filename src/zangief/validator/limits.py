@@ -0,0 +1,12 @@
+# Short sources can have legitimately longer translations, e.g. names spelled out or a script change.
+ANSWER_SLACK_CHARS = 200
+
+
+def max_answer_chars(source: str, ratio: float) -> int:
+    """The longest answer accepted for `source`: `ratio` times its length plus a fixed slack."""
+    return int(len(source) * ratio) + ANSWER_SLACK_CHARS
+
+
+def is_oversized(source: str, answer, ratio: float) -> bool:
+    """Whether `answer` is a string too long to be a translation of `source`."""
+    return isinstance(answer, str) and len(answer) > max_answer_chars(source, ratio)
@@ -0,0 +1,160 @@
+import ctypes
+import gc
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from collections import deque
+from typing import Callable
+
+from loguru import logger
+
+SOFT = "soft"
+HARD = "hard"
+
+MB = 1024 * 1024
+
+
+def rss_bytes() -> int:
+    """Current resident set size of the process."""
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # No procfs (macOS): fall back to the peak RSS, which is reported in bytes there.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def malloc_trim() -> None:
+    """Returns freed heap pages to the OS on glibc; a no-op elsewhere."""
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+class MemoryMonitor:
+    """
+    Watches the memory of the long-running validation loop.
+
+    `mark(phase)` records the RSS at the end of a phase of the step, so growth can
+    be attributed to the phase it happened in. Every `interval` steps the monitor
+    logs the RSS growth per phase and, when `tracemalloc_frames` is set, the source
+    lines whose allocations grew most since the previous snapshot.
+
+    After each step the RSS is checked against the budgets. Above `soft_limit_mb`
+    the soft trimmers run; above `hard_limit_mb` the soft and hard trimmers run.
+    Each level runs at most once per interval, so trimmers that shrink data (like
+    the prompt pool) get a chance to take effect instead of halving it on every
+    step. Trimmers are callables registered with `add_trimmer`, e.g. dropping
+    caches or shrinking the prompt pool; the garbage collector and `malloc_trim`
+    run after them.
+
+    Attributes:
+        history: RSS in bytes per phase of the last steps, as (step, phase, rss).
+    """
+
+    def __init__(
+        self,
+        soft_limit_mb: int | None = None,
+        hard_limit_mb: int | None = None,
+        interval: int = 10,
+        tracemalloc_frames: int = 0,
+        top: int = 10,
+        history_steps: int = 100,
+    ) -> None:
+        self.soft_limit = soft_limit_mb * MB if soft_limit_mb else None
+        self.hard_limit = hard_limit_mb * MB if hard_limit_mb else None
+        self.interval = max(1, interval)
+        self.top = top
+        self.history: deque[tuple[int, str, int]] = deque(maxlen=history_steps * 8)
+        self.trimmers: list[tuple[str, str, Callable[[], None]]] = []
+        self.steps = 0
+        self._last_trim: dict[str, int] = {}
+        self._phase_growth: dict[str, int] = {}
+        self._last_rss = rss_bytes()
+        self._snapshot = None
+        if tracemalloc_frames:
+            tracemalloc.start(tracemalloc_frames)
+            self._snapshot = tracemalloc.take_snapshot()
+
+    def add_trimmer(self, name: str, trim: Callable[[], None], level: str = SOFT) -> None:
+        if level not in (SOFT, HARD):
+            raise ValueError(f"Unknown trim level '{level}', expected '{SOFT}' or '{HARD}'")
+        self.trimmers.append((name, level, trim))
+
+    def mark(self, phase: str) -> int:
+        """Records the RSS at the end of `phase` and attributes the growth since the last mark to it."""
+        rss = rss_bytes()
+        self.history.append((self.steps, phase, rss))
+        self._phase_growth[phase] = self._phase_growth.get(phase, 0) + rss - self._last_rss
+        self._last_rss = rss
+        return rss
+
+    def end_step(self) -> int:
+        """Marks the end of a step, logs growth reports every interval and enforces the budgets."""
+        rss = self.mark("step_end")
+        self.steps += 1
+        if self.steps % self.interval == 0:
+            self.report(rss)
+        return self.check(rss)
+
+    def report(self, rss: int) -> None:
+        growth = ", ".join(
+            f"{phase} {delta / MB:+.1f} MB"
+            for phase, delta in sorted(self._phase_growth.items(), key=lambda item: -item[1])
+        )
+        logger.info(f"Validator RSS {rss / MB:.1f} MB; growth over the last {self.interval} steps: {growth}")
+        self._phase_growth.clear()
+
+        if self._snapshot is None or not tracemalloc.is_tracing():
+            return
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ))
+        top_growth = snapshot.compare_to(self._snapshot, "lineno")[:self.top]
+        self._snapshot = snapshot
+        for stat in top_growth:
+            if stat.size_diff > 0:
+                logger.info(f"Allocation growth {stat.size_diff / 1024:+.1f} KiB ({stat.count_diff:+d} blocks): {stat.traceback}")
+
+    def check(self, rss: int | None = None) -> int:
+        """Runs the trimmers for the budget `rss` exceeds and returns the RSS afterwards."""
+        rss = rss_bytes() if rss is None else rss
+        if self.hard_limit is not None and rss > self.hard_limit:
+            levels, limit = (SOFT, HARD), self.hard_limit
+        elif self.soft_limit is not None and rss > self.soft_limit:
+            levels, limit = (SOFT,), self.soft_limit
+        else:
+            return rss
+
+        level = levels[-1]
+        last_trim = self._last_trim.get(level)
+        if last_trim is not None and self.steps - last_trim < self.interval:
+            return rss
+        logger.warning(f"Validator RSS {rss / MB:.1f} MB is above the {level} budget of {limit / MB:.0f} MB")
+        for trimmed in levels:
+            self._last_trim[trimmed] = self.steps
+        return self.trim(levels, rss)
+
+    def trim(self, levels: tuple[str, ...], rss: int) -> int:
+        start_time = time.perf_counter()
+        for name, level, trim in self.trimmers:
+            if level not in levels:
+                continue
+            try:
+                trim()
+            except Exception as e:
+                logger.error(f"Memory trimmer '{name}' failed: {e}")
+        gc.collect()
+        malloc_trim()
+        trimmed = rss_bytes()
+        logger.info(
+            f"Trimmed {'/'.join(levels)} caches in {time.perf_counter() - start_time:.2f}s: "
+            f"{rss / MB:.1f} MB -> {trimmed / MB:.1f} MB"
+        )
+        self._last_rss = trimmed
+        return trimmed
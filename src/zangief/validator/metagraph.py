@@ -0,0 +1,22 @@
+from typing import Any, cast
+
+from communex.client import CommuneClient
+from communex.misc import get_map_modules
+
+
+def get_miner_ip_port(client: CommuneClient, netuid: int, balances=False):
+    modules = cast(dict[str, Any], get_map_modules(
+        client, netuid=netuid, include_balances=balances))
+
+    # Convert the values to a human readable format
+    modules_to_list = [value for _, value in modules.items()]
+
+    miners: list[Any] = []
+
+    for module in modules_to_list:
+        if module["incentive"] == module["dividends"] == 0:
+            miners.append(module)
+        elif module["incentive"] > module["dividends"]:
+            miners.append(module)
+
+    return miners
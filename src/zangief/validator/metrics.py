@@ -0,0 +1,108 @@
+import time
+from contextlib import contextmanager
+
+from loguru import logger
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, start_http_server
+
+STAGE_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 120)
+STEP_BUCKETS = (1, 5, 10, 20, 30, 45, 60, 90, 120, 180, 300, 600)
+EPOCH_BUCKETS = (60, 300, 600, 1200, 1800, 3600, 7200, 14400)
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+class ValidatorMetrics:
+    """
+    Prometheus metrics for the validator.
+
+    Each validation step is broken into stages (chain queries, miner fan-out,
+    language ID, BERT, COMET, score feedback, weight file I/O and voting) so the
+    time of a step can be attributed. Per-miner request latency and outcomes are
+    labelled by uid. Metrics are always recorded; they are only served over HTTP
+    once `serve` is called.
+    """
+
+    def __init__(self) -> None:
+        self.registry = CollectorRegistry()
+        self.step_seconds = Histogram(
+            "zangief_validator_step_seconds", "Duration of a validation step",
+            buckets=STEP_BUCKETS, registry=self.registry,
+        )
+        self.epoch_seconds = Histogram(
+            "zangief_validator_epoch_seconds", "Time between two weight votes",
+            buckets=EPOCH_BUCKETS, registry=self.registry,
+        )
+        self.stage_seconds = Histogram(
+            "zangief_validator_stage_seconds", "Time spent in each stage of a validation step",
+            ["stage"], buckets=STAGE_BUCKETS, registry=self.registry,
+        )
+        self.miner_request_seconds = Histogram(
+            "zangief_validator_miner_request_seconds", "Latency of generate calls to each miner",
+            ["uid"], buckets=STAGE_BUCKETS, registry=self.registry,
+        )
+        self.miner_requests = Counter(
+            "zangief_validator_miner_requests", "Generate calls to each miner by outcome",
+            ["uid", "status"], registry=self.registry,
+        )
+        self.answers_scored = Counter(
+            "zangief_validator_answers_scored", "Miner answers scored",
+            registry=self.registry,
+        )
+        self.answers_per_second = Gauge(
+            "zangief_validator_answers_per_second", "Scoring throughput of the latest step",
+            registry=self.registry,
+        )
+        self.scoring_batch_size = Histogram(
+            "zangief_validator_scoring_batch_size", "Answers scored together in one step",
+            buckets=BATCH_BUCKETS, registry=self.registry,
+        )
+        self.feedback = Counter(
+            "zangief_validator_feedback", "Score notifications to miners by outcome",
+            ["outcome"], registry=self.registry,
+        )
+        self.rss_bytes = Gauge(
+            "zangief_validator_rss_bytes", "Resident memory of the validator after the latest step",
+            registry=self.registry,
+        )
+        self.last_vote = Gauge(
+            "zangief_validator_last_vote_timestamp_seconds", "Unix time of the last successful vote",
+            registry=self.registry,
+        )
+        self._epoch_started = time.time()
+
+    @contextmanager
+    def stage(self, name: str):
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_seconds.labels(name).observe(time.perf_counter() - start_time)
+
+    @contextmanager
+    def step(self):
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start_time
+            self.step_seconds.observe(seconds)
+            logger.info(f"Validation step took {seconds:.2f} seconds")
+
+    def observe_miner(self, uid, seconds: float, status: str) -> None:
+        self.miner_request_seconds.labels(str(uid)).observe(seconds)
+        self.miner_requests.labels(str(uid), status).inc()
+
+    def observe_scoring(self, answers: int, seconds: float) -> None:
+        self.answers_scored.inc(answers)
+        self.scoring_batch_size.observe(answers)
+        if seconds > 0:
+            self.answers_per_second.set(answers / seconds)
+
+    def observe_vote(self) -> None:
+        now = time.time()
+        self.last_vote.set(now)
+        self.epoch_seconds.observe(now - self._epoch_started)
+        self._epoch_started = now
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> None:
+        start_http_server(port, addr=host, registry=self.registry)
+        logger.info(f"Serving validator metrics on {host}:{port}")
@@ -0,0 +1,96 @@
+import asyncio
+import json
+from typing import Any
+
+import aiohttp
+from communex.errors import NetworkTimeoutError
+from communex.module._protocol import create_method_endpoint, create_request_data
+from substrateinterface import Keypair
+
+
+# Bytes of a failed call's reply kept for the error message.
+ERROR_BODY_BYTES = 2048
+
+
+class ResponseTooLarge(Exception):
+    pass
+
+
+class ModuleSession:
+    """
+    Makes signed module calls like `ModuleClient.call`, but over one shared
+    `aiohttp` session so connections to miners are pooled and reused instead of
+    opening a new session for every call.
+
+    Must be created and used inside a running event loop.
+    """
+
+    def __init__(self, key: Keypair, limit: int = 100) -> None:
+        self.key = key
+        self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=limit))
+
+    async def call(
+        self,
+        host: str,
+        port: int | str,
+        fn: str,
+        target_key: str,
+        params: dict[str, Any],
+        timeout: float,
+        max_bytes: int | None = None,
+    ) -> Any:
+        """
+        Calls `fn` on the module and returns its decoded JSON reply.
+
+        With `max_bytes`, at most that many bytes of the (decompressed) reply are
+        read from the stream; a longer reply raises `ResponseTooLarge` without being
+        buffered.
+        """
+        body, headers = create_request_data(self.key, target_key, dict(params))
+        headers = {**headers, "Content-Type": "application/json"}
+        try:
+            async with self.session.post(
+                create_method_endpoint(host, port, fn),
+                data=body,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+            ) as response:
+                if response.status != 200:
+                    raise RuntimeError(
+                        f"Unexpected status code: {response.status}, response: {await self._error_body(response)}"
+                    )
+                if max_bytes is None:
+                    return json.loads(await response.read())
+                return json.loads(await self._read_limited(response, max_bytes))
+        except asyncio.TimeoutError as e:
+            raise NetworkTimeoutError(
+                f"The call took longer than the timeout of {timeout} second(s)"
+            ).with_traceback(e.__traceback__)
+
+    @staticmethod
+    async def _read_limited(response: aiohttp.ClientResponse, max_bytes: int) -> bytes:
+        if not response.headers.get("Content-Encoding") and (response.content_length or 0) > max_bytes:
+            raise ResponseTooLarge(f"Response of {response.content_length} bytes exceeds {max_bytes} bytes")
+        chunks = []
+        size = 0
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            size += len(chunk)
+            if size > max_bytes:
+                raise ResponseTooLarge(f"Response exceeds {max_bytes} bytes")
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    @staticmethod
+    async def _error_body(response: aiohttp.ClientResponse) -> str:
+        # Never buffer more than the start of an error reply, whatever its size.
+        body = b""
+        while len(body) <= ERROR_BODY_BYTES:
+            chunk = await response.content.read(ERROR_BODY_BYTES + 1 - len(body))
+            if not chunk:
+                break
+            body += chunk
+        text = body[:ERROR_BODY_BYTES].decode(errors="replace")
+        return text + "..." if len(body) > ERROR_BODY_BYTES else text
+
+    async def close(self) -> None:
+        await self.session.close()
@@ -0,0 +1,247 @@
+import queue
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, TypeVar
+
+from communex.client import CommuneClient
+from loguru import logger
+
+T = TypeVar("T")
+
+
+@dataclass
+class NodeHealth:
+    url: str
+    latency: float | None = None
+    head: int | None = None
+    failures: int = 0
+    healthy: bool = True
+    last_probe: float | None = None
+
+
+class NodePool:
+    """
+    A pool of chain node endpoints that routes queries to the fastest healthy node.
+
+    A background thread probes every node each `probe_interval` seconds by reading
+    its head block, recording the round-trip latency. A node is healthy when the
+    probe succeeds and its head is at most `max_lag` blocks behind the best head
+    seen. Queries made through `call` go to the healthy node with the lowest
+    latency; a failing query marks the node unhealthy until its next successful
+    probe and is retried on the next node.
+
+    Attributes:
+        nodes: Health of every endpoint, by URL.
+    """
+
+    def __init__(
+        self,
+        urls: list[str],
+        probe_interval: float = 30,
+        max_lag: int = 5,
+        timeout: int = 10,
+        client_factory: Callable[..., Any] = CommuneClient,
+        clients: dict[str, Any] | None = None,
+    ) -> None:
+        if not urls:
+            raise ValueError("The node pool needs at least one node URL")
+        self.urls = list(dict.fromkeys(urls))
+        self.probe_interval = probe_interval
+        self.max_lag = max_lag
+        self.timeout = timeout
+        self.client_factory = client_factory
+        self.nodes = {url: NodeHealth(url) for url in self.urls}
+        self._clients: dict[str, Any] = dict(clients or {})
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @classmethod
+    def for_client(cls, client) -> "NodePool":
+        """A single-node pool around an existing client."""
+        return cls([client.url], clients={client.url: client})
+
+    def get_client(self, url: str):
+        with self._lock:
+            client = self._clients.get(url)
+        if client is None:
+            client = self.client_factory(url, timeout=self.timeout)
+            with self._lock:
+                client = self._clients.setdefault(url, client)
+        return client
+
+    def _drop_client(self, url: str) -> None:
+        # A fresh connection is opened the next time the node is used.
+        with self._lock:
+            self._clients.pop(url, None)
+
+    def probe(self, url: str) -> NodeHealth:
+        node = self.nodes[url]
+        start_time = time.perf_counter()
+        try:
+            block = self.get_client(url).get_block()
+            node.head = int(block["header"]["number"])
+            node.latency = time.perf_counter() - start_time
+            node.failures = 0
+        except Exception as e:
+            node.latency = None
+            node.failures += 1
+            node.healthy = False
+            self._drop_client(url)
+            logger.warning(f"Node {url} failed its health probe: {e}")
+        node.last_probe = time.time()
+        return node
+
+    def probe_all(self) -> None:
+        for url in self.urls:
+            self.probe(url)
+        heads = [node.head for node in self.nodes.values() if node.latency is not None]
+        best_head = max(heads, default=None)
+        for node in self.nodes.values():
+            if node.latency is None:
+                continue
+            node.healthy = best_head - node.head <= self.max_lag
+            if not node.healthy:
+                logger.warning(f"Node {node.url} is {best_head - node.head} blocks behind")
+
+    def ranked(self) -> list[str]:
+        """Node URLs from the best to the worst: healthy by latency, then the rest by failures."""
+        def rank(url: str):
+            node = self.nodes[url]
+            latency = node.latency if node.latency is not None else float("inf")
+            return (not node.healthy, node.failures, latency)
+        return sorted(self.urls, key=rank)
+
+    def client(self):
+        """The client of the best node."""
+        return self.get_client(self.ranked()[0])
+
+    def call(self, query: Callable[[Any], T], attempts: int | None = None) -> T:
+        """
+        Runs `query(client)` on the best node, falling back to the next nodes on failure.
+
+        Raises:
+            The exception of the last attempt if every node failed.
+        """
+        error: Exception | None = None
+        for url in self.ranked()[:attempts or len(self.urls)]:
+            try:
+                client = self.get_client(url)
+                return query(client)
+            except Exception as e:
+                error = e
+                node = self.nodes[url]
+                node.failures += 1
+                node.healthy = False
+                self._drop_client(url)
+                logger.warning(f"Query on node {url} failed: {e}")
+        assert error is not None
+        raise error
+
+    def start(self) -> None:
+        """Probes all nodes now, then keeps probing them in a background thread."""
+        self.probe_all()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="node-pool", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.probe_interval):
+            try:
+                self.probe_all()
+            except Exception as e:
+                logger.error(f"Node pool probe failed: {e}")
+
+
+class WeightSubmitter:
+    """
+    Submits weight votes from a background thread so the validation loop never
+    blocks on the chain.
+
+    Votes are retried through the node pool with exponential backoff and jitter,
+    up to `max_attempts` times. Only the latest vote matters, so a vote submitted
+    while another is still pending replaces it.
+    """
+
+    def __init__(
+        self,
+        node_pool: NodePool,
+        key,
+        netuid: int,
+        max_attempts: int = 5,
+        backoff: float = 2,
+        max_backoff: float = 60,
+        on_success: Callable[[], None] | None = None,
+    ) -> None:
+        self.node_pool = node_pool
+        self.key = key
+        self.netuid = netuid
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.on_success = on_success
+        self.submitted = 0
+        self.failed = 0
+        self._votes: queue.Queue[tuple[list[int], list[int]] | None] = queue.Queue(maxsize=1)
+        self._idle = threading.Event()
+        self._idle.set()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="weight-submitter", daemon=True)
+        self._thread.start()
+
+    def submit(self, uids: list[int], weights: list[int]) -> None:
+        """Queues a vote, replacing a pending one that has not been sent yet."""
+        with self._lock:
+            self._idle.clear()
+            try:
+                self._votes.get_nowait()
+                logger.info("Replacing a pending weight vote with a newer one")
+            except queue.Empty:
+                pass
+            self._votes.put_nowait((uids, weights))
+
+    def join(self, timeout: float | None = None) -> bool:
+        """Waits until every queued vote has been sent or given up on."""
+        return self._idle.wait(timeout)
+
+    def stop(self) -> None:
+        self._votes.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            vote = self._votes.get()
+            if vote is None:
+                return
+            self._send(*vote)
+            with self._lock:
+                if self._votes.empty():
+                    self._idle.set()
+
+    def _send(self, uids: list[int], weights: list[int]) -> None:
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                self.node_pool.call(
+                    lambda client: client.vote(key=self.key, uids=uids, weights=weights, netuid=self.netuid)
+                )
+            except Exception as e:
+                if attempt == self.max_attempts:
+                    self.failed += 1
+                    logger.error(f"Giving up on weight vote after {attempt} attempts: {e}")
+                    return
+                delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1)) * random.uniform(0.5, 1)
+                logger.warning(f"Weight vote attempt {attempt} failed: {e}. Retrying in {delay:.1f}s")
+                time.sleep(delay)
+                continue
+            self.submitted += 1
+            logger.info(f"Set weights for {len(uids)} miners")
+            if self.on_success is not None:
+                self.on_success()
+            return
@@ -32,3 +32,52 @@ def conditional_power_scaling(score_dict: Dict[int, float]) -> Dict[int, float]:
         score_dict[uid] = (t / max(transformed_scores))
 
     return score_dict
+
+
+def normalize_scores(scores):
+    min_score = min(scores)
+    max_score = max(scores)
+
+    if min_score == max_score:
+        # If all scores are the same, give all ones
+        return [1] * len(scores)
+
+    # Normalize scores from 0 to 1
+    normalized_scores = [(score - min_score) / (max_score - min_score) for score in scores]
+
+    return normalized_scores
+
+
+def compute_weights(s_dict: Dict[str, float], own_uid: int | None = None) -> tuple[list[int], list[int]]:
+    """
+    Turns the scores of an epoch into the weights to vote: scores are normalized,
+    power scaled, normalized again and scaled to integers. Miners whose weight is
+    zero and the validator's own uid are left out.
+
+    Args:
+        s_dict (dict[str, float]): A dictionary mapping miner UIDs to their scores.
+        own_uid (int | None): The validator's uid, which must not receive weight.
+
+    Returns:
+        The uids and their integer weights, in the same order.
+    """
+    weighted_scores: dict[str, float] = {}
+
+    normal_scores = normalize_scores(s_dict.values())
+    score_dict = {uid: score for uid, score in zip(s_dict.keys(), normal_scores)}
+    power_scaled_scores = conditional_power_scaling(score_dict)
+    scores = sum(power_scaled_scores.values())
+
+    for uid, score in power_scaled_scores.items():
+        weight = score * 1000 / scores
+        weighted_scores[uid] = weight
+
+    weighted_scores = {k: v for k, v in zip(
+        weighted_scores.keys(), normalize_scores(weighted_scores.values())) if v != 0}
+
+    if own_uid is not None:
+        weighted_scores.pop(str(own_uid), None)
+
+    uids = [int(uid) for uid in weighted_scores.keys()]
+    weights = [int(weight * 1000) for weight in weighted_scores.values()]
+    return uids, weights
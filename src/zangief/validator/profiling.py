@@ -0,0 +1,186 @@
+import cProfile
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager, nullcontext
+
+from loguru import logger
+
+DEFAULT_PROFILE_DIR = os.path.join(os.path.expanduser("~"), ".commune", "zangief", "profiles")
+PROFILERS = ("sampling", "cprofile")
+
+_NULL_SPAN = nullcontext()
+
+
+class SamplingProfiler:
+    """
+    Samples the stacks of every thread at a fixed interval and counts them in the
+    collapsed format read by flamegraph.pl and speedscope (`frame;frame;frame count`).
+    """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def write(self, path: str) -> None:
+        with open(path, "w") as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f"{stack} {count}\n")
+
+
+class Profiler:
+    """
+    Opt-in profiling of validation steps.
+
+    With `enabled`, nested timing spans of every step are kept in a rolling trace of
+    the last `trace_steps` steps and summarized in the log. Independently, a capture
+    of the next N steps can be requested (at startup or with SIGUSR1); it runs a
+    sampling profiler or cProfile across those steps and writes one file to
+    `output_dir`: collapsed stacks (`.collapsed`, for flamegraph.pl or speedscope)
+    or a pstats dump (`.prof`, for snakeviz or flameprof).
+
+    When disabled and no capture is pending, `span` returns a shared no-op context
+    manager, so instrumented code pays only an attribute lookup.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        trace_steps: int = 50,
+        profiler: str = "sampling",
+        output_dir: str | None = None,
+        sample_interval: float = 0.005,
+    ) -> None:
+        if profiler not in PROFILERS:
+            raise ValueError(f"Unknown profiler '{profiler}', expected one of {PROFILERS}")
+        self.enabled = enabled
+        self.profiler = profiler
+        self.output_dir = os.path.expanduser(output_dir or DEFAULT_PROFILE_DIR)
+        self.sample_interval = sample_interval
+        self.traces: deque[list[tuple[str, float, float]]] = deque(maxlen=trace_steps)
+        self._local = threading.local()
+        self._pending_steps = 0
+        self._capture_steps = 0
+        self._capture = None
+
+    @property
+    def active(self) -> bool:
+        return self.enabled or self._capture is not None
+
+    def request_capture(self, steps: int) -> None:
+        """
+        Profiles the next `steps` validation steps. Only sets a flag, so it is safe
+        to call from a signal handler; the capture is logged when it starts.
+        """
+        self._pending_steps = max(1, steps)
+
+    def span(self, name: str):
+        if not self.active:
+            return _NULL_SPAN
+        return self._span(name)
+
+    @contextmanager
+    def _span(self, name: str):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(name)
+        path = "/".join(stack)
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start_time
+            stack.pop()
+            spans = getattr(self._local, "spans", None)
+            if spans is not None:
+                spans.append((path, start_time, seconds))
+
+    @contextmanager
+    def step(self):
+        """Wraps one validation step: starts pending captures and records the step's trace."""
+        if self._pending_steps and self._capture is None:
+            self._start_capture()
+        if not self.active:
+            yield
+            return
+
+        self._local.spans = []
+        try:
+            with self._span("step"):
+                yield
+        finally:
+            spans, self._local.spans = self._local.spans, None
+            self.traces.append(spans)
+            if self.enabled:
+                logger.info(f"Step spans: {format_spans(spans)}")
+            if self._capture is not None:
+                self._capture_steps -= 1
+                if self._capture_steps <= 0:
+                    self._finish_capture()
+
+    def _start_capture(self) -> None:
+        self._capture_steps, self._pending_steps = self._pending_steps, 0
+        logger.info(f"Profiling the next {self._capture_steps} validation steps with {self.profiler}")
+        if self.profiler == "cprofile":
+            self._capture = cProfile.Profile()
+            self._capture.enable()
+        else:
+            self._capture = SamplingProfiler(self.sample_interval)
+            self._capture.start()
+
+    def _finish_capture(self) -> None:
+        capture, self._capture = self._capture, None
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        if isinstance(capture, cProfile.Profile):
+            capture.disable()
+            path = os.path.join(self.output_dir, f"validator-{stamp}.prof")
+            capture.dump_stats(path)
+        else:
+            capture.stop()
+            path = os.path.join(self.output_dir, f"validator-{stamp}.collapsed")
+            capture.write(path)
+        logger.info(f"Wrote validator profile to {path}")
+
+    def summary(self) -> dict[str, float]:
+        """Mean seconds per span path over the rolling trace."""
+        totals: dict[str, list[float]] = {}
+        for spans in self.traces:
+            for path, _, seconds in spans:
+                totals.setdefault(path, []).append(seconds)
+        return {path: sum(values) / len(values) for path, values in totals.items()}
+
+
+def format_spans(spans: list[tuple[str, float, float]]) -> str:
+    ordered = sorted(spans, key=lambda span: span[1])
+    return ", ".join(f"{path} {seconds:.2f}s" for path, _, seconds in ordered)
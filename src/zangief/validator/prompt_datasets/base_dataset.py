@@ -3,8 +3,19 @@ from abc import abstractmethod
 
 class BaseDataset:
     def __init__(self):
-        pass
+        self.selected_languages = []
 
     @abstractmethod
     def get_random_record(self) -> str:
         pass
+
+    def select_languages(self, languages: list[str] | None = None) -> list[str]:
+        """
+        Picks the languages of the next epoch, or `languages` when resuming one;
+        datasets with fixed languages keep them.
+        """
+        return self.selected_languages
+
+    def trim(self, fraction: float = 0.5) -> None:
+        """Releases part of the buffered records when the validator runs short of memory."""
+        pass
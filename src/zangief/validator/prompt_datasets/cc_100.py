@@ -6,72 +6,111 @@ from datasets.arrow_dataset import Dataset
 from datasets.iterable_dataset import IterableDataset
 from .base_dataset import BaseDataset
 from loguru import logger
-from zangief.validator.reward import Reward
 from typing import Any, Dict, List, Union
 
 
+LANGUAGES = [
+    "ar",
+    "bn",
+    "cs",
+    "de",
+    "el",
+    "en",
+    "es",
+    "fa",
+    "fr",
+    "he",
+    "hi",
+    "hu",
+    "it",
+    "ja",
+    "jv",
+    "ko",
+    "my",
+    "nl",
+    "pa",
+    "pl",
+    "pt",
+    "ro",
+    "ru",
+    "sv",
+    "ta",
+    "te",
+    "th",
+    "tr",
+    "uk",
+    "ur",
+    "vi",
+    "zh",
+]
+
+
+def sample_languages(count: int = 10) -> list[str]:
+    """Samples the prompt languages of an epoch without loading any data."""
+    return random.sample(LANGUAGES, count)
+
+
 class CC100(BaseDataset):
 
-    def __init__(self):
+    def __init__(self, languages: list[str] | None = None):
         super().__init__()
-        self.all_languages = [
-            "ar",
-            "bn",
-            "cs",
-            "de",
-            "el",
-            "en",
-            "es",
-            "fa",
-            "fr",
-            "he",
-            "hi",
-            "hu",
-            "it",
-            "ja",
-            "jv",
-            "ko",
-            "my",
-            "nl",
-            "pa",
-            "pl",
-            "pt",
-            "ro",
-            "ru",
-            "sv",
-            "ta",
-            "te",
-            "th",
-            "tr",
-            "uk",
-            "ur",
-            "vi",
-            "zh",
-        ]
-        self.selected_languages = random.sample(self.all_languages, 10)
-        self.languages_by_buffer_size = {
-            lb: 50_000 for
-            lb in self.selected_languages
-        }
-        language_alias = {"zh": "zh-Hans", "zht": "zh-Hant"}
+        self.all_languages = list(LANGUAGES)
+        self.language_alias = {"zh": "zh-Hans", "zht": "zh-Hant"}
+        self.buffer_size = 50_000
+        # Trimming never shrinks a language below this many prompts.
+        self.min_records = 1_000
+        self.selected_languages = []
+        self.languages_by_buffer_size = {}
         self.datasets = {}
-        for language in self.languages_by_buffer_size:
-            buffer_size = self.languages_by_buffer_size[language]
-            dataset_language = language
-            if language in language_alias:
-                dataset_language = language_alias[language]
-            streaming_dataset = load_dataset(
-                "cc100", dataset_language, split="train", streaming=True
-            )
-            dataset = streaming_dataset.shuffle(
-                seed=1137, buffer_size=buffer_size
-            ).filter(self.filter_dataset)
-            logger.info(f"Loading dataset for {language}")
-            # streaming_dataset = load_dataset("cc100", dataset_language, split='train')
-            # dataset = streaming_dataset.shuffle(seed=42).filter(self.filter_dataset)
-            buffered_dataset = self.buffer_dataset(dataset, language)
-            self.datasets[language] = buffered_dataset
-            logger.info(f"Loaded {language} ({len(buffered_dataset)} records)")
+        self.select_languages(languages=languages)
+
+    def select_languages(self, count: int = 10, languages: list[str] | None = None) -> list[str]:
+        """
+        Samples `count` languages for the next epoch, or selects `languages` when
+        resuming an epoch.
+
+        Buffers of languages that stay selected are reused and buffers of languages
+        that are dropped are released, so re-sampling every epoch does not rebuild
+        (or briefly double) the whole prompt pool.
+        """
+        if languages:
+            self.selected_languages = [language for language in languages if language in self.all_languages]
+        else:
+            self.selected_languages = sample_languages(count)
+        for language in list(self.datasets):
+            if language not in self.selected_languages:
+                del self.datasets[language]
+                del self.languages_by_buffer_size[language]
+        for language in self.selected_languages:
+            if language not in self.datasets:
+                self.languages_by_buffer_size[language] = self.buffer_size
+                self.datasets[language] = self.load_language(language)
+        return self.selected_languages
+
+    def load_language(self, language: str) -> list[dict[str, Any]]:
+        buffer_size = self.languages_by_buffer_size[language]
+        dataset_language = self.language_alias.get(language, language)
+        streaming_dataset = load_dataset(
+            "cc100", dataset_language, split="train", streaming=True
+        )
+        dataset = streaming_dataset.shuffle(
+            seed=1137, buffer_size=buffer_size
+        ).filter(self.filter_dataset)
+        logger.info(f"Loading dataset for {language}")
+        buffered_dataset = self.buffer_dataset(dataset, language)
+        logger.info(f"Loaded {language} ({len(buffered_dataset)} records)")
+        return buffered_dataset
+
+    def trim(self, fraction: float = 0.5) -> None:
+        """
+        Keeps a random `fraction` of every language's prompt buffer to release
+        memory, but at least `min_records` prompts per language.
+        """
+        for language, records in self.datasets.items():
+            keep = max(self.min_records, int(len(records) * fraction))
+            if keep < len(records):
+                self.datasets[language] = random.sample(records, keep)
+        logger.info(f"Trimmed CC-100 prompt buffers to {fraction:.0%}")
 
     @staticmethod
     def filter_dataset(example):
@@ -0,0 +1,25 @@
+import json
+import random
+
+from .base_dataset import BaseDataset
+
+
+class LocalDataset(BaseDataset):
+    """
+    Prompts held in memory, by language, for running the validator without
+    downloading CC-100.
+    """
+
+    def __init__(self, records: dict[str, list[str]]):
+        super().__init__()
+        self.datasets = {language: list(texts) for language, texts in records.items() if texts}
+        self.selected_languages = sorted(self.datasets)
+
+    @classmethod
+    def from_file(cls, path: str) -> "LocalDataset":
+        """Loads a JSON file mapping language codes to lists of prompts."""
+        with open(path) as file:
+            return cls(json.load(file))
+
+    def get_random_record(self, language="es") -> str:
+        return random.choice(self.datasets[language])
@@ -0,0 +1,121 @@
+import argparse
+import itertools
+import json
+import time
+
+from power_scaling import compute_weights
+from step_trace import read_trace
+
+
+def weight_changes(expected: tuple[list[int], list[int]], actual: tuple[list[int], list[int]]) -> dict[int, tuple]:
+    """The uids whose weight differs between two votes, with (expected, actual) weights."""
+    expected_weights = dict(zip(*expected))
+    actual_weights = dict(zip(*actual))
+    return {
+        uid: (expected_weights.get(uid), actual_weights.get(uid))
+        for uid in sorted(set(expected_weights) | set(actual_weights))
+        if expected_weights.get(uid) != actual_weights.get(uid)
+    }
+
+
+def replay(records, reward=None, tolerance: float = 1e-4) -> dict:
+    """
+    Feeds recorded steps back through `reward.get_scores` and recorded votes back
+    through `compute_weights`.
+
+    Without a reward only the weights are checked. With one, every answer is
+    re-scored, the new scores are compared with the recorded ones, and each epoch's
+    weights are also recomputed from the re-scored answers, so the effect of a
+    scoring change on the vote is visible.
+    """
+    report = {
+        "steps": 0,
+        "answers": 0,
+        "scoring_seconds": 0.0,
+        "score_mismatches": [],
+        "votes": 0,
+        "weight_mismatches": [],
+        "rescored_weight_changes": [],
+    }
+    epoch_scores: dict[str, float] = {}
+
+    for record in records:
+        if record["type"] == "step":
+            report["steps"] += 1
+            miners = record["miners"]
+            report["answers"] += len(miners)
+            if reward is None or not miners:
+                continue
+            start_time = time.perf_counter()
+            scores, _ = reward.get_scores(
+                record["prompt"], record["target_language"], [miner["answer"] for miner in miners]
+            )
+            report["scoring_seconds"] += time.perf_counter() - start_time
+            for miner, score in zip(miners, scores):
+                epoch_scores[miner["uid"]] = float(score)
+                recorded = miner["scores"]["composite"]
+                if abs(recorded - score) > tolerance:
+                    report["score_mismatches"].append({
+                        "uid": miner["uid"],
+                        "prompt": record["prompt"][:80],
+                        "recorded": recorded,
+                        "replayed": float(score),
+                    })
+
+        elif record["type"] == "vote":
+            report["votes"] += 1
+            recorded = (record["uids"], record["weights"])
+            recomputed = compute_weights(record["scores"], own_uid=record.get("own_uid"))
+            changes = weight_changes(recorded, recomputed)
+            if changes:
+                report["weight_mismatches"].append({"vote": report["votes"], "changes": changes})
+            if reward is not None and epoch_scores:
+                # Miners scored before the trace started keep their recorded scores.
+                rescored = compute_weights(
+                    {**record["scores"], **epoch_scores}, own_uid=record.get("own_uid")
+                )
+                changes = weight_changes(recorded, rescored)
+                if changes:
+                    report["rescored_weight_changes"].append({"vote": report["votes"], "changes": changes})
+            epoch_scores = {}
+
+    if report["scoring_seconds"]:
+        report["answers_per_second"] = report["answers"] / report["scoring_seconds"]
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="replay recorded validator steps")
+    parser.add_argument("trace", type=str, help="trace file recorded with VALIDATOR_TRACE_PATH")
+    parser.add_argument("--no-score", action="store_true", help="only recompute weights; skip re-scoring answers")
+    parser.add_argument("--device", type=str, default="cpu", help="device of the scoring models")
+    parser.add_argument("--limit", type=int, default=None, help="replay at most this many records")
+    parser.add_argument("--tolerance", type=float, default=1e-4, help="score difference reported as a mismatch")
+    parser.add_argument("--output", type=str, default=None, help="write the full report as JSON")
+    args = parser.parse_args()
+
+    reward = None
+    if not args.no_score:
+        from reward import Reward
+        reward = Reward(device=args.device)
+
+    records = itertools.islice(read_trace(args.trace), args.limit)
+    report = replay(records, reward=reward, tolerance=args.tolerance)
+
+    print(f"{report['steps']} steps, {report['answers']} answers, {report['votes']} votes")
+    if reward is not None:
+        print(f"scoring: {report['scoring_seconds']:.1f}s, {report.get('answers_per_second', 0):.1f} answers/s")
+        print(f"score mismatches: {len(report['score_mismatches'])} (tolerance {args.tolerance})")
+        for mismatch in report["score_mismatches"][:10]:
+            print(f"  uid {mismatch['uid']}: {mismatch['recorded']:.4f} -> {mismatch['replayed']:.4f}")
+        print(f"votes changed by re-scoring: {len(report['rescored_weight_changes'])}")
+    print(f"votes not reproduced from recorded scores: {len(report['weight_mismatches'])}")
+    for mismatch in report["weight_mismatches"][:10]:
+        print(f"  vote {mismatch['vote']}: {mismatch['changes']}")
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,15 @@
+from contextlib import contextmanager, nullcontext
 from comet import download_model, load_from_checkpoint
 from bert_score import BERTScorer
 import langid
+import torch
 
 
 class Reward:
 
-    def __init__(self, device="cpu"):
+    def __init__(self, device="cpu", metrics=None, profiler=None):
+        self.metrics = metrics
+        self.profiler = profiler
         comet_model_path = download_model("Unbabel/wmt20-comet-qe-da")
         self.comet_model = load_from_checkpoint(comet_model_path)
         self.comet_model.eval()
@@ -13,6 +17,20 @@ class Reward:
             model_type="bert-base-multilingual-cased", device=device
         )
 
+    @contextmanager
+    def stage(self, name):
+        with (
+            self.profiler.span(name) if self.profiler is not None else nullcontext(),
+            self.metrics.stage(name) if self.metrics is not None else nullcontext(),
+        ):
+            yield
+
+    def release_caches(self):
+        """Returns blocks cached by the torch CUDA allocator to the device."""
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+            torch.cuda.ipc_collect()
+
     def get_bert_score(self, sources, targets):
         _, _, f1 = self.bert_model.score(sources, targets)
         return f1.tolist()
@@ -58,18 +76,21 @@ class Reward:
         }
         full_scores = [empty_full_score for _ in range(len(targets))]
 
-        for index, value in enumerate(targets):
-            if self.is_valid_response(target_language, value):
-                cleaned_targets.append(value)
-            else:
-                empty_indexes.append(index)
+        with self.stage("language_id"):
+            for index, value in enumerate(targets):
+                if self.is_valid_response(target_language, value):
+                    cleaned_targets.append(value)
+                else:
+                    empty_indexes.append(index)
 
         composite_scores = []
         fulls = []
         if len(cleaned_targets) > 0:
             sources = [source] * len(cleaned_targets)
-            bert_scores = self.get_bert_score(sources, cleaned_targets)
-            comet_scores = self.get_comet_score(sources, cleaned_targets)
+            with self.stage("bert"):
+                bert_scores = self.get_bert_score(sources, cleaned_targets)
+            with self.stage("comet"):
+                comet_scores = self.get_comet_score(sources, cleaned_targets)
             for target, bert_score, comet_score in zip(
                 cleaned_targets, bert_scores, comet_scores
             ):
@@ -0,0 +1,179 @@
+import bisect
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS epoch (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    number INTEGER NOT NULL,
+    started_at REAL NOT NULL,
+    languages TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS scores (
+    epoch INTEGER NOT NULL,
+    uid INTEGER NOT NULL,
+    ss58 TEXT NOT NULL,
+    score REAL NOT NULL,
+    shard TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (epoch, uid)
+);
+"""
+
+
+def _hash(value: str) -> int:
+    # Stable across processes and hosts, unlike the salted built-in hash().
+    return int.from_bytes(hashlib.sha256(value.encode()).digest()[:8], "big")
+
+
+class ShardRing:
+    """
+    Assigns miner uids to shards by consistent hashing.
+
+    Every shard owns `replicas` points on a hash ring and a uid belongs to the
+    first point at or after its own hash, so adding or removing a shard only moves
+    the uids of that shard. Every worker builds the same ring from the same shard
+    names, so the slices are disjoint and cover every uid without coordination.
+    """
+
+    def __init__(self, shards: list[str], replicas: int = 64) -> None:
+        if not shards:
+            raise ValueError("A shard ring needs at least one shard")
+        if len(set(shards)) != len(shards):
+            raise ValueError(f"Duplicate shard names: {shards}")
+        self.shards = list(shards)
+        points = sorted(
+            (_hash(f"{shard}#{replica}"), shard)
+            for shard in shards
+            for replica in range(replicas)
+        )
+        self._hashes = [point for point, _ in points]
+        self._owners = [shard for _, shard in points]
+
+    def owner(self, uid: int | str) -> str:
+        index = bisect.bisect_left(self._hashes, _hash(f"uid:{int(uid)}"))
+        return self._owners[index % len(self._owners)]
+
+
+class ScoreStore:
+    """
+    The scores of the current epoch shared by the workers and the coordinator of a
+    sharded validator, in a SQLite database.
+
+    Workers write the scores of their miners; the coordinator reads them all, votes
+    and advances the epoch number, which tells the workers to start a new epoch.
+    The epoch's prompt languages are stored with it, so every worker prompts its
+    miners in the same languages. Scores of the last `keep_epochs` epochs are kept
+    for inspection.
+
+    The database must be on a filesystem with working locks: a local disk shared by
+    processes of one host, or a mount that supports SQLite locking across hosts.
+    """
+
+    def __init__(self, path: str, timeout: float = 30, keep_epochs: int = 3) -> None:
+        self.path = path
+        self.timeout = timeout
+        self.keep_epochs = keep_epochs
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connection() as connection:
+            connection.executescript(SCHEMA)
+            connection.execute(
+                "INSERT OR IGNORE INTO epoch (id, number, started_at) VALUES (0, 0, ?)", (time.time(),)
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout)
+            # WAL lets workers write while the coordinator reads.
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def current_epoch(self) -> tuple[int, float]:
+        """The number of the current epoch and the time it started."""
+        row = self._connection().execute("SELECT number, started_at FROM epoch WHERE id = 0").fetchone()
+        return row[0], row[1]
+
+    def epoch_languages(self, sample: Callable[[], list[str]]) -> tuple[int, list[str]]:
+        """
+        The number and prompt languages of the current epoch. An epoch started
+        without languages (the first one) gets `sample()` from whoever asks first.
+        """
+        with self._connection() as connection:
+            connection.execute(
+                "UPDATE epoch SET languages = ? WHERE id = 0 AND languages = ''", (json.dumps(sample()),)
+            )
+            number, languages = connection.execute(
+                "SELECT number, languages FROM epoch WHERE id = 0"
+            ).fetchone()
+        return number, json.loads(languages)
+
+    def put_scores(self, epoch: int, shard: str, scores: dict[int, dict[str, Any]]) -> None:
+        """
+        Stores `scores` (uid to `{"ss58", "score"}`) for `epoch`, replacing earlier
+        scores of the same uids.
+        """
+        now = time.time()
+        with self._connection() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO scores (epoch, uid, ss58, score, shard, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (epoch, int(uid), data["ss58"], float(data["score"]), shard, now)
+                    for uid, data in scores.items()
+                ],
+            )
+
+    def scores(self, epoch: int) -> dict[str, dict[str, Any]]:
+        """The scores of `epoch`, uid to `{"ss58", "score", "shard"}` like the weights file."""
+        rows = self._connection().execute(
+            "SELECT uid, ss58, score, shard FROM scores WHERE epoch = ? ORDER BY uid", (epoch,)
+        )
+        return {str(uid): {"ss58": ss58, "score": score, "shard": shard} for uid, ss58, score, shard in rows}
+
+    def advance(self, epoch: int, languages: list[str] | None = None) -> int:
+        """
+        Starts the epoch after `epoch` with the prompt `languages`, unless another
+        coordinator already did.
+
+        Returns:
+            The current epoch number.
+        """
+        with self._connection() as connection:
+            connection.execute(
+                "UPDATE epoch SET number = number + 1, started_at = ?, languages = ? WHERE id = 0 AND number = ?",
+                (time.time(), json.dumps(languages) if languages else "", epoch),
+            )
+            connection.execute("DELETE FROM scores WHERE epoch <= ?", (epoch - self.keep_epochs,))
+        return self.current_epoch()[0]
+
+    def close(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+@dataclass
+class Shard:
+    """A worker's place in a sharded validator: its name, the ring and the shared store."""
+
+    name: str
+    ring: ShardRing
+    store: ScoreStore
+
+    def __post_init__(self) -> None:
+        if self.name not in self.ring.shards:
+            raise ValueError(f"Shard {self.name!r} is not one of {self.ring.shards}")
+
+    def owns(self, uid: int | str) -> bool:
+        return self.ring.owner(uid) == self.name
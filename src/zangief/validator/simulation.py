@@ -0,0 +1,406 @@
+import argparse
+import asyncio
+import json
+import math
+import random
+import socket
+import statistics
+import tempfile
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass
+
+import uvicorn
+from communex.module._rate_limiters.limiters import IpLimiterParams
+from communex.module.module import Module, endpoint
+from communex.module.server import ModuleServer
+from loguru import logger
+from substrateinterface import Keypair
+
+SIMULATION_NETUID = 13
+
+# A tiny prompt pool, so simulations need no dataset download.
+SAMPLE_PROMPTS = {
+    "en": [
+        "The city council approved the new budget after a long debate on Tuesday evening.",
+        "Researchers found that regular walks improve sleep quality in older adults.",
+        "The museum will reopen next spring with a larger collection of modern art.",
+        "Heavy rain is expected across the northern region for the rest of the week.",
+        "The company announced that it will hire two hundred engineers this year.",
+        "Local farmers are switching to crops that need less water during the summer.",
+    ],
+    "es": [
+        "El ayuntamiento aprobó el nuevo presupuesto tras un largo debate el martes por la noche.",
+        "Los investigadores descubrieron que caminar a diario mejora el sueño de las personas mayores.",
+        "El museo volverá a abrir la próxima primavera con una colección más amplia de arte moderno.",
+        "Se esperan fuertes lluvias en la región norte durante el resto de la semana.",
+        "La empresa anunció que contratará a doscientos ingenieros este año.",
+        "Los agricultores locales están cambiando a cultivos que necesitan menos agua en verano.",
+    ],
+    "de": [
+        "Der Stadtrat hat den neuen Haushalt nach einer langen Debatte am Dienstagabend beschlossen.",
+        "Forscher fanden heraus, dass regelmäßige Spaziergänge den Schlaf älterer Menschen verbessern.",
+        "Das Museum öffnet im nächsten Frühjahr wieder mit einer größeren Sammlung moderner Kunst.",
+        "Für den Rest der Woche wird im Norden starker Regen erwartet.",
+        "Das Unternehmen kündigte an, in diesem Jahr zweihundert Ingenieure einzustellen.",
+        "Landwirte in der Region stellen auf Pflanzen um, die im Sommer weniger Wasser brauchen.",
+    ],
+    "fr": [
+        "Le conseil municipal a approuvé le nouveau budget après un long débat mardi soir.",
+        "Des chercheurs ont constaté que la marche régulière améliore le sommeil des personnes âgées.",
+        "Le musée rouvrira au printemps prochain avec une collection d'art moderne plus riche.",
+        "De fortes pluies sont attendues dans le nord pour le reste de la semaine.",
+        "L'entreprise a annoncé qu'elle embaucherait deux cents ingénieurs cette année.",
+        "Les agriculteurs locaux se tournent vers des cultures qui demandent moins d'eau en été.",
+    ],
+}
+
+FILLER_WORD = "lorem"
+
+
+@dataclass
+class MinerProfile:
+    """
+    Behaviour of a stand-in miner.
+
+    Attributes:
+        latency: Median seconds to answer.
+        latency_sigma: Spread of the log-normal latency distribution; 0 answers in exactly `latency`.
+        failure_rate: Share of requests that fail with a server error.
+        quality: Share of words the answer keeps; the rest are replaced with filler.
+    """
+
+    latency: float = 0.2
+    latency_sigma: float = 0.5
+    failure_rate: float = 0.0
+    quality: float = 0.9
+
+
+def degrade(text: str, quality: float, rng: random.Random) -> str:
+    return " ".join(word if rng.random() < quality else FILLER_WORD for word in text.split())
+
+
+def answer_quality(source: str, answer: str) -> float:
+    """Share of the source's words the answer kept in place; how `SimulatedReward` scores."""
+    source_words = source.split()
+    answer_words = answer.split()
+    if not source_words:
+        return 0.0
+    kept = sum(1 for source_word, word in zip(source_words, answer_words) if source_word == word)
+    return kept / len(source_words)
+
+
+class StandInMiner(Module):
+    """A miner that answers after a simulated delay with a degraded copy of the prompt."""
+
+    def __init__(self, profile: MinerProfile, seed: int = 0) -> None:
+        super().__init__()
+        self.profile = profile
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+        self.scores: list[float] = []
+
+    def sample_latency(self) -> float:
+        with self.lock:
+            if self.profile.latency_sigma <= 0:
+                return self.profile.latency
+            return self.rng.lognormvariate(math.log(max(self.profile.latency, 1e-6)), self.profile.latency_sigma)
+
+    @endpoint
+    def generate(self, prompt: str, source_language: str, target_language: str) -> dict[str, str]:
+        with self.lock:
+            self.requests += 1
+            failed = self.rng.random() < self.profile.failure_rate
+            answer = degrade(prompt, self.profile.quality, self.rng)
+        time.sleep(self.sample_latency())
+        if failed:
+            with self.lock:
+                self.failures += 1
+            raise RuntimeError("simulated miner failure")
+        return {"answer": answer}
+
+    @endpoint
+    def score(self, bert: float, comet: float, composite: float):
+        with self.lock:
+            self.scores.append(float(composite))
+        return {"answer": True}
+
+
+def free_port(host: str) -> int:
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+class MinerServer:
+    """Serves a stand-in miner over HTTP from a background thread, as a real miner would."""
+
+    def __init__(self, miner: StandInMiner, key: Keypair, host: str = "127.0.0.1") -> None:
+        self.miner = miner
+        self.key = key
+        self.host = host
+        self.port = free_port(host)
+        limiter = IpLimiterParams(bucket_size=10**9, refill_rate=10**9)
+        app = ModuleServer(miner, key, limiter=limiter, subnets_whitelist=None).get_fastapi_app()
+        self.server = uvicorn.Server(uvicorn.Config(app, host=host, port=self.port, log_level="warning"))
+        self.thread = threading.Thread(target=self.server.run, name=f"miner-{self.port}", daemon=True)
+
+    @property
+    def address(self) -> str:
+        return f"{self.host}:{self.port}"
+
+    def start(self, timeout: float = 10) -> None:
+        self.thread.start()
+        deadline = time.monotonic() + timeout
+        while not self.server.started:
+            if time.monotonic() > deadline or not self.thread.is_alive():
+                raise RuntimeError(f"Stand-in miner on {self.address} did not start")
+            time.sleep(0.01)
+
+    def stop(self) -> None:
+        self.server.should_exit = True
+        self.thread.join()
+
+
+class SimulatedChain:
+    """
+    Stands in for `CommuneClient`: serves a fixed metagraph of the validator and
+    the stand-in miners and records weight votes instead of sending them.
+    """
+
+    def __init__(self, validator_key: Keypair, miners: list[MinerServer], netuid: int = SIMULATION_NETUID) -> None:
+        self.url = "sim://chain"
+        self.netuid = netuid
+        self.block = 0
+        self.votes: list[dict] = []
+        # uid 0 is the validator; its dividends keep it out of the miners to query.
+        self.keys = {0: validator_key.ss58_address}
+        self.addresses = {0: "None:None"}
+        self.dividends = {0: 1}
+        for uid, server in enumerate(miners, start=1):
+            self.keys[uid] = server.key.ss58_address
+            self.addresses[uid] = server.address
+            self.dividends[uid] = 0
+
+    def get_block(self, block_hash=None):
+        self.block += 1
+        return {"header": {"number": self.block}}
+
+    def query_map_key(self, netuid: int = 0):
+        return dict(self.keys)
+
+    def query_map_address(self, netuid: int = 0):
+        return dict(self.addresses)
+
+    def query_batch_map(self, functions):
+        zeros = {self.netuid: {uid: 0 for uid in self.keys}}
+        return {
+            "StakeFrom": {},
+            "Keys": dict(self.keys),
+            "Name": {uid: f"sim-{uid}" for uid in self.keys},
+            "Address": dict(self.addresses),
+            "RegistrationBlock": {uid: 0 for uid in self.keys},
+            "ValidatorFeeConfig": {},
+            "Emission": zeros,
+            "Incentive": zeros,
+            "Dividends": {self.netuid: dict(self.dividends)},
+            "LastUpdate": zeros,
+            "Metadata": {},
+        }
+
+    def vote(self, key, uids, weights, netuid=0):
+        self.votes.append({"time": time.perf_counter(), "uids": list(uids), "weights": list(weights)})
+
+
+class SimulatedReward:
+    """
+    A `Reward` stand-in that needs no model download: it scores answers by the
+    share of source words they kept and spends `seconds_per_answer` per valid
+    answer, split between the BERT and COMET stages, to model scorer cost.
+
+    Attributes:
+        busy_seconds: Total time spent in `get_scores`, for scorer utilization.
+    """
+
+    def __init__(self, seconds_per_answer: float = 0.02, metrics=None, profiler=None) -> None:
+        self.seconds_per_answer = seconds_per_answer
+        self.metrics = metrics
+        self.profiler = profiler
+        self.busy_seconds = 0.0
+        self.answers = 0
+
+    @contextmanager
+    def stage(self, name):
+        with (
+            self.profiler.span(name) if self.profiler is not None else nullcontext(),
+            self.metrics.stage(name) if self.metrics is not None else nullcontext(),
+        ):
+            yield
+
+    def release_caches(self):
+        pass
+
+    def get_scores(self, source, target_language, targets):
+        start_time = time.perf_counter()
+        empty_full_score = {'bert': '0.0', 'comet': '0.0', 'composite': '0.0'}
+        with self.stage("language_id"):
+            valid = [isinstance(target, str) and bool(target.strip()) for target in targets]
+        count = sum(valid)
+        with self.stage("bert"):
+            time.sleep(self.seconds_per_answer * count / 2)
+        with self.stage("comet"):
+            time.sleep(self.seconds_per_answer * count / 2)
+
+        scores, full_scores = [], []
+        for target, is_valid in zip(targets, valid):
+            if not is_valid:
+                scores.append(0)
+                full_scores.append(empty_full_score)
+                continue
+            score = answer_quality(source, target)
+            scores.append(score)
+            full_scores.append({'bert': str(score), 'comet': str(score), 'composite': str(score)})
+        self.answers += len(targets)
+        self.busy_seconds += time.perf_counter() - start_time
+        return scores, full_scores
+
+
+def miner_profiles(count: int, args) -> list[MinerProfile]:
+    if args.profiles:
+        with open(args.profiles) as file:
+            profiles = [MinerProfile(**profile) for profile in json.load(file)]
+        return [profiles[i % len(profiles)] for i in range(count)]
+    rng = random.Random(args.seed)
+    return [
+        MinerProfile(
+            latency=args.latency,
+            latency_sigma=args.latency_sigma,
+            failure_rate=args.failure_rate,
+            quality=rng.uniform(*args.quality),
+        )
+        for _ in range(count)
+    ]
+
+
+def run_simulation(
+    profiles: list[MinerProfile],
+    epochs: int = 1,
+    seconds_per_answer: float = 0.02,
+    call_timeout: int = 10,
+    seed: int = 0,
+    max_steps: int = 1000,
+) -> dict:
+    """
+    Runs `epochs` full validator epochs in-process against stand-in miners and a
+    simulated chain, and reports epoch time, query throughput and scorer utilization.
+    """
+    from metrics import ValidatorMetrics
+    from prompt_datasets.local import LocalDataset
+    from validator import TranslateValidator
+
+    random.seed(seed)
+    servers = [
+        MinerServer(StandInMiner(profile, seed=seed + uid), Keypair.create_from_uri(f"//SimMiner{uid}"))
+        for uid, profile in enumerate(profiles, start=1)
+    ]
+    for server in servers:
+        server.start()
+
+    validator_key = Keypair.create_from_uri("//SimValidator")
+    chain = SimulatedChain(validator_key, servers)
+    metrics = ValidatorMetrics()
+    reward = SimulatedReward(seconds_per_answer, metrics=metrics)
+    try:
+        with tempfile.TemporaryDirectory() as data_dir:
+            validator = TranslateValidator(
+                key=validator_key,
+                netuid=chain.netuid,
+                client=chain,
+                call_timeout=call_timeout,
+                metrics=metrics,
+                dataset=LocalDataset(SAMPLE_PROMPTS),
+                reward=reward,
+                data_dir=data_dir,
+            )
+            reward.profiler = validator.profiler
+
+            step_seconds = []
+            epoch_seconds = []
+            start_time = epoch_start = time.perf_counter()
+            while len(chain.votes) < epochs and len(step_seconds) < max_steps:
+                step_start = time.perf_counter()
+                asyncio.run(validator.validate_step(chain.netuid))
+                validator.weight_submitter.join(timeout=call_timeout)
+                step_seconds.append(time.perf_counter() - step_start)
+                if len(chain.votes) > len(epoch_seconds):
+                    epoch_seconds.append(time.perf_counter() - epoch_start)
+                    epoch_start = time.perf_counter()
+            wall = time.perf_counter() - start_time
+            validator.weight_submitter.stop()
+            validator.feedback.join(timeout=call_timeout)
+            validator.feedback.stop()
+    finally:
+        for server in servers:
+            server.stop()
+
+    queries = sum(server.miner.requests for server in servers)
+    return {
+        "miners": len(servers),
+        "epochs": len(epoch_seconds),
+        "steps": len(step_seconds),
+        "wall_seconds": wall,
+        "epoch_seconds_mean": statistics.mean(epoch_seconds) if epoch_seconds else None,
+        "step_seconds_mean": statistics.mean(step_seconds) if step_seconds else None,
+        "queries": queries,
+        "queries_per_second": queries / wall if wall else 0.0,
+        "miner_failures": sum(server.miner.failures for server in servers),
+        "feedback": validator.feedback.stats,
+        "answers_scored": reward.answers,
+        "scorer_utilization": reward.busy_seconds / wall if wall else 0.0,
+        "votes": chain.votes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="run the validator offline against stand-in miners")
+    parser.add_argument("--miners", type=int, default=16, help="number of stand-in miners")
+    parser.add_argument("--epochs", type=int, default=1, help="epochs (weight votes) to run")
+    parser.add_argument("--latency", type=float, default=0.2, help="median miner latency in seconds")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="log-normal spread of miner latency")
+    parser.add_argument("--failure-rate", type=float, default=0.05, help="share of failing miner requests")
+    parser.add_argument("--quality", nargs=2, type=float, default=[0.3, 0.95],
+                        help="range miner answer quality is drawn from")
+    parser.add_argument("--profiles", type=str, default=None,
+                        help="JSON list of miner profiles (latency, latency_sigma, failure_rate, quality)")
+    parser.add_argument("--scoring-seconds", type=float, default=0.02, help="simulated scoring time per answer")
+    parser.add_argument("--call-timeout", type=int, default=10, help="validator timeout for miner calls")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=str, default=None, help="write the report as JSON")
+    args = parser.parse_args()
+
+    profiles = miner_profiles(args.miners, args)
+    logger.info(f"Simulating {len(profiles)} miners: {[asdict(profile) for profile in profiles[:3]]} ...")
+    report = run_simulation(
+        profiles,
+        epochs=args.epochs,
+        seconds_per_answer=args.scoring_seconds,
+        call_timeout=args.call_timeout,
+        seed=args.seed,
+    )
+
+    print(f"{report['epochs']} epochs, {report['steps']} steps in {report['wall_seconds']:.1f}s")
+    if report["epoch_seconds_mean"] is not None:
+        print(f"epoch time: {report['epoch_seconds_mean']:.2f}s mean")
+    print(f"step time: {report['step_seconds_mean']:.2f}s mean")
+    print(f"queries: {report['queries']} ({report['queries_per_second']:.1f}/s), {report['miner_failures']} failed")
+    print(f"scorer utilization: {report['scorer_utilization']:.0%} ({report['answers_scored']} answers)")
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=4)
+
+
+if __name__ == "__main__":
+    main()
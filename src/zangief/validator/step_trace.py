@@ -0,0 +1,94 @@
+import gzip
+import json
+import threading
+import time
+import zlib
+from typing import Any, Iterator
+
+from loguru import logger
+
+TRACE_VERSION = 1
+
+
+class TraceRecorder:
+    """
+    Records validation steps to an append-only, gzip-compressed JSON Lines file
+    for offline replay.
+
+    A `step` record holds the prompt, its languages, every queried miner's answer,
+    latency and call status, and the component scores of each answer. A `vote`
+    record holds the epoch's scores and the weights computed from them. Each record
+    is flushed as it is written, so a crash loses at most the record in progress;
+    reopening the file appends a new gzip member, which readers handle transparently.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file = gzip.open(path, "at", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._calls: dict[str, dict[str, Any]] = {}
+        self._step: dict[str, Any] | None = None
+        logger.info(f"Recording validation steps to {path}")
+
+    def write(self, record: dict[str, Any]) -> None:
+        record = {"version": TRACE_VERSION, "time": time.time(), **record}
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def begin_step(self, prompt: str, source_language: str, target_language: str) -> None:
+        self._calls = {}
+        self._step = {
+            "prompt": prompt,
+            "source_language": source_language,
+            "target_language": target_language,
+        }
+
+    def observe_miner(self, uid, seconds: float, status: str) -> None:
+        # Called from the fan-out threads; each uid is written by one thread only.
+        self._calls[str(uid)] = {"latency": round(seconds, 4), "status": status}
+
+    def end_step(self, miners: list[dict[str, Any]], answers: list[str], full_scores: list[dict[str, str]]) -> None:
+        if self._step is None:
+            return
+        records = []
+        for miner, answer, full_score in zip(miners, answers, full_scores):
+            uid = str(miner["uid"])
+            call = self._calls.get(uid, {})
+            records.append({
+                "uid": uid,
+                "key": miner["key"],
+                "answer": answer,
+                "latency": call.get("latency"),
+                "status": call.get("status"),
+                "scores": {name: float(value) for name, value in full_score.items()},
+            })
+        self.write({"type": "step", **self._step, "miners": records})
+        self._step = None
+
+    def record_vote(self, scores: dict[str, float], uids: list[int], weights: list[int], own_uid=None) -> None:
+        self.write({
+            "type": "vote",
+            "own_uid": own_uid,
+            "scores": scores,
+            "uids": uids,
+            "weights": weights,
+        })
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+def read_trace(path: str) -> Iterator[dict[str, Any]]:
+    """Yields the records of a trace, stopping quietly at a record cut short by a crash."""
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        try:
+            for line in file:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping a truncated record in {path}")
+        except (EOFError, zlib.error, gzip.BadGzipFile):
+            logger.warning(f"Trace {path} ends with an incomplete gzip member")
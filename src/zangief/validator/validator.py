@@ -1,30 +1,41 @@
 import os
 import asyncio
-import concurrent.futures
 import re
+import signal
 import time
-from functools import partial
 import numpy as np
 import random
 import argparse
-from typing import cast, Any, Dict
+from typing import Any, Dict
 
 from communex.client import CommuneClient
-from communex.module.client import ModuleClient
-from communex._common import get_node_url
+from communex.errors import NetworkTimeoutError
+from communex._common import ComxSettings
 from communex.compat.key import classic_load_key
 from communex.module.module import Module
 from communex.types import Ss58Address
-from communex.misc import get_map_modules
 
 from substrateinterface import Keypair
 
 from loguru import logger
 
 from weights_io import ensure_weights_file, write_weight_file, read_weight_file
-from power_scaling import conditional_power_scaling
+from memory_monitor import HARD, MemoryMonitor
+from metagraph import get_miner_ip_port
+from checkpoint import EpochCheckpoint, validate_scores
+from feedback import FeedbackDispatcher
+from limits import is_oversized
+from metrics import ValidatorMetrics
+from module_session import ModuleSession, ResponseTooLarge
+from node_pool import NodePool, WeightSubmitter
+from profiling import Profiler
+from power_scaling import compute_weights
+from sharding import ScoreStore, Shard, ShardRing
+from coordinator import ShardCoordinator
 from reward import Reward
-from prompt_datasets.cc_100 import CC100
+from step_trace import TraceRecorder
+from prompt_datasets.base_dataset import BaseDataset
+from prompt_datasets.cc_100 import CC100, sample_languages
 
 from zangief.config.validator import ValidatorConfig
 
@@ -40,24 +51,6 @@ def extract_address(string: str):
     return re.search(IP_REGEX, string)
 
 
-def get_miner_ip_port(client: CommuneClient, netuid: int, balances=False):
-    modules = cast(dict[str, Any], get_map_modules(
-        client, netuid=netuid, include_balances=balances))
-
-    # Convert the values to a human readable format
-    modules_to_list = [value for _, value in modules.items()]
-
-    miners: list[Any] = []
-
-    for module in modules_to_list:
-        if module["incentive"] == module["dividends"] == 0:
-            miners.append(module)
-        elif module["incentive"] > module["dividends"]:
-            miners.append(module)
-
-    return miners
-
-
 def get_ip_port(modules_adresses: dict[int, str]):
     """
     Get the IP and port information from module addresses.
@@ -84,29 +77,30 @@ def get_netuid(is_testnet):
         return 13
 
 
-def normalize_scores(scores):
-    min_score = min(scores)
-    max_score = max(scores)
-
-    if min_score == max_score:
-        # If all scores are the same, give all ones
-        return [1] * len(scores)
-
-    # Normalize scores from 0 to 1
-    normalized_scores = [(score - min_score) / (max_score - min_score) for score in scores]
-
-    return normalized_scores
-
-
 class TranslateValidator(Module):
     """
     A class for validating text generated by modules in a subnet.
 
     Attributes:
         client: The CommuneClient instance used to interact with the subnet.
+        node_pool: The chain nodes queries are routed to; defaults to a pool of `client` alone.
+        weight_submitter: Sends weight votes in the background with retries.
         key: The keypair used for authentication.
         netuid: The unique identifier of the subnet.
         call_timeout: The timeout value for module calls in seconds (default: 60).
+        dataset: The prompt dataset; defaults to CC-100.
+        reward: The scorer of miner answers; defaults to BERTScore and COMET.
+        data_dir: Directory of the weights file; defaults to ~/.commune/zangief.
+        recorder: Records every step and vote for offline replay, when set.
+        feedback_timeout: Deadline in seconds of each score notification to a miner.
+        checkpoint_max_age: Seconds after its start within which an interrupted epoch is resumed; 0 never resumes.
+        max_response_bytes: Largest miner reply read from the network; longer replies score zero.
+        max_answer_ratio: Answers longer than this many times the prompt (plus a small slack) score zero.
+        shard: Makes this validator a worker of a sharded validator, when set: it only queries the miners
+            of its shard, shares their scores in the shard store and leaves voting to the coordinator.
+        metrics: Prometheus metrics of the validation steps.
+        profiler: Opt-in span tracing and profiler captures of the validation steps.
+        memory_monitor: RSS tracking and memory budgets of the validation loop.
 
     Methods:
         get_modules: Retrieve all module addresses from the subnet.
@@ -124,31 +118,144 @@ class TranslateValidator(Module):
         client: CommuneClient,
         call_timeout: int = 30,
         use_testnet: bool = False,
+        metrics: ValidatorMetrics | None = None,
+        profiler: Profiler | None = None,
+        memory_monitor: MemoryMonitor | None = None,
+        node_pool: NodePool | None = None,
+        dataset: BaseDataset | None = None,
+        reward: Reward | None = None,
+        data_dir: str | None = None,
+        recorder: TraceRecorder | None = None,
+        feedback_timeout: float = 3,
+        checkpoint_max_age: float = 7200,
+        max_response_bytes: int = 65536,
+        max_answer_ratio: float = 4,
+        shard: Shard | None = None,
     ) -> None:
         super().__init__()
-        self.client = client
+        self.metrics = metrics or ValidatorMetrics()
+        self.profiler = profiler or Profiler()
+        self.memory_monitor = memory_monitor or MemoryMonitor()
+        self.recorder = recorder
+        self.shard = shard
+        self.shard_epoch = None
+        self.node_pool = node_pool or NodePool.for_client(client)
         self.key = key
         self.netuid = netuid
+        self.weight_submitter = WeightSubmitter(
+            self.node_pool, key, netuid, on_success=self.metrics.observe_vote
+        )
         self.call_timeout = call_timeout
+        self.max_response_bytes = max_response_bytes
+        self.max_answer_ratio = max_answer_ratio
+        self.feedback = FeedbackDispatcher(key, timeout=feedback_timeout, metrics=self.metrics)
         self.use_testnet = use_testnet
         self.uid = None
-        home_dir = os.path.expanduser("~")
-        commune_dir = os.path.join(home_dir, ".commune")
-        self.zangief_dir = os.path.join(commune_dir, "zangief")
+        if data_dir is None:
+            home_dir = os.path.expanduser("~")
+            commune_dir = os.path.join(home_dir, ".commune")
+            data_dir = os.path.join(commune_dir, "zangief")
+        self.zangief_dir = data_dir
         self.weights_file = os.path.join(self.zangief_dir, "weights.json")
         ensure_weights_file(zangief_dir_name=self.zangief_dir, weights_file_name=self.weights_file)
-        write_weight_file(self.weights_file, {})
+        self.checkpoint = EpochCheckpoint(os.path.join(self.zangief_dir, "epoch.json"), max_age=checkpoint_max_age)
 
-        self.reward = Reward()
+        self.reward = reward or Reward(metrics=self.metrics, profiler=self.profiler)
+        self.dataset = dataset
         self.languages = []
         self.datasets = {}
-        self.load_languages()
+        if self.shard is not None:
+            self.sync_shard_epoch()
+        else:
+            languages = self.resume_epoch()
+            if languages:
+                self.load_languages(languages)
+            else:
+                self.start_epoch()
+
+        self.memory_monitor.add_trimmer("torch", self.reward.release_caches)
+        self.memory_monitor.add_trimmer("prompt_pool", lambda: self.dataset.trim(0.5), level=HARD)
+
+    def resume_epoch(self) -> list[str] | None:
+        """
+        Resumes the epoch interrupted by a restart, if its checkpoint is recent enough.
+
+        Scores of miners that were deregistered or whose uid changed hands since are
+        dropped, so only miners still registered under the same key are skipped.
+
+        Returns:
+            The languages of the resumed epoch, or None to start a new epoch.
+        """
+        state = self.checkpoint.load(self.netuid)
+        if state is None:
+            return None
+
+        scores = read_weight_file(self.weights_file)
+        try:
+            registered = self.node_pool.call(lambda client: client.query_map_key(self.netuid))
+        except Exception as e:
+            # Keys are checked again against the metagraph in every step.
+            logger.warning(f"Could not check the resumed scores against the metagraph: {e}")
+        else:
+            valid_scores = validate_scores(scores, {str(uid): ss58 for uid, ss58 in registered.items()})
+            if len(valid_scores) != len(scores):
+                logger.info(f"Dropping {len(scores) - len(valid_scores)} scores of miners no longer registered")
+                write_weight_file(self.weights_file, valid_scores)
+            scores = valid_scores
+
+        logger.info(
+            f"Resuming the epoch started at block {state['start_block']} with {len(scores)} miners already scored"
+        )
+        return state["languages"]
+
+    def start_epoch(self, languages: list[str] | None = None) -> None:
+        """Clears the scores, selects new (or the given) languages and checkpoints the new epoch."""
+        with self.metrics.stage("weights_io"):
+            write_weight_file(self.weights_file, {})
+        self.load_languages(languages)
+        try:
+            start_block = self.node_pool.call(lambda client: client.get_block())["header"]["number"]
+        except Exception as e:
+            logger.warning(f"Could not read the epoch's start block: {e}")
+            start_block = None
+        with self.metrics.stage("weights_io"):
+            self.checkpoint.save(self.netuid, self.languages, start_block)
 
-    def load_languages(self):
-        cc_100 = CC100()
-        self.languages = cc_100.selected_languages
+    def sync_shard_epoch(self) -> None:
+        """
+        Follows the epoch of the shard store; a worker starts a new epoch, in the
+        languages stored with it, when the coordinator has voted.
+
+        The store's scores of this shard replace the weights file, so a restarted
+        worker continues the shared epoch instead of its own checkpoint.
+        """
+        epoch, _ = self.shard.store.current_epoch()
+        if epoch == self.shard_epoch:
+            return
+        epoch, languages = self.shard.store.epoch_languages(sample_languages)
+        if self.shard_epoch is not None:
+            logger.info(f"The coordinator voted; starting shard epoch {epoch}")
+            self.start_epoch(languages)
+        else:
+            self.load_languages(languages)
+        scores = {
+            uid: {"ss58": data["ss58"], "score": data["score"]}
+            for uid, data in self.shard.store.scores(epoch).items()
+            if self.shard.owns(uid)
+        }
+        with self.metrics.stage("weights_io"):
+            write_weight_file(self.weights_file, scores)
+        self.shard_epoch = epoch
+
+    def load_languages(self, languages: list[str] | None = None):
+        # Reuse the buffers of languages that stay selected instead of reloading all of them.
+        if self.dataset is None:
+            self.dataset = CC100(languages=languages)
+        else:
+            self.dataset.select_languages(languages=languages)
+        self.languages = self.dataset.selected_languages
         self.datasets = {
-            l: [cc_100] for
+            l: [self.dataset] for
             l in self.languages
         }
 
@@ -181,8 +288,9 @@ class TranslateValidator(Module):
         else:
             return None, None
 
-    def _get_miner_prediction(
+    async def _get_miner_prediction(
         self,
+        session: ModuleSession,
         prompt: str,
         miner_info: tuple[list[str], Ss58Address],
     ) -> str | None:
@@ -190,6 +298,7 @@ class TranslateValidator(Module):
         Prompt a miner module to generate an answer to the given question.
 
         Args:
+            session: The step's shared session the call is made over.
             question: The question to ask the miner module.
             miner_info: A tuple containing the miner's connection information and key.
 
@@ -204,52 +313,46 @@ class TranslateValidator(Module):
         if module_ip == "None" or module_port == "None" or module_ip is None or module_port is None:
             return ""
 
-        client = ModuleClient(module_ip, int(module_port), self.key)
-
+        start_time = time.perf_counter()
+        status = "error"
         try:
-            miner_answer = asyncio.run(
-                client.call(
-                    "generate",
-                    miner_key,
-                    {"prompt": question, "source_language": source_language, "target_language": target_language},
-                    timeout=self.call_timeout,
-                )
+            miner_answer = await session.call(
+                module_ip,
+                int(module_port),
+                "generate",
+                miner_key,
+                {"prompt": question, "source_language": source_language, "target_language": target_language},
+                timeout=self.call_timeout,
+                max_bytes=self.max_response_bytes,
             )
             miner_answer = miner_answer["answer"]
+            if is_oversized(question, miner_answer, self.max_answer_ratio):
+                # Scored zero before the answer reaches language id or the models.
+                status = "oversize"
+                logger.warning(f"Miner {miner_info['uid']} answered {len(miner_answer)} characters; discarding")
+                return None
+            status = "ok" if miner_answer else "empty"
             return miner_answer
-        except Exception as e:
+        except ResponseTooLarge as e:
+            status = "oversize"
+            logger.warning(f"Miner {miner_info['uid']} sent an oversized response: {e}")
+            return None
+        except NetworkTimeoutError as e:
+            status = "timeout"
             logger.error(f"Error getting miner response: {e}")
             return ""
-
-    def _return_miner_scores(
-        self,
-        score: Dict[str, float],
-        miner_info: tuple[list[str], Ss58Address],
-    ):
-        connection = miner_info['address']
-        miner_key = miner_info['key']
-        module_ip, module_port = self.split_ip_port(connection)
-
-        if module_ip == "None" or module_port == "None" or module_ip is None or module_port is None:
-            return False
-
-        client = ModuleClient(module_ip, int(module_port), self.key)
-
-        try:
-            send_miner_score = asyncio.run(
-                client.call(
-                    "score",
-                    miner_key,
-                    score,
-                    timeout=10
-                )
-            )
-            return send_miner_score['answer']
         except Exception as e:
-            return False
+            logger.error(f"Error getting miner response: {e}")
+            return ""
+        finally:
+            seconds = time.perf_counter() - start_time
+            self.metrics.observe_miner(miner_info['uid'], seconds, status)
+            if self.recorder is not None:
+                self.recorder.observe_miner(miner_info['uid'], seconds, status)
 
     def get_miners_to_query(self, miners: list[dict[str, Any]]):
-        current_weights = read_weight_file(self.weights_file)
+        with self.metrics.stage("weights_io"):
+            current_weights = read_weight_file(self.weights_file)
         miners_to_query = []
         excluded_uids = set()
         counter = 0
@@ -319,9 +422,9 @@ class TranslateValidator(Module):
             netuid: The network UID of the subnet.
         """
 
-        miners = get_miner_ip_port(self.client, self.netuid)
-
-        modules_keys = self.client.query_map_key(netuid)
+        with self.profiler.span("metagraph"), self.metrics.stage("chain"):
+            miners = self.node_pool.call(lambda client: get_miner_ip_port(client, self.netuid))
+            modules_keys = self.node_pool.call(lambda client: client.query_map_key(netuid))
         val_ss58 = self.key.ss58_address
         if val_ss58 not in modules_keys.values():
             logger.error(f"Validator key {val_ss58} is not registered in subnet")
@@ -331,9 +434,18 @@ class TranslateValidator(Module):
             if ss58.__str__() == val_ss58:
                 self.uid = uid
 
-        remaining_miners, miners_to_query = self.get_miners_to_query(miners)
+        if self.shard is not None:
+            self.sync_shard_epoch()
+            miners = [miner for miner in miners if self.shard.owns(miner['uid'])]
 
-        miner_prompt, source_language, target_language = self.get_miner_prompt()
+        with self.profiler.span("prompt"):
+            remaining_miners, miners_to_query = self.get_miners_to_query(miners)
+            if not miners_to_query and self.shard is not None:
+                logger.info(f"Shard {self.shard.name} is scored; waiting for the coordinator to vote")
+                return None
+            miner_prompt, source_language, target_language = self.get_miner_prompt()
+        if self.recorder is not None:
+            self.recorder.begin_step(miner_prompt, source_language, target_language)
 
         logger.debug("Source")
         logger.debug(source_language)
@@ -343,22 +455,32 @@ class TranslateValidator(Module):
         logger.debug(miner_prompt)
 
         prompt = (miner_prompt, source_language, target_language)
-        logger.debug("Creating miner prediction partial...")
-        get_miner_prediction = partial(self._get_miner_prediction, prompt)
 
         logger.debug("Prompting miners...")
-        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
-            it = executor.map(get_miner_prediction, miners_to_query)
-            miner_answers = [*it]
-
-        scores, full_scores = self.reward.get_scores(miner_prompt, target_language, miner_answers)
-
-        for i, full_score in enumerate(full_scores):
-            send_miner_score = partial(self._return_miner_scores, full_score)
-
-            with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
-                rs = executor.map(send_miner_score, [miners_to_query[i]])
-                successes = [*rs]
+        with self.profiler.span("fan-out"), self.metrics.stage("miners"):
+            # One pooled session for the whole step, sized so no call waits on a
+            # connection slot (the wait would count against its timeout).
+            session = ModuleSession(self.key, limit=max(len(miners_to_query), 1))
+            try:
+                miner_answers = await asyncio.gather(
+                    *(self._get_miner_prediction(session, prompt, miner_info) for miner_info in miners_to_query)
+                )
+            finally:
+                await session.close()
+        self.memory_monitor.mark("fan-out")
+
+        scoring_start = time.perf_counter()
+        with self.profiler.span("score"):
+            scores, full_scores = self.reward.get_scores(miner_prompt, target_language, miner_answers)
+        self.metrics.observe_scoring(len(miner_answers), time.perf_counter() - scoring_start)
+        self.memory_monitor.mark("score")
+        if self.recorder is not None:
+            self.recorder.end_step(miners_to_query, miner_answers, full_scores)
+
+        # Delivered in the background; the next step never waits on miners receiving their scores.
+        with self.profiler.span("feedback"), self.metrics.stage("feedback"):
+            for miner_info, full_score in zip(miners_to_query, full_scores):
+                self.feedback.submit(miner_info, full_score)
 
         logger.debug("Miner prompt")
         logger.debug(miner_prompt)
@@ -379,12 +501,15 @@ class TranslateValidator(Module):
             score = score_dict[uid]
             data_to_write[uid] = {"ss58": ss58, "score": score}
 
-        current_weights = read_weight_file(self.weights_file)
-        for key, data in data_to_write.items():
-            current_weights[key] = data
+        with self.profiler.span("persist"), self.metrics.stage("weights_io"):
+            current_weights = read_weight_file(self.weights_file)
+            for key, data in data_to_write.items():
+                current_weights[key] = data
 
-        write_weight_file(self.weights_file, current_weights)
-        ddd = read_weight_file(self.weights_file)
+            write_weight_file(self.weights_file, current_weights)
+            if self.shard is not None:
+                self.shard.store.put_scores(self.shard_epoch, self.shard.name, data_to_write)
+            ddd = read_weight_file(self.weights_file)
         logger.info(f"READ DATA: {ddd}")
 
         logger.info("Miner UIDs")
@@ -392,22 +517,27 @@ class TranslateValidator(Module):
         logger.info("Final scores")
         logger.info(scores)
 
-        if len(remaining_miners) == 0:
-            scores = read_weight_file(self.weights_file)
+        if len(remaining_miners) == 0 and self.shard is not None:
+            logger.info(f"Shard {self.shard.name} is scored; waiting for the coordinator to vote")
+        elif len(remaining_miners) == 0:
+            with self.profiler.span("persist"), self.metrics.stage("weights_io"):
+                scores = read_weight_file(self.weights_file)
 
             s_dict: dict[int: float] = {}
             for uid, data in scores.items():
                 s_dict[uid] = data['score']
 
             logger.info("SETTING WEIGHTS")
-            self.set_weights(s_dict)
-            write_weight_file(self.weights_file, {})
-            self.load_languages()
+            with self.profiler.span("vote"), self.metrics.stage("vote"):
+                self.set_weights(s_dict)
+            self.start_epoch()
 
     def validation_loop(self, interval: int = 20) -> None:
         while True:
             logger.info("Begin validator step ... ")
-            asyncio.run(self.validate_step(self.netuid))
+            with self.metrics.step(), self.profiler.step():
+                asyncio.run(self.validate_step(self.netuid))
+            self.metrics.rss_bytes.set(self.memory_monitor.end_step())
             logger.info(f"Sleeping for {interval} seconds ... ")
             time.sleep(interval)
 
@@ -415,47 +545,22 @@ class TranslateValidator(Module):
         """
         Set weights for miners based on their normalized and power scaled scores.
         """
-        full_score_dict = s_dict
-        weighted_scores: dict[int: float] = {}
-
-        abnormal_scores = full_score_dict.values()
-        normal_scores = normalize_scores(abnormal_scores)
-        score_dict = {uid: score for uid, score in zip(full_score_dict.keys(), normal_scores)}
-        power_scaled_scores = conditional_power_scaling(score_dict)
-        scores = sum(power_scaled_scores.values())
-
-        for uid, score in power_scaled_scores.items():
-            weight = score * 1000 / scores
-            weighted_scores[uid] = weight
-
-        weighted_scores = {k: v for k, v in zip(
-            weighted_scores.keys(), normalize_scores(weighted_scores.values())) if v != 0}
-
-        if self.uid is not None and str(self.uid) in weighted_scores:
-            del weighted_scores[str(self.uid)]
+        intuids, intweights = compute_weights(s_dict, own_uid=self.uid)
+        if self.uid is not None and str(self.uid) in s_dict:
             logger.info(f"REMOVING UID !!!!!! {self.uid}")
         else:
             logger.info("NOT REMOVING ANY UID")
 
-        uids = list(weighted_scores.keys())
-        intuids = [eval(i) for i in uids]
-        weights = list(weighted_scores.values())
-        intweights = [int(weight * 1000) for weight in weights]
-
         logger.info("**********************************")
         logger.info(f"UIDS: {intuids}")
         logger.info(f"WEIGHTS TO SET: {intweights}")
         logger.info("**********************************")
 
-        try:
-            self.client.vote(key=self.key, uids=intuids, weights=intweights, netuid=self.netuid)
-        except Exception as e:
-            logger.error(f"WARNING: Failed to set weights with exception: {e}. Will retry.")
-            sleepy_time = random.uniform(1, 2)
-            time.sleep(sleepy_time)
-            # retry with a different node
-            self.client = CommuneClient(get_node_url(use_testnet=self.use_testnet))
-            self.client.vote(key=self.key, uids=intuids, weights=intweights, netuid=self.netuid)
+        if self.recorder is not None:
+            self.recorder.record_vote(s_dict, intuids, intweights, own_uid=self.uid)
+
+        # Sent in the background with retries across nodes, so the next step does not wait on the chain.
+        self.weight_submitter.submit(intuids, intweights)
 
 
 if __name__ == '__main__':
@@ -475,6 +580,29 @@ if __name__ == '__main__':
     call_timeout = validator_config.get_validator_call_timeout()
     interval = validator_config.get_validator_interval()
     key_password = validator_config.get_key_password()
+    metrics_port = validator_config.get_validator_metrics_port()
+    metrics_host = validator_config.get_validator_metrics_host()
+    trace_path = validator_config.get_validator_trace_path()
+    feedback_timeout = validator_config.get_validator_feedback_timeout()
+    checkpoint_max_age = validator_config.get_validator_checkpoint_max_age()
+    max_response_bytes = validator_config.get_validator_max_response_bytes()
+    max_answer_ratio = validator_config.get_validator_max_answer_ratio()
+    node_urls = validator_config.get_validator_node_urls()
+    if not node_urls:
+        comx_settings = ComxSettings()
+        node_urls = comx_settings.TESTNET_NODE_URLS if testnet else comx_settings.NODE_URLS
+    memory_monitor = MemoryMonitor(
+        soft_limit_mb=validator_config.get_validator_memory_soft_limit_mb(),
+        hard_limit_mb=validator_config.get_validator_memory_hard_limit_mb(),
+        interval=validator_config.get_validator_memory_interval(),
+        tracemalloc_frames=validator_config.get_validator_tracemalloc_frames(),
+    )
+    profile_steps = validator_config.get_validator_profile_steps()
+    profiler = Profiler(
+        enabled=validator_config.get_validator_profile(),
+        profiler=validator_config.get_validator_profiler(),
+        output_dir=validator_config.get_validator_profile_dir(),
+    )
 
     if key_password is not None:
         key = classic_load_key(keyname, password=key_password)
@@ -486,12 +614,57 @@ if __name__ == '__main__':
     else:
         logger.info("Connecting to Main network ... ")
 
+    node_pool = NodePool(node_urls, probe_interval=validator_config.get_validator_node_probe_interval())
+    node_pool.start()
+
+    metrics = ValidatorMetrics()
+    if metrics_port is not None:
+        metrics.serve(metrics_port, metrics_host)
+
+    role = validator_config.get_validator_role()
+    shard = None
+    data_dir = None
+    if role != "standalone":
+        store = ScoreStore(os.path.expanduser(validator_config.get_validator_shard_store()))
+        if role == "coordinator":
+            logger.info("Running shard coordinator ... ")
+            coordinator = ShardCoordinator(
+                key, netuid, node_pool, store,
+                epoch_deadline=validator_config.get_validator_epoch_deadline(),
+                metrics=metrics,
+                sample_languages=sample_languages,
+            )
+            coordinator.run(interval=interval)
+        shard = Shard(
+            validator_config.get_validator_shard(),
+            ShardRing(validator_config.get_validator_shards()),
+            store,
+        )
+        data_dir = os.path.join(os.path.expanduser("~"), ".commune", "zangief", "shards", shard.name)
+
+    if profile_steps:
+        profiler.request_capture(profile_steps)
+    if hasattr(signal, "SIGUSR1"):
+        # `kill -USR1 <pid>` profiles the next steps of a running validator.
+        signal.signal(signal.SIGUSR1, lambda *_: profiler.request_capture(profile_steps or 5))
+
     validator = TranslateValidator(
         key=key,
         netuid=netuid,
-        client=CommuneClient(get_node_url(use_testnet=testnet)),
+        client=node_pool.client(),
         call_timeout=call_timeout,
-        use_testnet=testnet
+        use_testnet=testnet,
+        metrics=metrics,
+        profiler=profiler,
+        memory_monitor=memory_monitor,
+        node_pool=node_pool,
+        feedback_timeout=feedback_timeout,
+        checkpoint_max_age=checkpoint_max_age,
+        max_response_bytes=max_response_bytes,
+        max_answer_ratio=max_answer_ratio,
+        data_dir=data_dir,
+        recorder=TraceRecorder(os.path.expanduser(trace_path)) if trace_path else None,
+        shard=shard,
     )
 
     logger.info("Running validator ... ")
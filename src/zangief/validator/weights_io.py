@@ -2,6 +2,7 @@ from loguru import logger
 from typing import Any
 import os 
 import json
+import tempfile
 
 def ensure_weights_file(zangief_dir_name, weights_file_name):
     if not os.path.exists(zangief_dir_name):
@@ -14,6 +15,24 @@ def ensure_weights_file(zangief_dir_name, weights_file_name):
         logger.info(f"Created file: {weights_file_name}")
 
 
+def write_json_atomic(path, data, indent=None):
+    """
+    Writes `data` as JSON to `path` through a temporary file that replaces it, so a
+    crash mid-write leaves either the old or the new content, never a partial file.
+    """
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, 'w') as file:
+            json.dump(data, file, indent=indent)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
 def write_weight_file(weights_file, modules_info: dict[int, dict[str, Any]]):
     """
     Writes the modules and their scores to the weights.json file. Each module
@@ -24,8 +43,7 @@ def write_weight_file(weights_file, modules_info: dict[int, dict[str, Any]]):
     """
 
     # Write the JSON structure to the file
-    with open(weights_file, 'w') as file:
-        json.dump(modules_info, file, indent=4)
+    write_json_atomic(weights_file, modules_info, indent=4)
 
 def read_weight_file(weights_file):
     """
@@ -37,7 +55,11 @@ def read_weight_file(weights_file):
     if not os.path.exists(weights_file):
         return {}
 
-    with open(weights_file, 'r') as file:
-        data = json.load(file)
+    try:
+        with open(weights_file, 'r') as file:
+            data = json.load(file)
+    except json.JSONDecodeError as e:
+        logger.error(f"Discarding unreadable weights file {weights_file}: {e}")
+        return {}
 
     return data
\ No newline at end of file
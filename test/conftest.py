@@ -0,0 +1,18 @@
+import os
+import sys
+
+SRC = os.path.join(os.path.dirname(__file__), "..", "src")
+
+# Miner and validator modules run as scripts from their directory and import
+# their siblings by bare name (`from weights_io import ...`), so both directories
+# must be importable next to `src`. The miner comes first: both have a `metrics`
+# and a `config` module, and the validator only imports its `metrics` by bare
+# name from `validator.py`, which needs the scoring models and is not tested here.
+for path in (
+    os.path.join(SRC, "zangief", "validator"),
+    os.path.join(SRC, "zangief", "miner"),
+    SRC,
+):
+    path = os.path.abspath(path)
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,169 @@
+import asyncio
+
+from communex.module import _protocol
+from substrateinterface import Keypair
+
+from zangief.miner.admission import (
+    AdmissionController,
+    AdmissionMiddleware,
+    CallerDirectory,
+    PRIORITY_ANONYMOUS,
+    PRIORITY_REGISTERED,
+)
+
+
+def signed_request(key: Keypair, **changes):
+    body, headers = _protocol.create_request_data(key, "5target", {"prompt": "hi"})
+    headers = {name.lower(): value for name, value in headers.items()}
+    headers.update(changes)
+    scope = {
+        "type": "http",
+        "path": "/method/generate",
+        "headers": [(name.encode(), value.encode()) for name, value in headers.items()],
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return scope, receive, body
+
+
+def test_requests_run_immediately_when_idle():
+    async def run():
+        controller = AdmissionController(max_concurrency=2, max_queue=4, deadline=10)
+        assert await controller.acquire()
+        assert await controller.acquire()
+        assert controller.active == 2
+        controller.release(0.5)
+        assert controller.active == 1
+
+    asyncio.run(run())
+
+
+def test_registered_callers_are_served_first():
+    async def run():
+        controller = AdmissionController(max_concurrency=1, max_queue=4, deadline=10, initial_service_time=0.1)
+        assert await controller.acquire()
+        order = []
+
+        async def wait(name, priority):
+            if await controller.acquire(priority):
+                order.append(name)
+
+        anonymous = asyncio.create_task(wait("anonymous", PRIORITY_ANONYMOUS))
+        await asyncio.sleep(0)
+        registered = asyncio.create_task(wait("registered", PRIORITY_REGISTERED))
+        await asyncio.sleep(0)
+
+        controller.release()
+        await asyncio.sleep(0)
+        controller.release()
+        await asyncio.gather(anonymous, registered)
+        assert order == ["registered", "anonymous"]
+
+    asyncio.run(run())
+
+
+def test_requests_that_would_miss_the_deadline_are_rejected():
+    async def run():
+        controller = AdmissionController(max_concurrency=1, max_queue=10, deadline=5, initial_service_time=3)
+        assert await controller.acquire()
+        assert not await controller.acquire()
+        assert controller.rejected == 1
+
+    asyncio.run(run())
+
+
+def test_full_queue_sheds_lower_priority_waiters():
+    async def run():
+        controller = AdmissionController(max_concurrency=1, max_queue=1, deadline=10, initial_service_time=0.1)
+        assert await controller.acquire()
+        anonymous = asyncio.create_task(controller.acquire(PRIORITY_ANONYMOUS))
+        await asyncio.sleep(0)
+        registered = asyncio.create_task(controller.acquire(PRIORITY_REGISTERED))
+        await asyncio.sleep(0)
+
+        assert await anonymous is False
+        controller.release()
+        assert await registered is True
+
+    asyncio.run(run())
+
+
+def test_middleware_replies_busy_when_shedding():
+    async def run():
+        async def app(scope, receive, send):
+            await asyncio.sleep(0.05)
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"{}"})
+
+        directory = CallerDirectory(priority_keys=["0xABCD"])
+        controller = AdmissionController(max_concurrency=1, max_queue=0, deadline=10, initial_service_time=0.01)
+        middleware = AdmissionMiddleware(app, controller, directory)
+        scope = {"type": "http", "path": "/method/generate", "headers": []}
+
+        async def call():
+            messages = []
+
+            async def send(message):
+                messages.append(message)
+            await middleware(scope, None, send)
+            return messages[0]["status"]
+
+        statuses = await asyncio.gather(call(), call())
+        assert sorted(statuses) == [200, 503]
+        assert directory.priority("abcd") == PRIORITY_REGISTERED
+        assert directory.priority(None) == PRIORITY_ANONYMOUS
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_requests_run_immediately_when_idle()
+    test_registered_callers_are_served_first()
+    test_requests_that_would_miss_the_deadline_are_rejected()
+    test_full_queue_sheds_lower_priority_waiters()
+    test_middleware_replies_busy_when_shedding()
+
+
+def test_priority_needs_a_valid_signature(monkeypatch):
+    async def run():
+        validator = Keypair.create_from_uri("//Alice")
+        intruder = Keypair.create_from_uri("//Mallory")
+        seen = []
+
+        async def app(scope, receive, send):
+            seen.append((await receive())["body"])
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"{}"})
+
+        directory = CallerDirectory(priority_keys=[validator.ss58_address])
+        controller = AdmissionController(max_concurrency=1, max_queue=4, deadline=10)
+        middleware = AdmissionMiddleware(app, controller, directory)
+        priorities = []
+        acquire = controller.acquire
+
+        async def recording_acquire(priority):
+            priorities.append(priority)
+            return await acquire(priority)
+        controller.acquire = recording_acquire
+
+        async def send(message):
+            pass
+
+        scope, receive, body = signed_request(validator)
+        await middleware(scope, receive, send)
+        # The body read to check the signature is passed on to the module server.
+        assert seen == [body]
+
+        # The validator's key on a request signed by someone else.
+        scope, receive, _ = signed_request(intruder, **{"x-key": validator.public_key.hex()})
+        await middleware(scope, receive, send)
+        # A validly signed request replayed long after it was made.
+        monkeypatch.setattr(_protocol, "iso_timestamp_now", lambda: "2020-01-01T00:00:00+00:00")
+        scope, receive, _ = signed_request(validator)
+        await middleware(scope, receive, send)
+
+        assert priorities == [PRIORITY_REGISTERED, PRIORITY_ANONYMOUS, PRIORITY_ANONYMOUS]
+
+    asyncio.run(run())
@@ -0,0 +1,63 @@
+import threading
+from zangief.miner.batcher import RequestBatcher
+
+
+def test_concurrent_requests_share_a_batch():
+    batches = []
+
+    def run_batch(key, items):
+        batches.append((key, list(items)))
+        return [f"{key[1]}:{item}" for item in items]
+
+    batcher = RequestBatcher(run_batch, max_batch_size=4, max_wait=0.5)
+    results = {}
+
+    def call(i):
+        results[i] = batcher.run(("en", "es"), f"text {i}")
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(batches) == 1
+    assert sorted(batches[0][1]) == [f"text {i}" for i in range(4)]
+    assert results == {i: f"es:text {i}" for i in range(4)}
+
+
+def test_batches_are_grouped_by_key():
+    batches = []
+
+    def run_batch(key, items):
+        batches.append((key, list(items)))
+        return [item.upper() for item in items]
+
+    batcher = RequestBatcher(run_batch, max_batch_size=8, max_wait=0.05)
+    es_futures = batcher.submit_many(("en", "es"), ["a", "b"])
+    de_future = batcher.submit(("en", "de"), "c")
+
+    assert [future.result() for future in es_futures] == ["A", "B"]
+    assert de_future.result() == "C"
+    assert sorted(batches) == [(("en", "de"), ["c"]), (("en", "es"), ["a", "b"])]
+
+
+def test_batch_failure_is_raised_to_every_caller():
+    def run_batch(key, items):
+        raise ValueError("model exploded")
+
+    batcher = RequestBatcher(run_batch, max_batch_size=2, max_wait=0.01)
+    futures = batcher.submit_many(("en", "es"), ["a", "b"])
+
+    for future in futures:
+        try:
+            future.result(timeout=5)
+            assert False, "expected the batch error"
+        except ValueError as e:
+            assert str(e) == "model exploded"
+
+
+if __name__ == "__main__":
+    test_concurrent_requests_share_a_batch()
+    test_batches_are_grouped_by_key()
+    test_batch_failure_is_raised_to_every_caller()
@@ -0,0 +1,84 @@
+import os
+import shutil
+import threading
+import time
+from zangief.miner.cache import TranslationCache, make_key
+
+
+def test_lru_evicts_least_recently_used():
+    cache = TranslationCache(max_size=2, ttl=0)
+    cache.get_or_compute("a", lambda: "A")
+    cache.get_or_compute("b", lambda: "B")
+    cache.get("a")
+    cache.get_or_compute("c", lambda: "C")
+
+    assert cache.get("a") == "A"
+    assert cache.get("b") is None
+    assert cache.get("c") == "C"
+
+
+def test_entries_expire_after_ttl():
+    cache = TranslationCache(max_size=10, ttl=0.05)
+    cache.get_or_compute("a", lambda: "A")
+    time.sleep(0.1)
+
+    assert cache.get_or_compute("a", lambda: "A2") == "A2"
+    assert cache.stats()["misses"] == 2
+
+
+def test_concurrent_identical_requests_are_coalesced():
+    cache = TranslationCache(max_size=10, ttl=0)
+    calls = []
+    release = threading.Event()
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return "hola"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_compute("k", compute)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == ["hola"] * 5
+    stats = cache.stats()
+    assert stats["misses"] == 1
+    assert stats["coalesced"] == 4
+
+
+def test_none_results_are_not_cached():
+    cache = TranslationCache(max_size=10, ttl=0)
+    assert cache.get_or_compute("k", lambda: None) is None
+    assert cache.get_or_compute("k", lambda: "ok") == "ok"
+
+
+def test_persistent_tier_survives_restart():
+    home_dir = os.path.expanduser("~")
+    dir_name = os.path.join(home_dir, "tmp_zangief_cache")
+    path = os.path.join(dir_name, "cache.sqlite")
+    key = make_key("Hello", "en", "es")
+
+    TranslationCache(max_size=10, ttl=60, path=path).get_or_compute(key, lambda: "Hola")
+    restarted = TranslationCache(max_size=10, ttl=60, path=path)
+
+    assert restarted.get_or_compute(key, lambda: "recomputed") == "Hola"
+    assert restarted.stats()["persistent_hits"] == 1
+
+    shutil.rmtree(dir_name)
+
+
+if __name__ == "__main__":
+    test_lru_evicts_least_recently_used()
+    test_entries_expire_after_ttl()
+    test_concurrent_identical_requests_are_coalesced()
+    test_none_results_are_not_cached()
+    test_persistent_tier_survives_restart()
@@ -0,0 +1,61 @@
+import json
+import os
+import time
+
+import pytest
+
+from zangief.validator.checkpoint import EpochCheckpoint, validate_scores
+from zangief.validator.weights_io import read_weight_file, write_json_atomic
+
+
+def test_checkpoint_round_trip(tmp_path):
+    checkpoint = EpochCheckpoint(str(tmp_path / "epoch.json"))
+    assert checkpoint.load(13) is None
+
+    checkpoint.save(13, ["en", "es"], start_block=1234)
+    state = checkpoint.load(13)
+    assert state["languages"] == ["en", "es"]
+    assert state["start_block"] == 1234
+    assert checkpoint.load(23) is None
+
+
+def test_old_or_disabled_checkpoints_are_not_resumed(tmp_path):
+    path = tmp_path / "epoch.json"
+    EpochCheckpoint(str(path)).save(13, ["en"], start_block=None)
+    state = json.loads(path.read_text())
+    state["started_at"] = time.time() - 600
+    path.write_text(json.dumps(state))
+
+    assert EpochCheckpoint(str(path), max_age=3600).load(13) is not None
+    assert EpochCheckpoint(str(path), max_age=300).load(13) is None
+    assert EpochCheckpoint(str(path), max_age=0).load(13) is None
+
+    path.write_text("{not json")
+    assert EpochCheckpoint(str(path)).load(13) is None
+
+
+def test_scores_are_validated_against_the_metagraph():
+    scores = {
+        "1": {"ss58": "5A", "score": 0.9},
+        "2": {"ss58": "5B", "score": 0.4},
+        "3": {"ss58": "5C", "score": 0.1},
+    }
+    # uid 2 changed hands and uid 3 was deregistered.
+    assert validate_scores(scores, {"1": "5A", "2": "5X"}) == {"1": {"ss58": "5A", "score": 0.9}}
+
+
+def test_atomic_write_keeps_the_old_file_on_failure(tmp_path):
+    path = str(tmp_path / "weights.json")
+    write_json_atomic(path, {"1": {"ss58": "5A", "score": 0.5}})
+
+    with pytest.raises(TypeError):
+        write_json_atomic(path, {"1": object()})
+
+    assert read_weight_file(path) == {"1": {"ss58": "5A", "score": 0.5}}
+    assert os.listdir(tmp_path) == ["weights.json"]
+
+
+def test_unreadable_weights_file_reads_as_empty(tmp_path):
+    path = tmp_path / "weights.json"
+    path.write_text('{"1": {"ss58": ')
+    assert read_weight_file(str(path)) == {}
@@ -0,0 +1,104 @@
+import asyncio
+import gzip
+import json
+
+import pytest
+
+from zangief.miner.compression import (
+    CompressionMiddleware,
+    RequestTooLarge,
+    accepted_encoding,
+    decompress,
+    load_compression,
+)
+
+
+class FakeConfig:
+    def __init__(self, **values):
+        self.values = values
+
+    def get_value(self, option, default=None):
+        return self.values.get(option, default)
+
+
+async def echo(scope, receive, send):
+    message = await receive()
+    body = json.dumps({"echo": message["body"].decode(), "headers": [name.decode() for name, _ in scope["headers"]]})
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": body.encode()})
+
+
+def call(middleware, body: bytes, headers: list[tuple[bytes, bytes]]):
+    async def run():
+        received = False
+        messages = []
+
+        async def receive():
+            nonlocal received
+            if received:
+                return {"type": "http.disconnect"}
+            received = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        await middleware({"type": "http", "path": "/method/generate", "headers": headers}, receive, send)
+        return messages[0], messages[1]
+
+    return asyncio.run(run())
+
+
+def test_accepted_encoding_follows_the_server_preference():
+    assert accepted_encoding("gzip, deflate", ("zstd", "gzip")) == "gzip"
+    assert accepted_encoding("zstd;q=1, gzip", ("zstd", "gzip")) == "zstd"
+    assert accepted_encoding("gzip;q=0", ("gzip",)) is None
+    assert accepted_encoding("", ("gzip",)) is None
+
+
+def test_compressed_requests_and_responses():
+    middleware = CompressionMiddleware(echo, encodings=("gzip",), min_size=16)
+    prompt = "hello " * 100
+    start, body = call(
+        middleware,
+        gzip.compress(prompt.encode()),
+        [(b"content-encoding", b"gzip"), (b"accept-encoding", b"gzip, deflate")],
+    )
+
+    headers = dict(start["headers"])
+    assert start["status"] == 200
+    assert headers[b"content-encoding"] == b"gzip"
+    assert int(headers[b"content-length"]) == len(body["body"])
+    reply = json.loads(gzip.decompress(body["body"]))
+    assert reply["echo"] == prompt
+    assert "content-encoding" not in reply["headers"]
+
+
+def test_small_or_unaccepted_responses_are_not_compressed():
+    start, body = call(CompressionMiddleware(echo, min_size=1 << 20), b"hi", [(b"accept-encoding", b"gzip")])
+    assert b"content-encoding" not in dict(start["headers"])
+    assert json.loads(body["body"])["echo"] == "hi"
+
+    start, _ = call(CompressionMiddleware(echo, min_size=0), b"hi", [])
+    assert b"content-encoding" not in dict(start["headers"])
+
+
+def test_oversized_or_unsupported_request_bodies_are_rejected():
+    bomb = gzip.compress(b"\0" * (1 << 20))
+    with pytest.raises(RequestTooLarge):
+        decompress(bomb, "gzip", max_size=1024)
+
+    middleware = CompressionMiddleware(echo, encodings=("gzip",), max_request_bytes=1024)
+    start, _ = call(middleware, bomb, [(b"content-encoding", b"gzip")])
+    assert start["status"] == 413
+    start, _ = call(middleware, b"x", [(b"content-encoding", b"br")])
+    assert start["status"] == 415
+
+
+def test_compression_is_configured_in_config_ini():
+    assert load_compression(FakeConfig()) is None
+    assert load_compression(FakeConfig(compression="gzip", compression_min_size="64")) == {
+        "encodings": ("gzip",), "min_size": 64, "max_request_bytes": 1 << 20,
+    }
+    with pytest.raises(ValueError):
+        load_compression(FakeConfig(compression="lz4"))
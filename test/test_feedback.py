@@ -0,0 +1,92 @@
+
+import socket
+import time
+
+import pytest
+
+pytest.importorskip("communex")
+pytest.importorskip("uvicorn")
+
+from substrateinterface import Keypair  # noqa: E402
+
+from zangief.config.validator import ValidatorConfig  # noqa: E402
+from zangief.validator.feedback import FeedbackDispatcher  # noqa: E402
+from zangief.validator.simulation import MinerProfile, MinerServer, StandInMiner, free_port  # noqa: E402
+
+SCORE = {"bert": "0.5", "comet": "0.7", "composite": "0.6"}
+
+
+@pytest.fixture
+def miner():
+    server = MinerServer(StandInMiner(MinerProfile()), Keypair.create_from_uri("//Feedback"))
+    server.start()
+    yield server
+    server.stop()
+
+
+def info(server, uid=1):
+    return {"uid": uid, "key": server.key.ss58_address, "address": server.address}
+
+
+def test_scores_are_delivered_in_the_background(miner):
+    dispatcher = FeedbackDispatcher(Keypair.create_from_uri("//V"), timeout=5)
+    dispatcher.submit(info(miner), SCORE)
+    assert dispatcher.join(timeout=10)
+
+    assert miner.miner.scores == [0.6]
+    assert dispatcher.stats["sent"] == 1
+    dispatcher.stop()
+
+
+def test_unreachable_miners_fail_without_blocking():
+    dispatcher = FeedbackDispatcher(Keypair.create_from_uri("//V"), timeout=1)
+    unreachable = {"uid": 2, "key": Keypair.create_from_uri("//X").ss58_address, "address": f"127.0.0.1:{free_port('127.0.0.1')}"}
+    dispatcher.submit(unreachable, SCORE)
+    dispatcher.submit({"uid": 3, "key": "5Z", "address": "None:None"}, SCORE)
+    assert dispatcher.join(timeout=10)
+
+    assert dispatcher.stats["failed"] == 1 and dispatcher.stats["sent"] == 0
+    dispatcher.stop()
+
+
+def test_pending_scores_are_coalesced_and_stale_ones_dropped(miner):
+    dispatcher = FeedbackDispatcher(Keypair.create_from_uri("//V"), timeout=5, max_age=0)
+    with dispatcher._lock:
+        # Hold the queue so both submissions are pending together.
+        dispatcher._pending[("1", miner.key.ss58_address)] = (miner.address, miner.key.ss58_address, SCORE, 0.0)
+    dispatcher.submit(info(miner), SCORE)
+    assert dispatcher.join(timeout=10)
+
+    assert dispatcher.stats["coalesced"] == 1
+    # max_age=0 makes every notification stale by the time it is sent.
+    assert dispatcher.stats["dropped"] == 1 and not miner.miner.scores
+    dispatcher.stop()
+
+
+def test_scores_wait_in_the_queue_while_every_slot_is_busy(miner):
+    dispatcher = FeedbackDispatcher(Keypair.create_from_uri("//V"), timeout=1, concurrency=1)
+    with socket.socket() as silent:
+        # Accepts connections but never answers, holding the only slot until the timeout.
+        silent.bind(("127.0.0.1", 0))
+        silent.listen()
+        host, port = silent.getsockname()
+        dispatcher.submit({"uid": 9, "key": miner.key.ss58_address, "address": f"{host}:{port}"}, SCORE)
+        for _ in range(3):
+            time.sleep(0.05)
+            dispatcher.submit(info(miner), SCORE)
+        assert dispatcher.join(timeout=10)
+
+    assert dispatcher.stats["coalesced"] == 2
+    assert dispatcher.stats["failed"] == 1 and dispatcher.stats["sent"] == 1
+    assert miner.miner.scores == [0.6]
+    dispatcher.stop()
+
+
+def test_feedback_timeout_must_be_positive(monkeypatch):
+    config = ValidatorConfig(ignore_config_file=True)
+    monkeypatch.delenv("VALIDATOR_FEEDBACK_TIMEOUT", raising=False)
+    assert config.get_validator_feedback_timeout() == 3
+
+    monkeypatch.setenv("VALIDATOR_FEEDBACK_TIMEOUT", "0")
+    with pytest.raises(ValueError):
+        config.get_validator_feedback_timeout()
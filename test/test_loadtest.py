@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("communex")
+
+from zangief.miner.loadtest import make_prompts, run_load, summarize  # noqa: E402
+
+SAMPLES = [
+    {"prompt": "hello there", "source_language": "en"},
+    {"prompt": "hola amigo", "source_language": "es"},
+]
+
+
+def test_prompts_use_a_different_target_language():
+    prompts = make_prompts(SAMPLES, ["en", "es", "de"], 50, seed=1)
+
+    assert len(prompts) == 50
+    assert all(prompt["source_language"] != prompt["target_language"] for prompt in prompts)
+    assert {prompt["source_language"] for prompt in prompts} == {"en", "es"}
+
+
+def test_captured_prompts_are_replayed_in_order():
+    captured = [
+        {"prompt": "one", "source_language": "en", "target_language": "de"},
+        {"prompt": "two", "source_language": "es", "target_language": "en"},
+    ]
+
+    assert [prompt["prompt"] for prompt in make_prompts(captured, ["en"], 3)] == ["one", "two", "one"]
+
+
+def test_report_counts_errors_timeouts_and_pairs():
+    async def call(prompt, source_language, target_language):
+        if prompt == "slow":
+            await asyncio.sleep(1)
+        if prompt == "bad":
+            raise RuntimeError("boom")
+        await asyncio.sleep(0.01)
+        return prompt.upper()
+
+    prompts = [
+        {"prompt": "fine", "source_language": "en", "target_language": "es"},
+        {"prompt": "fine", "source_language": "es", "target_language": "en"},
+        {"prompt": "slow", "source_language": "en", "target_language": "es"},
+        {"prompt": "bad", "source_language": "en", "target_language": "es"},
+    ]
+    results, wall_seconds = asyncio.run(run_load(call, prompts, concurrency=4, timeout=0.2))
+    report = summarize(results, wall_seconds)
+
+    assert report["requests"] == 4
+    assert report["ok"] == 2
+    assert report["timeouts"] == 1
+    assert report["errors"] == 1
+    assert report["pairs"]["en-es"]["requests"] == 3
+    assert report["pairs"]["es-en"]["ok"] == 1
+    assert 0 < report["latency_p50"] <= report["latency_p99"] < 0.2
+
+
+def test_open_loop_measures_from_scheduled_arrival():
+    async def call(prompt, source_language, target_language):
+        await asyncio.sleep(0.05)
+        return prompt
+
+    prompts = [{"prompt": "x", "source_language": "en", "target_language": "es"}] * 20
+    results, wall_seconds = asyncio.run(run_load(call, prompts, rate=200, seed=3))
+
+    assert len(results) == 20
+    assert all(result["seconds"] >= 0.05 for result in results)
+    assert wall_seconds < 1
@@ -0,0 +1,144 @@
+import sys
+
+import pytest
+
+from zangief.miner import m2m_backends
+from zangief.miner.m2m_backends import (
+    CTranslate2Backend,
+    EncoderCache,
+    GenerationSettings,
+    M2MBackend,
+    OnnxBackend,
+    TorchBackend,
+    load_backend,
+)
+
+
+class FakeConfig:
+    def __init__(self, **values):
+        self.values = values
+
+    def get_value(self, option, default=None):
+        return self.values.get(option, default)
+
+
+class RecordingBackend(M2MBackend):
+    def __init__(self):
+        self.batches = []
+
+    def load_model(self):
+        pass
+
+    def translate_batch(self, prompts, source_language, target_language, settings=None):
+        self.batches.append((source_language, target_language, list(prompts)))
+        return [f"{prompt}->{target_language}" for prompt in prompts]
+
+
+def test_multi_target_requests_keep_their_order():
+    backend = RecordingBackend()
+    requests = [("a", "es"), ("b", "de"), ("a", "de"), ("c", "es")]
+
+    assert backend.translate_multi(requests, "en") == ["a->es", "b->de", "a->de", "c->es"]
+    assert backend.batches == [("en", "es", ["a", "c"]), ("en", "de", ["b", "a"])]
+
+
+def test_encoder_cache_evicts_least_recently_used():
+    cache = EncoderCache(max_size=2)
+    cache.put(("a", "en"), 1)
+    cache.put(("b", "en"), 2)
+    assert cache.get(("a", "en")) == 1
+    cache.put(("c", "en"), 3)
+
+    assert cache.get(("b", "en")) is None
+    assert cache.get(("a", "en")) == 1
+    assert cache.get(("c", "en")) == 3
+    assert cache.stats()["hits"] == 3
+    assert cache.stats()["misses"] == 1
+
+
+class FakeBackend(RecordingBackend):
+    name = "fake"
+
+    def __init__(self, model_name, device, settings, config=None):
+        super().__init__()
+        self.model_name = model_name
+        self.device = device
+        self.settings = settings
+
+
+def test_backend_is_selected_from_the_config(monkeypatch):
+    monkeypatch.setitem(m2m_backends.BACKENDS, "fake", FakeBackend)
+    backend = load_backend(FakeConfig(backend="fake", model="tiny", device="cpu", num_beams="4"))
+
+    assert isinstance(backend, FakeBackend)
+    assert (backend.model_name, backend.device) == ("tiny", "cpu")
+    assert backend.settings.num_beams == 4
+    assert load_backend(FakeConfig(backend="torch"), backend_name="fake").model_name == m2m_backends.DEFAULT_MODEL
+
+
+def test_unknown_backends_are_rejected():
+    with pytest.raises(ValueError, match="Unknown M2M backend 'tensorrt'"):
+        load_backend(FakeConfig(backend="tensorrt"))
+
+
+@pytest.mark.parametrize("backend, module, hint", [
+    (OnnxBackend, "optimum.onnxruntime", "pip install optimum"),
+    (CTranslate2Backend, "ctranslate2", "pip install ctranslate2"),
+])
+def test_missing_runtimes_name_the_package_to_install(monkeypatch, backend, module, hint):
+    # A None entry makes the import fail as if the package were not installed.
+    monkeypatch.setitem(sys.modules, module, None)
+    instance = backend.__new__(backend)
+    instance.config = None
+    instance.settings = GenerationSettings()
+
+    with pytest.raises(ImportError, match=hint):
+        instance.load_model()
+
+
+def test_backends_must_implement_the_runtime():
+    class Incomplete(M2MBackend):
+        def load_model(self):
+            pass
+
+    with pytest.raises(TypeError):
+        Incomplete("model", "cpu", GenerationSettings())
+
+
+def assisted_backend(backend, num_beams=1, **options):
+    instance = backend.__new__(backend)
+    instance.config = FakeConfig(assistant_model="facebook/m2m100_418M", **options)
+    instance.settings = GenerationSettings(num_beams=num_beams)
+    instance.loaded = []
+
+    class Draft:
+        generation_config = type("GenerationConfig", (), {})()
+
+    def load_pretrained(model_name):
+        instance.loaded.append(model_name)
+        return Draft()
+
+    instance.load_pretrained = load_pretrained
+    return instance
+
+
+def test_assistant_model_is_loaded_for_greedy_decoding():
+    backend = assisted_backend(TorchBackend, assistant_tokens="5")
+    draft = backend.load_assistant_model()
+
+    assert backend.loaded == ["facebook/m2m100_418M"]
+    assert draft.generation_config.num_assistant_tokens == 5
+
+
+def test_assistant_model_is_ignored_with_beam_search():
+    backend = assisted_backend(TorchBackend, num_beams=4)
+
+    assert backend.load_assistant_model() is None
+    assert backend.loaded == []
+
+
+def test_assistant_model_is_ignored_by_backends_without_assisted_decoding():
+    backend = assisted_backend(OnnxBackend)
+
+    assert backend.load_assistant_model() is None
+    assert backend.loaded == []
@@ -0,0 +1,41 @@
+from zangief.miner.memory import TranslationMemory
+
+SENTENCE = "The quick brown fox jumps over the lazy dog near the river bank."
+
+
+def test_exact_hits_ignore_whitespace_differences():
+    memory = TranslationMemory()
+    memory.add(SENTENCE, "El rápido zorro.", "en", "es")
+
+    assert memory.lookup("  " + SENTENCE.replace(" ", "  "), "en", "es") == "El rápido zorro."
+    assert memory.lookup(SENTENCE, "en", "de") is None
+    assert memory.stats()["exact_hits"] == 1
+
+
+def test_near_identical_segments_are_reused():
+    memory = TranslationMemory(threshold=0.8)
+    memory.add(SENTENCE, "El rápido zorro.", "en", "es")
+
+    assert memory.lookup(SENTENCE.replace("river bank", "river banks"), "en", "es") == "El rápido zorro."
+    assert memory.lookup("A completely different sentence about cooking pasta.", "en", "es") is None
+    assert memory.stats()["fuzzy_hits"] == 1
+
+
+def test_fuzzy_hits_never_change_numbers():
+    memory = TranslationMemory(threshold=0.8)
+    memory.add("The company reported revenue of 120 million dollars this year.", "x", "en", "es")
+
+    assert memory.lookup("The company reported revenue of 130 million dollars this year.", "en", "es") is None
+
+
+def test_segments_persist_and_oldest_are_evicted(tmp_path):
+    path = str(tmp_path / "memory.db")
+    memory = TranslationMemory(path=path, max_segments=2)
+    for i, word in enumerate(("one", "two", "three")):
+        memory.add(f"Sentence number {word}.", f"Frase {i}.", "en", "es")
+
+    assert memory.lookup("Sentence number one.", "en", "es") is None
+
+    reloaded = TranslationMemory(path=path, max_segments=2)
+    assert reloaded.lookup("Sentence number three.", "en", "es") == "Frase 2."
+    assert reloaded.stats()["segments"] == 2
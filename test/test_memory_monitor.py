@@ -0,0 +1,95 @@
+import pytest
+from loguru import logger
+
+from zangief.config.validator import ValidatorConfig
+from zangief.validator import memory_monitor
+from zangief.validator.memory_monitor import HARD, MB, MemoryMonitor, rss_bytes
+
+
+def test_rss_is_reported():
+    assert rss_bytes() > MB
+
+
+def test_growth_is_attributed_to_phases(monkeypatch):
+    readings = iter([100 * MB, 110 * MB, 150 * MB, 151 * MB])
+    monkeypatch.setattr(memory_monitor, "rss_bytes", lambda: next(readings))
+    monitor = MemoryMonitor(interval=100)
+
+    monitor.mark("fan-out")
+    monitor.mark("score")
+    monitor.end_step()
+
+    assert monitor._phase_growth == {"fan-out": 10 * MB, "score": 40 * MB, "step_end": 1 * MB}
+    assert [phase for _, phase, _ in monitor.history] == ["fan-out", "score", "step_end"]
+
+
+def test_budgets_run_trimmers_by_level(monkeypatch):
+    rss = {"value": 100 * MB}
+    monkeypatch.setattr(memory_monitor, "rss_bytes", lambda: rss["value"])
+    calls = []
+    monitor = MemoryMonitor(soft_limit_mb=200, hard_limit_mb=400, interval=5)
+    monitor.add_trimmer("cache", lambda: calls.append("cache"))
+    monitor.add_trimmer("pool", lambda: calls.append("pool"), level=HARD)
+
+    monitor.end_step()
+    assert calls == []
+
+    rss["value"] = 300 * MB
+    monitor.end_step()
+    monitor.end_step()
+    assert calls == ["cache"]
+
+    rss["value"] = 500 * MB
+    monitor.end_step()
+    assert calls == ["cache", "cache", "pool"]
+
+    # Hard trims are rate-limited like soft trims.
+    for _ in range(4):
+        monitor.end_step()
+    assert calls == ["cache", "cache", "pool"]
+    monitor.end_step()
+    assert calls == ["cache", "cache", "pool", "cache", "pool"]
+
+
+def test_failing_trimmer_does_not_stop_the_others(monkeypatch):
+    monkeypatch.setattr(memory_monitor, "rss_bytes", lambda: 500 * MB)
+    calls = []
+    monitor = MemoryMonitor(soft_limit_mb=100)
+    monitor.add_trimmer("broken", lambda: 1 / 0)
+    monitor.add_trimmer("cache", lambda: calls.append("cache"))
+
+    monitor.check()
+    assert calls == ["cache"]
+
+
+def test_tracemalloc_report_logs_growth():
+    import tracemalloc
+
+    messages = []
+    sink = logger.add(lambda message: messages.append(message.record["message"]))
+    monitor = MemoryMonitor(interval=1, tracemalloc_frames=1)
+    try:
+        kept = [bytearray(1024) for _ in range(100)]
+        monitor.end_step()
+        assert kept
+    finally:
+        tracemalloc.stop()
+        logger.remove(sink)
+
+    assert messages[0].startswith("Validator RSS ")
+    assert "growth over the last 1 steps: step_end" in messages[0]
+    growth = [message for message in messages if message.startswith("Allocation growth")]
+    # The 100 KiB of buffers above are among the lines whose allocations grew most.
+    assert any(
+        "test_memory_monitor.py" in message and float(message.split()[2]) >= 100 for message in growth
+    )
+
+
+def test_memory_interval_must_be_positive(monkeypatch):
+    config = ValidatorConfig(ignore_config_file=True)
+    monkeypatch.delenv("VALIDATOR_MEMORY_INTERVAL", raising=False)
+    assert config.get_validator_memory_interval() == 10
+
+    monkeypatch.setenv("VALIDATOR_MEMORY_INTERVAL", "0")
+    with pytest.raises(ValueError):
+        config.get_validator_memory_interval()
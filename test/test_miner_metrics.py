@@ -0,0 +1,59 @@
+import socket
+import urllib.request
+
+import pytest
+
+pytest.importorskip("prometheus_client")
+
+from zangief.miner.metrics import MinerMetrics, telemetry  # noqa: E402
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def scrape(port: int) -> dict[str, float]:
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+        text = response.read().decode()
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, _, value = line.rpartition(" ")
+            samples[name] = float(value)
+    return samples
+
+
+def test_metrics_are_served_on_their_own_port(monkeypatch):
+    monkeypatch.setattr(telemetry, "_sinks", [])
+    metrics = MinerMetrics(score_window=2)
+    port = free_port()
+    metrics.serve(port)
+
+    metrics.observe_request("en", "es", 0.3, "ok")
+    metrics.observe_request("en", "es", 0.2, "error")
+    metrics.observe_scores(bert=0.5, comet=0.7)
+    metrics.observe_scores(bert=0.9, comet="n/a")
+    # Events reach the metrics through telemetry, as they do from model workers.
+    telemetry.record_batch(4, 0.5)
+    telemetry.record_generation(40, 2.0)
+    stats = {"hits": 3, "misses": 1, "size": 2}
+    metrics.add_stats("zangief_miner_cache", lambda: stats, counters=("hits", "misses"))
+    stats["hits"] = 5
+
+    samples = scrape(port)
+    assert samples['zangief_miner_requests_total{source_language="en",status="ok",target_language="es"}'] == 1
+    assert samples['zangief_miner_requests_total{source_language="en",status="error",target_language="es"}'] == 1
+    assert samples['zangief_miner_request_seconds_count{source_language="en",target_language="es"}'] == 2
+    assert samples['zangief_miner_validator_score_count{metric="bert"}'] == 2
+    assert samples['zangief_miner_validator_score_rolling{metric="bert"}'] == pytest.approx(0.7)
+    assert samples['zangief_miner_validator_score_rolling{metric="comet"}'] == pytest.approx(0.7)
+    assert samples["zangief_miner_batch_size_sum"] == 4
+    assert samples["zangief_miner_generated_tokens_total"] == 40
+    assert samples["zangief_miner_tokens_per_second"] == 20
+    # Stats are read at scrape time.
+    assert samples["zangief_miner_cache_hits_total"] == 5
+    assert samples["zangief_miner_cache_misses_total"] == 1
+    assert samples["zangief_miner_cache_size"] == 2
+
@@ -0,0 +1,93 @@
+import pytest
+
+pytest.importorskip("communex")
+
+from zangief.config.validator import ValidatorConfig  # noqa: E402
+from zangief.validator.node_pool import NodePool, WeightSubmitter  # noqa: E402
+
+
+class FakeClient:
+    def __init__(self, url, head=100, fail=False):
+        self.url = url
+        self.head = head
+        self.fail = fail
+        self.votes = []
+
+    def get_block(self):
+        if self.fail:
+            raise ConnectionError(f"{self.url} is down")
+        return {"header": {"number": self.head}}
+
+    def vote(self, key, uids, weights, netuid):
+        if self.fail:
+            raise ConnectionError(f"{self.url} is down")
+        self.votes.append((uids, weights))
+
+
+def make_pool(clients, **kwargs):
+    return NodePool(list(clients), clients=clients, **kwargs)
+
+
+def test_lagging_and_failing_nodes_are_ranked_last():
+    clients = {
+        "wss://a": FakeClient("wss://a", head=100),
+        "wss://b": FakeClient("wss://b", head=90),
+        "wss://c": FakeClient("wss://c", fail=True),
+    }
+    pool = make_pool(clients, max_lag=5)
+    pool.probe_all()
+
+    assert pool.nodes["wss://a"].healthy
+    assert not pool.nodes["wss://b"].healthy
+    assert not pool.nodes["wss://c"].healthy
+    assert pool.ranked()[0] == "wss://a"
+
+
+def test_call_falls_back_to_the_next_node():
+    clients = {"wss://a": FakeClient("wss://a"), "wss://b": FakeClient("wss://b")}
+    pool = make_pool(clients, client_factory=lambda url, timeout: clients[url])
+    clients["wss://a"].fail = True
+
+    assert pool.call(lambda client: client.get_block()["header"]["number"]) == 100
+    assert pool.ranked()[0] == "wss://b"
+
+    clients["wss://b"].fail = True
+    with pytest.raises(ConnectionError):
+        pool.call(lambda client: client.get_block())
+
+
+def test_submitter_retries_in_the_background():
+    client = FakeClient("wss://a", fail=True)
+    pool = make_pool({"wss://a": client}, client_factory=lambda url, timeout: client)
+    votes = []
+    submitter = WeightSubmitter(pool, key=None, netuid=13, backoff=0.05, on_success=lambda: votes.append(1))
+
+    submitter.submit([1, 2], [500, 500])
+    assert not submitter.join(timeout=0.05)
+    client.fail = False
+    assert submitter.join(timeout=5)
+
+    assert client.votes == [([1, 2], [500, 500])]
+    assert votes == [1] and submitter.submitted == 1
+    submitter.stop()
+
+
+def test_submitter_gives_up_after_max_attempts():
+    client = FakeClient("wss://a", fail=True)
+    pool = make_pool({"wss://a": client}, client_factory=lambda url, timeout: client)
+    submitter = WeightSubmitter(pool, key=None, netuid=13, max_attempts=2, backoff=0.001)
+
+    submitter.submit([1], [1000])
+    assert submitter.join(timeout=5)
+    assert submitter.failed == 1 and not client.votes
+    submitter.stop()
+
+
+def test_probe_interval_must_be_positive(monkeypatch):
+    config = ValidatorConfig(ignore_config_file=True)
+    monkeypatch.delenv("VALIDATOR_NODE_PROBE_INTERVAL", raising=False)
+    assert config.get_validator_node_probe_interval() == 30
+
+    monkeypatch.setenv("VALIDATOR_NODE_PROBE_INTERVAL", "0")
+    with pytest.raises(ValueError):
+        config.get_validator_node_probe_interval()
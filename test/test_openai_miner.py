@@ -0,0 +1,123 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("openai")
+pytest.importorskip("communex")
+
+from zangief.miner.openai_miner import OpenAIMiner  # noqa: E402
+
+
+class FakeConfig:
+    def __init__(self, **values):
+        self.values = values
+
+    def get_value(self, option, default=None):
+        return self.values.get(option, default)
+
+
+class FakeOpenAIServer(ThreadingHTTPServer):
+    """A minimal OpenAI-compatible chat completions server."""
+
+    def __init__(self, failures=0, status=429):
+        super().__init__(("127.0.0.1", 0), FakeOpenAIHandler)
+        self.failures = failures
+        self.status = status
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.server.lock:
+            self.server.requests += 1
+            fail = self.server.requests <= self.server.failures
+
+        if fail:
+            payload = {"error": {"message": "slow down", "type": "rate_limit"}}
+            self.send_response(self.server.status)
+        else:
+            text = body["messages"][-1]["content"].rsplit(": ", 1)[-1]
+            payload = {
+                "id": "chatcmpl-1",
+                "object": "chat.completion",
+                "created": 0,
+                "model": body["model"],
+                "choices": [{
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": text.upper()},
+                }],
+            }
+            self.send_response(200)
+        data = json.dumps(payload).encode()
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def start_server(**kwargs):
+    server = FakeOpenAIServer(**kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_miner(server, **values):
+    return OpenAIMiner(FakeConfig(
+        openai_key="test", openai_base_url=server.base_url, backoff_base=0.01, **values
+    ))
+
+
+def test_translation_against_fake_server():
+    server = start_server()
+    miner = make_miner(server)
+
+    assert miner.generate_translation("hola", "es", "en") == "HOLA"
+    server.shutdown()
+
+
+def test_rate_limits_are_retried():
+    server = start_server(failures=2, status=429)
+    miner = make_miner(server, max_retries=3)
+
+    assert miner.generate_translation("hola", "es", "en") == "HOLA"
+    assert server.requests == 3
+    server.shutdown()
+
+
+def test_gives_up_after_max_retries():
+    server = start_server(failures=10, status=503)
+    miner = make_miner(server, max_retries=1)
+
+    assert miner.generate_translation("hola", "es", "en") is None
+    assert server.requests == 2
+    server.shutdown()
+
+
+def test_concurrent_requests_share_the_client():
+    server = start_server()
+    miner = make_miner(server, max_in_flight=4)
+    results = []
+    threads = [
+        threading.Thread(target=lambda i=i: results.append(miner.generate_translation(f"t{i}", "es", "en")))
+        for i in range(16)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(results) == sorted(f"T{i}" for i in range(16))
+    server.shutdown()
@@ -0,0 +1,39 @@
+import json
+from dataclasses import dataclass
+
+from zangief.miner.profiles import GenerationProfiles, max_new_tokens
+
+
+@dataclass
+class Settings:
+    max_length: int = 1024
+    do_sample: bool = True
+    num_beams: int = 1
+    top_k: int = 10
+    max_new_tokens_ratio: float | None = None
+    max_new_tokens_min: int = 16
+
+
+def test_pair_profile_overrides_default_and_config(tmp_path):
+    path = tmp_path / "profile.json"
+    path.write_text(json.dumps({
+        "default": {"max_new_tokens_ratio": 2.0},
+        "pairs": {"en-es": {"num_beams": 2, "do_sample": False, "report_only": 1}},
+        "report": {},
+    }))
+    profiles = GenerationProfiles.load(str(path))
+    base = Settings(top_k=5)
+
+    en_es = profiles.settings_for(base, "en", "es")
+    assert (en_es.num_beams, en_es.do_sample, en_es.top_k, en_es.max_new_tokens_ratio) == (2, False, 5, 2.0)
+
+    es_en = profiles.settings_for(base, "es", "en")
+    assert (es_en.num_beams, es_en.do_sample, es_en.max_new_tokens_ratio) == (1, True, 2.0)
+    assert base.max_new_tokens_ratio is None
+
+
+def test_max_new_tokens_scales_with_source_length():
+    assert max_new_tokens(Settings(), 100) is None
+    assert max_new_tokens(Settings(max_new_tokens_ratio=1.5), 4) == 16
+    assert max_new_tokens(Settings(max_new_tokens_ratio=1.5), 40) == 60
+    assert max_new_tokens(Settings(max_new_tokens_ratio=1.5, max_length=50), 40) == 50
@@ -0,0 +1,26 @@
+from zangief.miner.quality import chrf, corpus_chrf
+
+
+def test_chrf_bounds():
+    assert chrf("Hola mundo", "Hola mundo") == 100.0
+    assert chrf("abc", "xyz") == 0.0
+    assert chrf("", "") == 100.0
+    assert chrf("", "Hola") == 0.0
+
+
+def test_chrf_prefers_closer_hypothesis():
+    reference = "El gato duerme en la alfombra roja."
+    close = chrf("El gato duerme en la alfombra.", reference)
+    far = chrf("Un perro corre por el parque.", reference)
+    assert 0 < far < close < 100
+
+
+def test_corpus_chrf_averages_sentences():
+    assert corpus_chrf(["a b c", "xyz"], ["a b c", "abc"]) == 50.0
+    assert corpus_chrf([], []) == 0.0
+
+
+if __name__ == "__main__":
+    test_chrf_bounds()
+    test_chrf_prefers_closer_hypothesis()
+    test_corpus_chrf_averages_sentences()
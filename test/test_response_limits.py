@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("communex")
+pytest.importorskip("uvicorn")
+
+from substrateinterface import Keypair  # noqa: E402
+
+from zangief.config.validator import ValidatorConfig  # noqa: E402
+from zangief.miner.compression import CompressionMiddleware  # noqa: E402
+
+from zangief.validator.limits import ANSWER_SLACK_CHARS, is_oversized  # noqa: E402
+from zangief.validator.module_session import ERROR_BODY_BYTES, ModuleSession, ResponseTooLarge  # noqa: E402
+from zangief.validator.simulation import MinerProfile, MinerServer, StandInMiner  # noqa: E402
+
+
+@pytest.fixture
+def miner():
+    server = MinerServer(StandInMiner(MinerProfile(latency=0)), Keypair.create_from_uri("//Limits"))
+    server.start()
+    yield server
+    server.stop()
+
+
+def generate(server, prompt, max_bytes):
+    async def run():
+        session = ModuleSession(Keypair.create_from_uri("//V"))
+        try:
+            host, port = server.address.split(":")
+            params = {"prompt": prompt, "source_language": "en", "target_language": "es"}
+            return await session.call(host, port, "generate", server.key.ss58_address, params, timeout=10, max_bytes=max_bytes)
+        finally:
+            await session.close()
+
+    return asyncio.run(run())
+
+
+def test_replies_are_read_up_to_the_limit(miner):
+    assert generate(miner, "short prompt", max_bytes=4096)["answer"]
+    with pytest.raises(ResponseTooLarge):
+        generate(miner, "long prompt " * 2000, max_bytes=4096)
+
+
+def test_compressed_replies_are_limited_by_their_decompressed_size():
+    server = MinerServer(StandInMiner(MinerProfile(latency=0)), Keypair.create_from_uri("//Compressed"))
+    server.server.config.app.add_middleware(CompressionMiddleware, encodings=("gzip",), min_size=0)
+    server.start()
+    try:
+        # Repetitive text compresses far below the limit, but is still too long once decompressed.
+        prompt = "long prompt " * 2000
+        assert generate(server, prompt, max_bytes=1 << 20)["answer"]
+        with pytest.raises(ResponseTooLarge):
+            generate(server, prompt, max_bytes=4096)
+    finally:
+        server.stop()
+
+
+def test_error_replies_are_not_buffered_whole():
+    from aiohttp import web
+
+    async def fail(request):
+        return web.Response(status=500, body=b"x" * (4 << 20))
+
+    async def run():
+        app = web.Application()
+        app.router.add_post("/method/generate", fail)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        session = ModuleSession(Keypair.create_from_uri("//V"))
+        try:
+            await session.call("127.0.0.1", port, "generate", "5target", {"prompt": "hi"}, timeout=10, max_bytes=4096)
+        finally:
+            await session.close()
+            await runner.cleanup()
+
+    with pytest.raises(RuntimeError) as error:
+        asyncio.run(run())
+    assert "status code: 500" in str(error.value)
+    assert len(str(error.value)) < ERROR_BODY_BYTES + 100
+
+
+def test_answers_are_bounded_by_the_source_length():
+    source = "x" * 100
+    assert not is_oversized(source, "y" * (400 + ANSWER_SLACK_CHARS), ratio=4)
+    assert is_oversized(source, "y" * (401 + ANSWER_SLACK_CHARS), ratio=4)
+    assert not is_oversized(source, None, ratio=4)
+
+
+def test_answer_ratio_may_be_fractional(monkeypatch):
+    config = ValidatorConfig(ignore_config_file=True)
+    monkeypatch.delenv("VALIDATOR_MAX_ANSWER_RATIO", raising=False)
+    assert config.get_validator_max_answer_ratio() == 4
+
+    monkeypatch.setenv("VALIDATOR_MAX_ANSWER_RATIO", "2.5")
+    assert config.get_validator_max_answer_ratio() == 2.5
+
+    for value in ("0", "-1", "many"):
+        monkeypatch.setenv("VALIDATOR_MAX_ANSWER_RATIO", value)
+        with pytest.raises(ValueError):
+            config.get_validator_max_answer_ratio()
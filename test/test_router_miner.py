@@ -0,0 +1,155 @@
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("communex")
+httpx = pytest.importorskip("httpx")
+
+# The router imports its siblings by bare name; take them from it so the test
+# shares its BaseMiner class and caller context variable.
+from zangief.miner.router_miner import BaseMiner, RouterMiner, current_caller  # noqa: E402
+
+
+class FakeConfig:
+    def __init__(self, **values):
+        self.values = values
+
+    def get_value(self, option, default=None):
+        return self.values.get(option, default)
+
+
+class FakeMiner(BaseMiner):
+    def __init__(self, answer="", delay=0.0, error=None, warmup_pairs=""):
+        super().__init__()
+        self.config = FakeConfig()
+        self.warmup_pairs = warmup_pairs
+        self.answer = answer
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    def generate_translation(self, prompt, source_language, target_language):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.answer
+
+
+def make_router(backends, **options):
+    options.setdefault("cache_size", "0")
+    options.setdefault("router_min_scores", "1")
+    return RouterMiner(FakeConfig(**options), backends=backends)
+
+
+def test_scores_steer_routing_per_pair():
+    router = make_router({"m2m": FakeMiner("m2m"), "openai": FakeMiner("openai")})
+
+    for name, score in (("m2m", 0.9), ("openai", 0.5)):
+        router._served[None] = (name, "en", "es")
+        router.on_score(bert=score, comet=score, composite=score)
+    for name, score in (("m2m", 0.4), ("openai", 0.8)):
+        router._served[None] = (name, "en", "ur")
+        router.on_score(bert=score, comet=score, composite=score)
+
+    assert router.translate("hi", "en", "es") == "m2m"
+    assert router.translate("hi", "en", "ur") == "openai"
+
+
+def test_unscored_backends_are_tried_first():
+    router = make_router({"m2m": FakeMiner("m2m"), "openai": FakeMiner("openai")})
+    router._served[None] = ("m2m", "en", "es")
+    router.on_score(bert=1.0, comet=1.0, composite=1.0)
+
+    assert router.rank("en", "es") == ["openai", "m2m"]
+
+
+def test_slow_backends_lose_to_backends_inside_the_budget():
+    router = make_router(
+        {"openai": FakeMiner("openai"), "m2m": FakeMiner("m2m")}, router_latency_budget="1"
+    )
+    router.get_stats("openai", "en", "es").latencies.append(5.0)
+
+    assert router.rank("en", "es") == ["m2m", "openai"]
+
+
+def test_falls_back_on_error_empty_answer_and_timeout():
+    backends = {
+        "broken": FakeMiner(error=RuntimeError("boom")),
+        "empty": FakeMiner(""),
+        "slow": FakeMiner("late", delay=0.5),
+        "good": FakeMiner("ok"),
+    }
+    router = make_router(backends, router_timeout="0.1")
+
+    assert router.translate("hi", "en", "es") == "ok"
+    assert router.fallbacks == 3
+    assert router.get_stats("broken", "en", "es").failure_rate == 1.0
+    assert router.get_stats("slow", "en", "es").failure_rate == 1.0
+
+    # Failing backends are now tried last.
+    assert router.rank("en", "es")[0] == "good"
+
+
+def test_backends_with_too_many_running_calls_are_skipped():
+    backends = {"slow": FakeMiner("late", delay=0.5), "good": FakeMiner("ok")}
+    router = make_router(
+        backends, router_timeout="0.05", router_max_pending="1", router_min_scores="5", router_max_failure_rate="1"
+    )
+
+    assert router.translate("one", "en", "es") == "ok"
+    router.get_stats("good", "en", "es").latencies.append(1.0)
+    assert router.rank("en", "es")[0] == "slow"
+    # The timed-out call still holds its thread, so the slow backend is skipped.
+    assert router.translate("two", "en", "es") == "ok"
+    assert backends["slow"].calls == 1
+    assert router.fallbacks == 2
+
+    time.sleep(0.6)
+    assert router._pending == {"slow": 0, "good": 0}
+
+
+def test_warm_up_bypasses_the_route_statistics():
+    backends = {"m2m": FakeMiner("hola", warmup_pairs="en-es,es-en"), "openai": FakeMiner("hola!")}
+    router = make_router(backends)
+
+    router.warm_up([("en", "es"), ("es", "en")])
+
+    assert backends["m2m"].calls == 2
+    # Backends without warm-up pairs of their own are not called.
+    assert backends["openai"].calls == 0
+    assert router.route_table() == {}
+    assert router.routed == 0
+
+
+def test_scores_are_credited_to_the_backend_that_answered_the_caller():
+    from communex.module._protocol import create_request_data
+    from communex.module._rate_limiters.limiters import IpLimiterParams
+    from communex.module._signer import TESTING_MNEMONIC
+    from substrateinterface import Keypair
+
+    backends = {"m2m": FakeMiner("hola"), "openai": FakeMiner("hola!")}
+    router = make_router(backends, admission="0", router_min_scores="5")
+    key = Keypair.create_from_mnemonic(TESTING_MNEMONIC)
+    app = BaseMiner.build_app(
+        router, key, IpLimiterParams(bucket_size=1000, refill_rate=1000), use_testnet=False, netuid=None
+    )
+
+    async def call(method, params):
+        body, headers = create_request_data(key, key.ss58_address, params)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://miner") as client:
+            response = await client.post(f"/method/{method}", content=body, headers=headers)
+        response.raise_for_status()
+        return response.json()
+
+    async def run():
+        await call("generate", {"prompt": "hello", "source_language": "en", "target_language": "es"})
+        await call("score", {"bert": 0.7, "comet": 0.7, "composite": 0.7})
+
+    asyncio.run(run())
+
+    assert current_caller.get() is None
+    assert router.route_table()["en-es"]["m2m"]["score"] == pytest.approx(0.7)
+    assert router.route_table()["en-es"]["m2m"]["scored"] == 1
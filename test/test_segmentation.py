@@ -0,0 +1,53 @@
+from zangief.miner.segmentation import join_sentences, split_segments, split_sentences
+
+
+def test_split_keeps_text_and_ignores_decimals():
+    text = "Hello world. This costs 3.5 dollars!  Really?\nNew paragraph."
+    sentences = split_sentences(text, "en")
+
+    assert sentences == ["Hello world. ", "This costs 3.5 dollars!  ", "Really?\n", "New paragraph."]
+    assert "".join(sentences) == text
+
+
+def test_split_uses_language_punctuation():
+    assert split_sentences("你好。今天天气很好！是吗？", "zh") == ["你好。", "今天天气很好！", "是吗？"]
+    assert split_sentences("यह एक वाक्य है। यह दूसरा है।", "hi") == ["यह एक वाक्य है। ", "यह दूसरा है।"]
+    assert split_sentences("هل أنت بخير؟ نعم.", "ar") == ["هل أنت بخير؟ ", "نعم."]
+
+
+def test_split_keeps_closing_quotes_with_their_sentence():
+    assert split_sentences('He said "stop." Then left.', "en") == ['He said "stop." ', "Then left."]
+
+
+def test_join_keeps_line_breaks_and_target_spacing():
+    segments = split_segments("A b. C d.\n\nE f.", "en")
+
+    assert join_sentences(["x.", "y.", "z."], segments, "es") == "x. y.\n\nz."
+    assert join_sentences(["甲。", "乙。", "丙。"], segments, "zh") == "甲。乙。\n\n丙。"
+    assert join_sentences(["x.", "y."], split_segments("甲。乙。", "zh"), "en") == "x. y."
+
+
+def test_join_rejoins_cuts_inside_words_without_a_space():
+    url = "https://example.com/" + "a" * 40
+    segments = split_segments(f"See {url} now.", "en", max_chars=30)
+
+    assert "".join(segment.text for segment in segments) == f"See {url} now."
+    assert [segment.separator for segment in segments] == ["", "", None]
+    translations = [segment.text.strip() for segment in segments]
+    assert join_sentences(translations, segments, "es") == f"See {url} now."
+    # Text of unspaced languages cut mid-sentence still gets the target spacing.
+    segments = split_segments("甲" * 50, "zh", max_chars=20)
+    assert [segment.separator for segment in segments] == [None, None, None]
+    assert join_sentences(["a", "b", "c"], segments, "en") == "a b c"
+
+
+def test_long_sentences_break_at_clauses_then_spaces():
+    text = "This is a long clause, with another clause here; and the end. Short."
+    segments = split_segments(text, "en", max_chars=30)
+
+    assert [segment.text for segment in segments] == [
+        "This is a long clause, ", "with another clause here; ", "and the end. ", "Short."
+    ]
+    segments = split_segments("word " * 30, "en", max_chars=40)
+    assert "".join(segment.text for segment in segments) == "word " * 30
+    assert all(len(segment.text) <= 40 for segment in segments)
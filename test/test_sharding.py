@@ -0,0 +1,121 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("communex")
+
+from substrateinterface import Keypair  # noqa: E402
+
+from zangief.validator.coordinator import ShardCoordinator  # noqa: E402
+from zangief.validator.node_pool import NodePool  # noqa: E402
+from zangief.validator.power_scaling import compute_weights  # noqa: E402
+from zangief.validator.sharding import ScoreStore, Shard, ShardRing  # noqa: E402
+from zangief.validator.simulation import SimulatedChain  # noqa: E402
+
+
+def test_ring_slices_are_disjoint_and_stable():
+    ring = ShardRing(["a", "b", "c"])
+    owners = {uid: ring.owner(uid) for uid in range(600)}
+
+    assert set(owners.values()) == {"a", "b", "c"}
+    assert all(ShardRing(["c", "a", "b"]).owner(uid) == owner for uid, owner in owners.items())
+
+    # A new shard only takes uids over; no uid moves between the existing shards.
+    grown = ShardRing(["a", "b", "c", "d"])
+    moved = [uid for uid, owner in owners.items() if grown.owner(uid) != owner]
+    assert all(grown.owner(uid) == "d" for uid in moved)
+    assert 0 < len(moved) < 300
+
+
+def test_shard_must_be_on_the_ring(tmp_path):
+    with pytest.raises(ValueError):
+        Shard("z", ShardRing(["a", "b"]), ScoreStore(str(tmp_path / "shards.db")))
+
+
+def test_store_keeps_scores_per_epoch(tmp_path):
+    path = str(tmp_path / "shards.db")
+    store = ScoreStore(path)
+    epoch, _ = store.current_epoch()
+    store.put_scores(epoch, "a", {1: {"ss58": "k1", "score": 0.5}})
+    store.put_scores(epoch, "b", {2: {"ss58": "k2", "score": 0.25}, 1: {"ss58": "k1", "score": 0.75}})
+
+    # Another process sees the same store.
+    other = ScoreStore(path)
+    assert other.scores(epoch) == {
+        "1": {"ss58": "k1", "score": 0.75, "shard": "b"},
+        "2": {"ss58": "k2", "score": 0.25, "shard": "b"},
+    }
+
+    assert other.advance(epoch) == epoch + 1
+    # A second coordinator advancing the same epoch does not skip one.
+    assert store.advance(epoch) == epoch + 1
+    assert store.scores(epoch + 1) == {}
+
+
+def test_store_shares_the_languages_of_an_epoch(tmp_path):
+    path = str(tmp_path / "shards.db")
+    store, other = ScoreStore(path), ScoreStore(path)
+
+    # The first epoch takes the languages of whoever asks first.
+    assert store.epoch_languages(lambda: ["es", "zh"]) == (0, ["es", "zh"])
+    assert other.epoch_languages(lambda: ["fr", "de"]) == (0, ["es", "zh"])
+
+    other.advance(0, ["ru", "hi"])
+    assert store.epoch_languages(lambda: ["fr", "de"]) == (1, ["ru", "hi"])
+    store.advance(1)
+    assert other.epoch_languages(lambda: ["fr", "de"]) == (2, ["fr", "de"])
+
+
+def make_chain(miners):
+    validator_key = Keypair.create_from_uri("//Alice")
+    servers = [
+        SimpleNamespace(key=Keypair.create_from_uri(f"//Miner{uid}"), address=f"127.0.0.1:{9000 + uid}")
+        for uid in range(1, miners + 1)
+    ]
+    return validator_key, SimulatedChain(validator_key, servers)
+
+
+def test_coordinator_votes_like_a_single_validator(tmp_path):
+    validator_key, chain = make_chain(16)
+    store = ScoreStore(str(tmp_path / "shards.db"))
+    node_pool = NodePool.for_client(chain)
+    coordinator = ShardCoordinator(
+        validator_key, chain.netuid, node_pool, store, sample_languages=lambda: ["ja", "ar"]
+    )
+    ring = ShardRing(["a", "b"])
+    scores = {str(uid): uid / 20 for uid in range(1, 17)}
+    epoch, _ = store.current_epoch()
+    assert {ring.owner(uid) for uid in scores} == {"a", "b"}
+
+    for shard in ("a", "b"):
+        owned = {
+            uid: {"ss58": chain.keys[int(uid)], "score": score}
+            for uid, score in scores.items() if ring.owner(uid) == shard
+        }
+        assert not coordinator.step()
+        store.put_scores(epoch, shard, owned)
+
+    assert coordinator.step()
+    assert coordinator.weight_submitter.join(timeout=10)
+    assert (chain.votes[0]["uids"], chain.votes[0]["weights"]) == compute_weights(scores, own_uid=0)
+    assert store.epoch_languages(lambda: ["en"]) == (epoch + 1, ["ja", "ar"])
+    coordinator.weight_submitter.stop()
+
+
+def test_coordinator_votes_overdue_epochs_with_the_scores_it_has(tmp_path):
+    validator_key, chain = make_chain(3)
+    store = ScoreStore(str(tmp_path / "shards.db"))
+    coordinator = ShardCoordinator(
+        validator_key, chain.netuid, NodePool.for_client(chain), store, epoch_deadline=0.2
+    )
+    epoch, _ = store.current_epoch()
+    # A score of a uid that now belongs to another key does not count.
+    store.put_scores(epoch, "a", {1: {"ss58": chain.keys[1], "score": 0.5}, 2: {"ss58": "old", "score": 0.9}})
+
+    assert not coordinator.step()
+    time.sleep(0.3)
+    assert coordinator.step()
+    assert coordinator.weight_submitter.join(timeout=10)
+    assert chain.votes[0]["uids"] == [1]
+    coordinator.weight_submitter.stop()
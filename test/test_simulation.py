@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("communex")
+pytest.importorskip("uvicorn")
+
+from communex.misc import get_map_modules  # noqa: E402
+from communex.module.client import ModuleClient  # noqa: E402
+from substrateinterface import Keypair  # noqa: E402
+
+from zangief.validator.prompt_datasets.local import LocalDataset  # noqa: E402
+from zangief.validator.simulation import (  # noqa: E402
+    SAMPLE_PROMPTS,
+    MinerProfile,
+    MinerServer,
+    SimulatedChain,
+    SimulatedReward,
+    StandInMiner,
+    answer_quality,
+)
+
+
+@pytest.fixture
+def miners():
+    servers = [
+        MinerServer(StandInMiner(MinerProfile(latency=0.01, latency_sigma=0, quality=1.0)), Keypair.create_from_uri("//A")),
+        MinerServer(StandInMiner(MinerProfile(latency=0.01, latency_sigma=0, failure_rate=1.0)), Keypair.create_from_uri("//B")),
+    ]
+    for server in servers:
+        server.start()
+    yield servers
+    for server in servers:
+        server.stop()
+
+
+def test_chain_serves_the_metagraph_and_records_votes(miners):
+    validator_key = Keypair.create_from_uri("//V")
+    chain = SimulatedChain(validator_key, miners)
+
+    modules = get_map_modules(chain, netuid=chain.netuid)
+    by_uid = {module["uid"]: module for module in modules.values()}
+    assert by_uid[1]["address"] == miners[0].address
+    assert by_uid[0]["dividends"] > by_uid[0]["incentive"]
+    assert validator_key.ss58_address in chain.query_map_key().values()
+
+    chain.vote(key=validator_key, uids=[1, 2], weights=[900, 100], netuid=chain.netuid)
+    assert chain.votes[0]["uids"] == [1, 2]
+
+
+def test_stand_in_miners_answer_signed_requests(miners):
+    key = Keypair.create_from_uri("//V")
+    prompt = SAMPLE_PROMPTS["en"][0]
+    request = {"prompt": prompt, "source_language": "en", "target_language": "es"}
+
+    good, failing = (ModuleClient(*server.address.split(":"), key) for server in miners)
+    answer = asyncio.run(good.call("generate", miners[0].key.ss58_address, request, timeout=5))
+    assert answer["answer"] == prompt
+    with pytest.raises(Exception):
+        asyncio.run(failing.call("generate", miners[1].key.ss58_address, request, timeout=5))
+    assert miners[1].miner.failures == 1
+
+
+def test_simulated_reward_scores_by_kept_words():
+    reward = SimulatedReward(seconds_per_answer=0)
+    source = "one two three four"
+    scores, full_scores = reward.get_scores(source, "es", [source, "one lorem three lorem", "", None])
+
+    assert scores == [1.0, 0.5, 0, 0]
+    assert full_scores[2]["composite"] == "0.0"
+    assert answer_quality(source, "lorem") == 0
+    assert reward.answers == 4
+
+
+def test_local_dataset():
+    dataset = LocalDataset({"en": ["hello"], "es": []})
+    assert dataset.selected_languages == ["en"]
+    assert dataset.select_languages() == ["en"]
+    assert dataset.get_random_record("en") == "hello"
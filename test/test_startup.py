@@ -0,0 +1,91 @@
+import os
+
+import pytest
+
+from zangief.miner.artifacts import COMPLETE_MARKER, ArtifactCache
+from zangief.miner.startup import StartupTimer, parse_language_pairs, warm_up
+
+
+def test_parse_language_pairs():
+    assert parse_language_pairs(" en-es, es-en ,,zh-en") == [("en", "es"), ("es", "en"), ("zh", "en")]
+    assert parse_language_pairs("") == []
+    assert parse_language_pairs(None) == []
+    with pytest.raises(ValueError):
+        parse_language_pairs("en")
+
+
+def test_startup_timer_records_phases():
+    startup = StartupTimer()
+    with startup.phase("model"):
+        pass
+    with pytest.raises(RuntimeError):
+        with startup.phase("warmup"):
+            raise RuntimeError("boom")
+
+    # A failed phase is still timed.
+    assert list(startup.phases) == ["model", "warmup"]
+    assert all(seconds >= 0 for seconds in startup.phases.values())
+    assert startup.total() >= sum(startup.phases.values())
+
+
+def test_warm_up_translates_each_pair_and_survives_failures():
+    calls = []
+
+    class Miner:
+        def generate_translation(self, text, source_language, target_language):
+            calls.append((text, source_language, target_language))
+            if target_language == "xx":
+                raise RuntimeError("unsupported")
+
+    warm_up(Miner(), [("es", "xx"), ("yy", "en")])
+
+    assert [call[1:] for call in calls] == [("es", "xx"), ("yy", "en")]
+    # Unknown source languages warm up with the English text.
+    assert calls[1][0].startswith("This is a short sentence")
+
+
+def test_artifact_paths_change_with_the_conversion_options(tmp_path):
+    cache = ArtifactCache(str(tmp_path))
+    path = cache.path("facebook/m2m100_418M", "onnx", quantize=True, versions={"onnx": "1.0"})
+
+    assert os.path.dirname(path) == str(tmp_path)
+    assert os.path.basename(path).startswith("facebook--m2m100_418M-onnx-")
+    assert path == cache.path("facebook/m2m100_418M", "onnx", versions={"onnx": "1.0"}, quantize=True)
+    assert path != cache.path("facebook/m2m100_418M", "onnx", quantize=True, versions={"onnx": "1.1"})
+    assert path != cache.path("facebook/m2m100_418M", "int8", quantize=True, versions={"onnx": "1.0"})
+
+
+def test_artifacts_are_built_once(tmp_path):
+    cache = ArtifactCache(str(tmp_path))
+    path = cache.path("model", "onnx")
+    builds = []
+
+    def build(directory):
+        builds.append(directory)
+        with open(os.path.join(directory, "model.onnx"), "w") as f:
+            f.write("weights")
+
+    assert cache.get_or_build(path, build) == path
+    assert cache.get_or_build(path, build) == path
+
+    assert len(builds) == 1
+    assert builds[0] != path
+    assert sorted(os.listdir(path)) == [COMPLETE_MARKER, "model.onnx"]
+
+
+def test_interrupted_builds_are_redone(tmp_path):
+    cache = ArtifactCache(str(tmp_path))
+    path = cache.path("model", "onnx")
+
+    def interrupted(directory):
+        with open(os.path.join(directory, "model.onnx"), "w") as f:
+            f.write("half")
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        cache.get_or_build(path, interrupted)
+    # Nothing is left behind, so the next start builds the artifact again.
+    assert os.listdir(tmp_path) == []
+
+    cache.get_or_build(path, lambda directory: None)
+    assert os.path.exists(os.path.join(path, COMPLETE_MARKER))
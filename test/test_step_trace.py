@@ -0,0 +1,80 @@
+import gzip
+
+from zangief.validator.power_scaling import compute_weights
+from zangief.validator.replay import replay
+from zangief.validator.step_trace import TraceRecorder, read_trace
+
+MINERS = [{"uid": 1, "key": "5A"}, {"uid": 2, "key": "5B"}, {"uid": 3, "key": "5C"}]
+
+
+class LengthReward:
+    """Scores an answer by its length relative to the source."""
+
+    def get_scores(self, source, target_language, targets):
+        scores = [min(1.0, len(target) / len(source)) if target else 0 for target in targets]
+        return scores, [{"composite": str(score)} for score in scores]
+
+
+def record(path, answers, recorded_scores):
+    recorder = TraceRecorder(str(path))
+    recorder.begin_step("a source sentence", "en", "es")
+    for miner in MINERS:
+        recorder.observe_miner(miner["uid"], 0.25, "ok")
+    full_scores = [{"bert": str(s), "comet": str(s), "composite": str(s)} for s in recorded_scores]
+    recorder.end_step(MINERS, answers, full_scores)
+    s_dict = {str(miner["uid"]): score for miner, score in zip(MINERS, recorded_scores)}
+    uids, weights = compute_weights(s_dict, own_uid=None)
+    recorder.record_vote(s_dict, uids, weights)
+    recorder.close()
+
+
+def test_compute_weights_leaves_out_the_validator():
+    uids, weights = compute_weights({"1": 0.9, "2": 0.5, "3": 0.1, "4": 0.7}, own_uid=4)
+    assert 4 not in uids
+    # The lowest score normalizes to zero and gets no weight.
+    assert uids == [1, 2] and weights[0] == 1000
+
+
+def test_steps_round_trip(tmp_path):
+    path = tmp_path / "trace.jsonl.gz"
+    record(path, ["una frase", "", "x"], [0.8, 0.0, 0.3])
+    # Reopening appends a second gzip member.
+    record(path, ["otra", "", "y"], [0.7, 0.0, 0.2])
+
+    records = list(read_trace(str(path)))
+    assert [r["type"] for r in records] == ["step", "vote", "step", "vote"]
+    step = records[0]
+    assert step["target_language"] == "es"
+    assert step["miners"][0] == {
+        "uid": "1", "key": "5A", "answer": "una frase", "latency": 0.25, "status": "ok",
+        "scores": {"bert": 0.8, "comet": 0.8, "composite": 0.8},
+    }
+
+
+def test_truncated_trace_is_read_up_to_the_damage(tmp_path):
+    path = tmp_path / "trace.jsonl.gz"
+    record(path, ["una frase", "", "x"], [0.8, 0.0, 0.3])
+    data = path.read_bytes()
+    with gzip.open(tmp_path / "extra.gz", "wt") as file:
+        file.write('{"type": "step"')
+    path.write_bytes(data + (tmp_path / "extra.gz").read_bytes()[:-12])
+
+    assert [r["type"] for r in read_trace(str(path))] == ["step", "vote"]
+
+
+def test_replay_reports_score_and_weight_changes(tmp_path):
+    path = tmp_path / "trace.jsonl.gz"
+    record(path, ["a source sentence", "", "a source"], [1.0, 0.0, 0.4])
+
+    unchanged = replay(read_trace(str(path)))
+    assert unchanged["steps"] == 1 and unchanged["votes"] == 1
+    assert unchanged["weight_mismatches"] == []
+
+    report = replay(read_trace(str(path)), reward=LengthReward(), tolerance=0.01)
+    assert report["answers"] == 3
+    assert [m["uid"] for m in report["score_mismatches"]] == ["3"]
+    assert report["score_mismatches"][0]["replayed"] == len("a source") / len("a source sentence")
+    assert report["answers_per_second"] > 0
+    # Raising uid 3's score raises its weight in the recomputed vote.
+    changes = report["rescored_weight_changes"][0]["changes"]
+    assert set(changes) == {3}
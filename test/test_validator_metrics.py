@@ -0,0 +1,63 @@
+import pytest
+
+pytest.importorskip("prometheus_client")
+
+from prometheus_client import generate_latest  # noqa: E402
+
+from zangief.config.validator import ValidatorConfig  # noqa: E402
+from zangief.validator.metrics import ValidatorMetrics  # noqa: E402
+
+
+def sample(metrics, name, **labels):
+    return metrics.registry.get_sample_value(name, labels)
+
+
+def test_stages_and_miner_outcomes_are_recorded():
+    metrics = ValidatorMetrics()
+    with metrics.step():
+        with metrics.stage("bert"):
+            pass
+        with pytest.raises(RuntimeError):
+            with metrics.stage("comet"):
+                raise RuntimeError("scoring failed")
+    metrics.observe_miner(7, 0.5, "ok")
+    metrics.observe_miner(7, 20.0, "timeout")
+    metrics.observe_scoring(answers=8, seconds=2.0)
+
+    assert sample(metrics, "zangief_validator_stage_seconds_count", stage="bert") == 1
+    assert sample(metrics, "zangief_validator_stage_seconds_count", stage="comet") == 1
+    assert sample(metrics, "zangief_validator_step_seconds_count") == 1
+    assert sample(metrics, "zangief_validator_miner_requests_total", uid="7", status="timeout") == 1
+    assert sample(metrics, "zangief_validator_miner_request_seconds_sum", uid="7") == 20.5
+    assert sample(metrics, "zangief_validator_answers_scored_total") == 8
+    assert sample(metrics, "zangief_validator_answers_per_second") == 4
+    assert sample(metrics, "zangief_validator_scoring_batch_size_sum") == 8
+    assert sample(metrics, "zangief_validator_scoring_batch_size_bucket", le="8.0") == 1
+    assert sample(metrics, "zangief_validator_scoring_batch_size_bucket", le="4.0") == 0
+    assert b"zangief_validator_last_vote_timestamp_seconds" in generate_latest(metrics.registry)
+
+
+def test_votes_close_an_epoch():
+    metrics = ValidatorMetrics()
+    metrics.observe_vote()
+
+    assert sample(metrics, "zangief_validator_epoch_seconds_count") == 1
+    assert sample(metrics, "zangief_validator_last_vote_timestamp_seconds") > 0
+
+
+def test_metrics_port_is_optional(monkeypatch):
+    config = ValidatorConfig(ignore_config_file=True)
+    monkeypatch.delenv("VALIDATOR_METRICS_PORT", raising=False)
+    assert config.get_validator_metrics_port() is None
+
+    monkeypatch.setenv("VALIDATOR_METRICS_PORT", "9100")
+    assert config.get_validator_metrics_port() == 9100
+
+
+def test_metrics_listen_on_localhost_by_default(monkeypatch):
+    config = ValidatorConfig(ignore_config_file=True)
+    monkeypatch.delenv("VALIDATOR_METRICS_HOST", raising=False)
+    assert config.get_validator_metrics_host() == "127.0.0.1"
+
+    monkeypatch.setenv("VALIDATOR_METRICS_HOST", "0.0.0.0")
+    assert config.get_validator_metrics_host() == "0.0.0.0"
@@ -0,0 +1,83 @@
+import os
+import time
+
+from loguru import logger
+
+from zangief.validator.profiling import Profiler
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = Profiler()
+    with profiler.step():
+        with profiler.span("score"):
+            pass
+    assert profiler.span("score") is profiler.span("vote")
+    assert not profiler.traces
+
+
+def test_spans_nest_into_a_rolling_trace():
+    profiler = Profiler(enabled=True, trace_steps=2)
+    for _ in range(3):
+        with profiler.step():
+            with profiler.span("score"):
+                with profiler.span("bert"):
+                    pass
+            with profiler.span("vote"):
+                pass
+
+    assert len(profiler.traces) == 2
+    paths = [path for path, _, _ in profiler.traces[-1]]
+    assert paths == ["step/score/bert", "step/score", "step/vote", "step"]
+    assert set(profiler.summary()) == set(paths)
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_sampling_capture_writes_collapsed_stacks(tmp_path):
+    profiler = Profiler(output_dir=str(tmp_path), sample_interval=0.001)
+    profiler.request_capture(2)
+    for _ in range(3):
+        with profiler.step():
+            busy(0.05)
+
+    files = os.listdir(tmp_path)
+    assert len(files) == 1 and files[0].endswith(".collapsed")
+    lines = (tmp_path / files[0]).read_text().splitlines()
+    assert any("busy (test_validator_profiling.py" in line for line in lines)
+    stack, count = lines[0].rsplit(" ", 1)
+    assert ";" in stack and int(count) > 0
+    assert not profiler.active
+
+
+def test_cprofile_capture_writes_pstats(tmp_path):
+    import pstats
+
+    profiler = Profiler(profiler="cprofile", output_dir=str(tmp_path))
+    profiler.request_capture(1)
+    with profiler.step():
+        busy(0.01)
+
+    files = os.listdir(tmp_path)
+    assert len(files) == 1 and files[0].endswith(".prof")
+    stats = pstats.Stats(str(tmp_path / files[0]))
+    assert any(name == "busy" for _, _, name in stats.stats)
+
+
+def test_capture_requests_only_log_when_the_capture_starts(tmp_path):
+    profiler = Profiler(profiler="cprofile", output_dir=str(tmp_path))
+    messages = []
+    sink = logger.add(lambda message: messages.append(message.record["message"]))
+    try:
+        # Runs in a signal handler, where logging could deadlock on the sink's lock.
+        profiler.request_capture(1)
+        assert messages == []
+        with profiler.step():
+            pass
+    finally:
+        logger.remove(sink)
+
+    assert messages[0] == "Profiling the next 1 validation steps with cprofile"
@@ -0,0 +1,166 @@
+import os
+import time
+from concurrent.futures import TimeoutError
+
+import pytest
+
+from zangief.miner.worker_pool import WorkerPool, WorkerCrashedError
+
+
+class EchoMiner:
+
+    def generate_translation(self, prompt, source_language, target_language):
+        if prompt == "crash":
+            os._exit(1)
+        if prompt == "fail":
+            raise ValueError("bad prompt")
+        if prompt == "slow":
+            time.sleep(1)
+        if prompt == "parent":
+            return os.getppid()
+        # Keep jobs in flight long enough for both workers to receive some.
+        time.sleep(0.02)
+        return f"{target_language}:{prompt}:{os.getpid()}"
+
+
+class CountingMiner:
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def generate_translation(self, prompt, source_language, target_language):
+        self.calls += 1
+        # Keep the first job in flight so the second goes to the other worker.
+        time.sleep(0.1)
+        return self.calls
+
+
+def test_workers_warm_up_after_the_fork():
+    miner = CountingMiner()
+    pool = WorkerPool(miner, workers=2, threads=1, warmup_pairs=[("en", "es"), ("es", "en")])
+    pool.start()
+
+    assert all(worker.ready.is_set() for worker in pool.workers)
+    # Both warm-up translations ran in each worker before its first job.
+    futures = [pool.submit("text", "en", "es") for _ in range(2)]
+    assert [future.result(timeout=10) for future in futures] == [3, 3]
+    assert miner.calls == 0
+    pool.stop()
+
+
+def test_jobs_run_in_worker_processes():
+    pool = WorkerPool(EchoMiner(), workers=2, threads=2)
+    pool.start()
+
+    futures = [pool.submit(f"text {i}", "en", "es") for i in range(8)]
+    results = [future.result(timeout=10) for future in futures]
+    pids = {int(result.rsplit(":", 1)[1]) for result in results}
+
+    assert [result.rsplit(":", 1)[0] for result in results] == [f"es:text {i}" for i in range(8)]
+    assert os.getpid() not in pids
+    assert len(pids) == 2
+    pool.stop()
+
+
+def test_job_errors_are_returned_to_the_caller():
+    pool = WorkerPool(EchoMiner(), workers=1)
+    pool.start()
+
+    try:
+        pool.translate("fail", "en", "es")
+        assert False, "expected the job error"
+    except RuntimeError as e:
+        assert "bad prompt" in str(e)
+    assert pool.translate("ok", "en", "es").startswith("es:ok")
+    pool.stop()
+
+
+def test_crashed_worker_is_restarted():
+    pool = WorkerPool(EchoMiner(), workers=1)
+    pool.start()
+
+    try:
+        pool.translate("crash", "en", "es")
+        assert False, "expected the worker to crash"
+    except WorkerCrashedError:
+        pass
+
+    deadline = time.time() + 10
+    while pool.workers[0].connection is None and time.time() < deadline:
+        time.sleep(0.05)
+    assert pool.translate("ok", "en", "es").startswith("es:ok")
+    assert pool.workers[0].restarts == 1
+    pool.stop()
+
+
+def wait_for_restart(pool, worker=0):
+    deadline = time.time() + 10
+    while pool.workers[worker].connection is None and time.time() < deadline:
+        time.sleep(0.05)
+
+
+def test_timed_out_jobs_are_abandoned():
+    pool = WorkerPool(EchoMiner(), workers=1, timeout=0.2)
+    pool.start()
+
+    with pytest.raises(TimeoutError):
+        pool.translate("slow", "en", "es")
+    assert pool.in_flight() == [0]
+    # The late result of the abandoned job is ignored.
+    time.sleep(1)
+    assert pool.translate("ok", "en", "es").startswith("es:ok")
+    pool.stop()
+
+
+def test_restarted_workers_are_not_forked_from_the_pool_process():
+    pool = WorkerPool(EchoMiner(), workers=1)
+    pool.start()
+
+    with pytest.raises(WorkerCrashedError):
+        pool.translate("crash", "en", "es")
+    wait_for_restart(pool)
+    assert pool.translate("parent", "en", "es") == pool._forker.pid
+    pool.stop()
+
+
+def test_results_share_one_deadline():
+    pool = WorkerPool(EchoMiner(), workers=1, threads=4, timeout=0.5)
+    pool.start()
+
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        pool.results([pool.submit("slow", "en", "es") for _ in range(3)])
+    assert time.monotonic() - start < 0.9
+    assert pool.in_flight() == [0]
+    pool.stop()
+
+
+def test_results_abandon_the_other_jobs_when_one_fails():
+    pool = WorkerPool(EchoMiner(), workers=1, threads=2)
+    pool.start()
+
+    with pytest.raises(RuntimeError, match="bad prompt"):
+        pool.results([pool.submit("slow", "en", "es"), pool.submit("fail", "en", "es")])
+    assert pool.in_flight() == [0]
+    pool.stop()
+
+
+def test_restart_count_resets_after_a_stable_uptime():
+    pool = WorkerPool(EchoMiner(), workers=1, max_restarts=1, stable_seconds=0)
+    pool.start()
+
+    for _ in range(3):
+        with pytest.raises(WorkerCrashedError):
+            pool.translate("crash", "en", "es")
+        wait_for_restart(pool)
+    assert pool.translate("ok", "en", "es").startswith("es:ok")
+    assert pool.workers[0].restarts == 1
+    pool.stop()
+
+
+if __name__ == "__main__":
+    test_jobs_run_in_worker_processes()
+    test_job_errors_are_returned_to_the_caller()
+    test_crashed_worker_is_restarted()
+    test_timed_out_jobs_are_abandoned()
+    test_restart_count_resets_after_a_stable_uptime()